@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from src.data_access.postgresql.errors import (
+    ClientNotFoundError,
+    UserNotFoundError,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Row
+
+    from src.business_logic.cache.client_snapshot import ClientSnapshot
+    from src.data_access.postgresql.repositories import (
+        ClientRepository,
+        UserRepository,
+    )
+
+
+class AuthorizationContext:
+    """
+    Client and user of a single authorization request.
+
+    Each of them is loaded once, on first use, and then read by the validators
+    and the service handling the request instead of querying them again.
+    The context offers get_client_snapshot like ClientRepository, so the client
+    validators take it in place of the repository.
+    """
+
+    def __init__(
+        self, client_repo: ClientRepository, user_repo: UserRepository
+    ) -> None:
+        """
+        Initialize the AuthorizationContext.
+
+        Args:
+            client_repo: The repository for accessing client-related data.
+            user_repo: The repository for accessing user-related data.
+        """
+        self._client_repo = client_repo
+        self._user_repo = user_repo
+        self._clients: dict[str, Optional[ClientSnapshot]] = {}
+        self._users: dict[str, Optional[Row]] = {}
+
+    async def get_client_snapshot(
+        self, client_id: str
+    ) -> Optional[ClientSnapshot]:
+        """Returns the client of the request, or None if it does not exist."""
+        if client_id not in self._clients:
+            self._clients[client_id] = (
+                await self._client_repo.get_client_snapshot(client_id=client_id)
+            )
+        return self._clients[client_id]
+
+    async def get_client(self, client_id: str) -> ClientSnapshot:
+        """
+        Returns the client of the request.
+
+        Raises:
+            ClientNotFoundError: If the client does not exist.
+        """
+        client = await self.get_client_snapshot(client_id)
+        if client is None:
+            raise ClientNotFoundError("Incorrect client_id.")
+        return client
+
+    async def get_user_credentials(self, username: str) -> Optional[Row]:
+        """
+        Returns the id, username and password_hash of the user, or None if it
+        does not exist.
+        """
+        if username not in self._users:
+            self._users[username] = (
+                await self._user_repo.get_user_credentials(username)
+            )
+        return self._users[username]
+
+    async def get_user_id(self, username: str) -> int:
+        """
+        Returns the id of the user of the request.
+
+        Raises:
+            UserNotFoundError: If the user does not exist.
+        """
+        user = await self.get_user_credentials(username)
+        if user is None:
+            raise UserNotFoundError("Invalid username or password.")
+        return user.id
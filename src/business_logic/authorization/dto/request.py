@@ -74,6 +74,8 @@ class AuthRequestModel(BaseModel):
         id_token_hint (Optional[str]): An optional value used to pass an ID Token for pre-authentication.
         login_hint (Optional[str]): An optional value indicating the user's email address or other login identifier.
         acr_values (Optional[str]): An optional value specifying the requested Authentication Context Class Reference values.
+        code_challenge (Optional[str]): An optional PKCE code challenge.
+        code_challenge_method (Optional[str]): An optional method of the code challenge, "plain" or "S256".
 
 
     Reference: https://openid.net/specs/openid-connect-core-1_0.html
@@ -96,6 +98,8 @@ class AuthRequestModel(BaseModel):
     id_token_hint: Optional[str]
     login_hint: Optional[str]
     acr_values: Optional[str]
+    code_challenge: Optional[str]
+    code_challenge_method: Optional[str]
 
     @classmethod
     def as_form(
@@ -117,6 +121,8 @@ class AuthRequestModel(BaseModel):
         id_token_hint: Optional[str] = Form(None),
         login_hint: Optional[str] = Form(None),
         acr_values: Optional[str] = Form(None),
+        code_challenge: Optional[str] = Form(None),
+        code_challenge_method: Optional[str] = Form(None),
     ) -> "AuthRequestModel":
         return cls(
             client_id=client_id,
@@ -136,4 +142,6 @@ class AuthRequestModel(BaseModel):
             id_token_hint=id_token_hint,
             login_hint=login_hint,
             acr_values=acr_values,
+            code_challenge=code_challenge,
+            code_challenge_method=code_challenge_method,
         )
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Dict
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.business_logic.authorization.constants import ResponseType
+from src.business_logic.authorization.context import AuthorizationContext
 from src.data_access.postgresql.errors import WrongResponseTypeError
 
 from ..interfaces import AuthServiceProtocol
@@ -23,6 +24,7 @@ from src.data_access.postgresql.repositories import (
 )
 
 if TYPE_CHECKING:
+    from src.business_logic.cache.sso_sessions import SsoSession
     from src.business_logic.services import JWTService, PasswordHash, ScopeService
 
 
@@ -57,7 +59,8 @@ class AuthServiceFactory:
         device_repo: DeviceRepository,
         password_service: PasswordHash,
         jwt_service: JWTService,
-        scope_service: ScopeService
+        scope_service: ScopeService,
+        sso_session: Optional[SsoSession] = None,
     ) -> None:
         """
         Initialize the AuthServiceFactory with the required dependencies.
@@ -70,6 +73,7 @@ class AuthServiceFactory:
             device_repo: The repository for accessing device-related data.
             password_service: The service for password hashing and verification.
             jwt_service: The service for JWT generation and verification.
+            sso_session: The SSO session of the browser, if the user signed in already.
         """
         self.session = session
         self._client_repo = client_repo
@@ -79,6 +83,11 @@ class AuthServiceFactory:
         self._password_service = password_service
         self._jwt_service = jwt_service
         self.scope_service = scope_service
+        self._sso_session = sso_session
+        # The factory serves a single request, like its session.
+        self.context = AuthorizationContext(
+            client_repo=client_repo, user_repo=user_repo
+        )
 
     @classmethod
     def _register_factory(
@@ -120,7 +129,9 @@ class AuthServiceFactory:
             device_repo=self._device_repo,
             password_service=self._password_service,
             jwt_service=self._jwt_service,
-            scope_service = self.scope_service
+            scope_service = self.scope_service,
+            sso_session=self._sso_session,
+            context=self.context,
         )
 
 
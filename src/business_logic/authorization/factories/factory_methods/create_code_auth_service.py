@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
+from src.business_logic.authorization.context import AuthorizationContext
 from src.business_logic.authorization.service_impls import CodeAuthService
+from src.business_logic.cache.authorization_codes import (
+    get_authorization_code_store,
+)
 from src.business_logic.authorization.validators import (
     ScopeValidator,
+    SsoSessionValidator,
     UserCredentialsValidator,
 )
 from src.business_logic.common.validators import (
     ClientValidator,
     RedirectUriValidator,
 )
+from src.data_access.postgresql.repositories import CodeChallengeRepository
 
 if TYPE_CHECKING:
+    from src.business_logic.cache.sso_sessions import SsoSession
     from src.business_logic.authorization.interfaces import AuthServiceProtocol
     from src.business_logic.services import PasswordHash
     from src.data_access.postgresql.repositories import (
@@ -29,6 +36,8 @@ def _create_code_auth_service(
     persistent_grant_repo: PersistentGrantRepository,
     password_service: PasswordHash,
     scope_service,
+    sso_session: Optional[SsoSession] = None,
+    context: Optional[AuthorizationContext] = None,
     **kwargs: Any,
 ) -> AuthServiceProtocol:
     """
@@ -42,23 +51,35 @@ def _create_code_auth_service(
         user_repo: The repository for accessing user-related data.
         persistent_grant_repo: The repository for accessing persistent grant-related data.
         password_service: The service for password hashing and verification.
+        sso_session: The SSO session of the browser, which replaces the user credentials.
+        context: The context of the request, read by the validators and the service.
         **kwargs: Additional keyword arguments.
 
     Returns:
         An instance of CodeAuthService.
     """
+    if context is None:
+        context = AuthorizationContext(
+            client_repo=client_repo, user_repo=user_repo
+        )
     return CodeAuthService(
-        client_validator=ClientValidator(client_repo),
-        redirect_uri_validator=RedirectUriValidator(client_repo),
+        client_validator=ClientValidator(context),
+        redirect_uri_validator=RedirectUriValidator(context),
         scope_validator=ScopeValidator(
-            client_repo=client_repo,
+            client_repo=context,
             scope_service=scope_service
         ),
-        user_credentials_validator=UserCredentialsValidator(
-            user_repo=user_repo,
-            password_service=password_service,
+        user_credentials_validator=(
+            UserCredentialsValidator(
+                user_repo=user_repo,
+                password_service=password_service,
+                context=context,
+            )
+            if sso_session is None
+            else SsoSessionValidator(sso_session)
         ),
         persistent_grant_repo=persistent_grant_repo,
-        client_repo=client_repo,
-        user_repo=user_repo,
+        context=context,
+        code_store=get_authorization_code_store(),
+        code_challenge_repo=CodeChallengeRepository(persistent_grant_repo.session),
     )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
+from src.business_logic.authorization.context import AuthorizationContext
 from src.business_logic.authorization.service_impls import DeviceAuthService
+from src.business_logic.cache.device_codes import get_device_code_store
 from src.business_logic.authorization.validators import (
     ScopeValidator,
     UserCodeValidator,
@@ -32,6 +34,7 @@ def _create_device_auth_service(
     device_repo: DeviceRepository,
     password_service: PasswordHash,
     scope_service,
+    context: Optional[AuthorizationContext] = None,
     **kwargs: Any,
 ) -> AuthServiceProtocol:
     """
@@ -46,25 +49,34 @@ def _create_device_auth_service(
         persistent_grant_repo: The repository for accessing persistent grant-related data.
         device_repo: The repository for accessing device-related data.
         password_service: The service for password hashing and verification.
+        context: The context of the request, read by the validators and the service.
         **kwargs: Additional keyword arguments.
 
     Returns:
         An instance of DeviceAuthService.
 
     """
+    if context is None:
+        context = AuthorizationContext(
+            client_repo=client_repo, user_repo=user_repo
+        )
     return DeviceAuthService(
-        client_validator=ClientValidator(client_repo),
-        redirect_uri_validator=RedirectUriValidator(client_repo),
+        client_validator=ClientValidator(context),
+        redirect_uri_validator=RedirectUriValidator(context),
         scope_validator=ScopeValidator(
-            client_repo=client_repo,
+            client_repo=context,
             scope_service=scope_service
         ),
         user_credentials_validator=UserCredentialsValidator(
             user_repo=user_repo,
             password_service=password_service,
+            context=context,
+        ),
+        user_code_validator=UserCodeValidator(
+            device_repo, device_store=get_device_code_store()
         ),
-        user_code_validator=UserCodeValidator(device_repo),
         persistent_grant_repo=persistent_grant_repo,
         device_repo=device_repo,
-        user_repo=user_repo,
+        context=context,
+        device_store=get_device_code_store(),
     )
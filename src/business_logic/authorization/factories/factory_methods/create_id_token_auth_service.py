@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
+from src.business_logic.authorization.context import AuthorizationContext
 from src.business_logic.authorization.service_impls import IdTokenAuthService
 from src.business_logic.authorization.validators import (
     ScopeValidator,
+    SsoSessionValidator,
     UserCredentialsValidator,
 )
 from src.business_logic.common.validators import (
@@ -13,6 +15,7 @@ from src.business_logic.common.validators import (
 )
 
 if TYPE_CHECKING:
+    from src.business_logic.cache.sso_sessions import SsoSession
     from src.business_logic.authorization.interfaces import AuthServiceProtocol
     from src.business_logic.services import PasswordHash
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
@@ -30,6 +33,8 @@ def _create_id_token_auth_service(
     password_service: PasswordHash,
     jwt_service: JWTService,
     scope_service,
+    sso_session: Optional[SsoSession] = None,
+    context: Optional[AuthorizationContext] = None,
     **kwargs: Any,
 ) -> AuthServiceProtocol:
     """
@@ -43,22 +48,34 @@ def _create_id_token_auth_service(
         user_repo: The repository for accessing user-related data.
         password_service: The service for password hashing and verification.
         jwt_service: The service for JWT generation and verification.
+        sso_session: The SSO session of the browser, which replaces the user credentials.
+        context: The context of the request, read by the validators and the service.
         **kwargs: Additional keyword arguments.
 
     Returns:
         An instance of IdTokenAuthService.
     """
+    if context is None:
+        context = AuthorizationContext(
+            client_repo=client_repo, user_repo=user_repo
+        )
     return IdTokenAuthService(
-        client_validator=ClientValidator(client_repo),
-        redirect_uri_validator=RedirectUriValidator(client_repo),
+        client_validator=ClientValidator(context),
+        redirect_uri_validator=RedirectUriValidator(context),
         scope_validator=ScopeValidator(
-            client_repo=client_repo,
+            client_repo=context,
             scope_service=scope_service
         ),
-        user_credentials_validator=UserCredentialsValidator(
-            user_repo=user_repo,
-            password_service=password_service,
+        user_credentials_validator=(
+            UserCredentialsValidator(
+                user_repo=user_repo,
+                password_service=password_service,
+                context=context,
+            )
+            if sso_session is None
+            else SsoSessionValidator(sso_session)
         ),
-        user_repo=user_repo,
+        context=context,
         jwt_manager=jwt_manager,
+        auth_time=None if sso_session is None else sso_session.auth_time,
     )
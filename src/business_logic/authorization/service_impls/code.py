@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import secrets
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.business_logic.authorization.mixins import UpdateRedirectUrlMixin
+from src.business_logic.cache.authorization_codes import AuthorizationCode
+from src.business_logic.get_tokens.validators.validate_code_challenge import (
+    get_fernet,
+)
 
 if TYPE_CHECKING:
+    from src.business_logic.authorization.context import AuthorizationContext
     from src.business_logic.authorization.dto import AuthRequestModel
+    from src.business_logic.cache.authorization_codes import (
+        AuthorizationCodeStore,
+    )
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.data_access.postgresql.repositories import (
-        ClientRepository,
+        CodeChallengeRepository,
         PersistentGrantRepository,
-        UserRepository,
     )
 
 
@@ -34,8 +41,9 @@ class CodeAuthService(UpdateRedirectUrlMixin):
         scope_validator: ValidatorProtocol,
         user_credentials_validator: ValidatorProtocol,
         persistent_grant_repo: PersistentGrantRepository,
-        client_repo: ClientRepository,
-        user_repo: UserRepository,
+        context: AuthorizationContext,
+        code_store: Optional[AuthorizationCodeStore] = None,
+        code_challenge_repo: Optional[CodeChallengeRepository] = None,
     ) -> None:
         """
         Initialize the CodeAuthService.
@@ -46,17 +54,21 @@ class CodeAuthService(UpdateRedirectUrlMixin):
             scope_validator: A validator for scope values.
             user_credentials_validator: A validator for user credentials.
             persistent_grant_repo: A repository for managing persistent grants.
-            client_repo: A repository for managing clients.
-            user_repo: A repository for managing users.
+            context: The client and user of the request, shared with the validators.
+            code_store: A store keeping codes until they are redeemed, or None
+                to keep them in persistent grants.
+            code_challenge_repo: A repository keeping the PKCE challenge by client
+                for codes the store could not keep.
         """
 
         self._client_validator = client_validator
         self._redirect_uri_validator = redirect_uri_validator
         self._scope_validator = scope_validator
         self._user_credentials_validator = user_credentials_validator
-        self._client_repo = client_repo
         self._persistent_grant_repo = persistent_grant_repo
-        self._user_repo = user_repo
+        self._context = context
+        self._code_store = code_store
+        self._code_challenge_repo = code_challenge_repo
         self._secret_code = secrets.token_urlsafe(32)
 
     async def _validate_request_data(self, request_data: AuthRequestModel):
@@ -88,29 +100,61 @@ class CodeAuthService(UpdateRedirectUrlMixin):
     async def _create_grant(self, request_data: AuthRequestModel):
         """
         Create a persistent grant for the authorization code. We need this grant to get an access
-        token later on in an authorization process.
+        token later on in an authorization process. With a code store the code goes there
+        instead, along with the PKCE challenge of the request, unless the store is unavailable.
 
         Args:
             request_data: An instance of AuthRequestModel containing the request data.
         """
-        auth_code_lifetime = (
-            await self._client_repo.get_auth_code_lifetime_by_client(
-                request_data.client_id
+        client = await self._context.get_client(request_data.client_id)
+        auth_code_lifetime = client.authorization_code_lifetime
+        user_id = await self._context.get_user_id(request_data.username)
+        if self._code_store is not None:
+            code_challenge = request_data.code_challenge or None
+            code_stored = await self._code_store.save(
+                code=self._secret_code,
+                data=AuthorizationCode(
+                    client_id=request_data.client_id,
+                    user_id=user_id,
+                    scope=request_data.scope,
+                    redirect_uri=request_data.redirect_uri,
+                    code_challenge=code_challenge,
+                    code_challenge_method=(
+                        request_data.code_challenge_method or "plain"
+                        if code_challenge
+                        else None
+                    ),
+                ),
+                ttl=auth_code_lifetime,
             )
-        )
-        await self._persistent_grant_repo.create(
-            client_id=request_data.client_id,
-            grant_type="authorization_code",
+            if code_stored:
+                return
+            if code_challenge and self._code_challenge_repo is not None:
+                # The authorization endpoint did not keep the challenge by
+                # client, the token endpoint looks it up there for this code.
+                await self._save_code_challenge(request_data)
+        await self._persistent_grant_repo.create_grant(
+            client_id=client.id,
             grant_data=self._secret_code,
-            user_id=(
-                await self._user_repo.get_user_by_username(
-                    request_data.username
-                )
-            ).id,
+            user_id=user_id,
+            grant_type_id=await self._persistent_grant_repo.get_type_id(
+                "authorization_code"
+            ),
             expiration_time=auth_code_lifetime + int(time.time()),
             scope=request_data.scope
         )
 
+    async def _save_code_challenge(self, request_data: AuthRequestModel) -> None:
+        code_challenge = request_data.code_challenge
+        code_challenge_method = request_data.code_challenge_method or "plain"
+        if code_challenge_method == "S256":
+            code_challenge = get_fernet().encrypt(code_challenge.encode()).decode()
+        await self._code_challenge_repo.create(
+            client_id=request_data.client_id,
+            code_challenge_method=code_challenge_method,
+            code_challenge=code_challenge,
+        )
+
     async def get_redirect_url(self, request_data: AuthRequestModel) -> str:
         """
         Get the redirect URL with the authorization code.
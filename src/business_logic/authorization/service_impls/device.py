@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.dyna_config import BASE_URL
 
 if TYPE_CHECKING:
+    from src.business_logic.authorization.context import AuthorizationContext
     from src.business_logic.authorization.dto import AuthRequestModel
+    from src.business_logic.cache.device_codes import (
+        DeviceCodeStore,
+        PendingDevice,
+    )
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.data_access.postgresql.repositories import (
         DeviceRepository,
         PersistentGrantRepository,
-        UserRepository,
     )
 
 
@@ -30,8 +34,9 @@ class DeviceAuthService:
         user_credentials_validator: ValidatorProtocol,
         user_code_validator: ValidatorProtocol,
         persistent_grant_repo: PersistentGrantRepository,
-        user_repo: UserRepository,
+        context: AuthorizationContext,
         device_repo: DeviceRepository,
+        device_store: Optional[DeviceCodeStore] = None,
     ) -> None:
         """
         Initialize the DeviceAuthService.
@@ -43,8 +48,10 @@ class DeviceAuthService:
             user_credentials_validator: A validator for user credentials.
             user_code_validator: A validator for user codes.
             persistent_grant_repo: A repository for managing persistent grants.
-            user_repo: A repository for managing users.
+            context: The client and user of the request, shared with the validators.
             device_repo: A repository for managing devices.
+            device_store: A store keeping devices until they are approved, or
+                None to keep them in the devices table.
         """
         self._client_validator = client_validator
         self._redirect_uri_validator = redirect_uri_validator
@@ -52,8 +59,9 @@ class DeviceAuthService:
         self._user_credentials_validator = user_credentials_validator
         self._user_code_validator = user_code_validator
         self._persistent_grant_repo = persistent_grant_repo
-        self._user_repo = user_repo
+        self._context = context
         self._device_repo = device_repo
+        self._device_store = device_store
 
     async def _validate_request_data(self, request_data: AuthRequestModel):
         """
@@ -84,7 +92,10 @@ class DeviceAuthService:
         await self._user_code_validator(request_data.user_code)
 
     async def _create_grant(
-        self, request_data: AuthRequestModel, grant_duration: int
+        self,
+        request_data: AuthRequestModel,
+        grant_duration: int,
+        pending_device: Optional[PendingDevice] = None,
     ):
         """
         Create a persistent grant for the device authorization code. We need this grant
@@ -93,18 +104,22 @@ class DeviceAuthService:
         Args:
             request_data: An instance of AuthRequestModel containing the request data.
             grant_duration: The duration of the grant in seconds.
+            pending_device: The device from the device store, if it is kept there.
         """
-        await self._persistent_grant_repo.create(
-            client_id=request_data.client_id,
-            grant_type="urn:ietf:params:oauth:grant-type:device_code",
-            grant_data=await self._device_repo.get_device_code_by_user_code(
+        if pending_device is not None:
+            device_code = pending_device.device_code
+        else:
+            device_code = await self._device_repo.get_device_code_by_user_code(
                 user_code=request_data.user_code
+            )
+        client = await self._context.get_client(request_data.client_id)
+        await self._persistent_grant_repo.create_grant(
+            client_id=client.id,
+            grant_data=device_code,
+            user_id=await self._context.get_user_id(request_data.username),
+            grant_type_id=await self._persistent_grant_repo.get_type_id(
+                "urn:ietf:params:oauth:grant-type:device_code"
             ),
-            user_id=(
-                await self._user_repo.get_user_by_username(
-                    request_data.username
-                )
-            ).id,
             expiration_time=int(time.time()) + grant_duration,
             scope=request_data.scope
         )
@@ -123,8 +138,21 @@ class DeviceAuthService:
             Various validation errors based on the request data.
         """
         await self._validate_request_data(request_data)
-        await self._create_grant(request_data=request_data, grant_duration=600)
-        await self._device_repo.delete_by_user_code(
-            user_code=request_data.user_code
+        pending_device = None
+        if self._device_store is not None:
+            pending_device = await self._device_store.get_by_user_code(
+                request_data.user_code
+            )
+        await self._create_grant(
+            request_data=request_data,
+            grant_duration=600,
+            pending_device=pending_device,
         )
+        if pending_device is not None:
+            # Polls of the device go to Postgres from now on.
+            await self._device_store.approve(pending_device)
+        else:
+            await self._device_repo.delete_by_user_code(
+                user_code=request_data.user_code
+            )
         return f"http://{BASE_URL}/device/auth/success"
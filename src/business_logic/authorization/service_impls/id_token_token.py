@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.business_logic.authorization.mixins import UpdateRedirectUrlMixin
 from src.business_logic.jwt_manager.dto import (
@@ -13,11 +13,9 @@ from src.dyna_config import DOMAIN_NAME
 
 
 if TYPE_CHECKING:
+    from src.business_logic.authorization.context import AuthorizationContext
     from src.business_logic.authorization.dto import AuthRequestModel
     from src.business_logic.common.interfaces import ValidatorProtocol
-    from src.data_access.postgresql.repositories import (
-        UserRepository,
-    )
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
 
 
@@ -38,8 +36,9 @@ class IdTokenTokenAuthService(UpdateRedirectUrlMixin):
         redirect_uri_validator: ValidatorProtocol,
         scope_validator: ValidatorProtocol,
         user_credentials_validator: ValidatorProtocol,
-        user_repo: UserRepository,
+        context: AuthorizationContext,
         jwt_manager: JWTManagerProtocol,
+        auth_time: Optional[int] = None,
     ) -> None:
         """
         Initialize the IdTokenTokenAuthService.
@@ -49,15 +48,17 @@ class IdTokenTokenAuthService(UpdateRedirectUrlMixin):
             redirect_uri_validator: A validator for redirect URIs.
             scope_validator: A validator for scope values.
             user_credentials_validator: A validator for user credentials.
-            user_repo: A repository for managing users.
+            context: The client and user of the request, shared with the validators.
             jwt_manager: A manager for JWT encoding and decoding.
+            auth_time: When the user signed in, if not with this request, e.g. in an SSO session.
         """
         self._client_validator = client_validator
         self._redirect_uri_validator = redirect_uri_validator
         self._scope_validator = scope_validator
         self._user_credentials_validator = user_credentials_validator
-        self._user_repo = user_repo
+        self._context = context
         self._jwt_manager = jwt_manager
+        self._auth_time = auth_time
         self.expiration_time = 600
 
     async def _validate_request_data(self, request_data: AuthRequestModel):
@@ -103,7 +104,10 @@ class IdTokenTokenAuthService(UpdateRedirectUrlMixin):
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm="RS256")
+        client = await self._context.get_client(request_data.client_id)
+        return self._jwt_manager.encode(
+            payload=payload, algorithm=client.signing_algorithm
+        )
 
     async def _get_id_token(
         self, request_data: AuthRequestModel, user_id: int, unix_time: int
@@ -127,8 +131,12 @@ class IdTokenTokenAuthService(UpdateRedirectUrlMixin):
             exp=unix_time + self.expiration_time,
             jti=str(uuid.uuid4()),
             acr=0,
+            auth_time=unix_time if self._auth_time is None else self._auth_time,
+        )
+        client = await self._context.get_client(request_data.client_id)
+        return self._jwt_manager.encode(
+            payload=payload, algorithm=client.signing_algorithm
         )
-        return self._jwt_manager.encode(payload=payload, algorithm="RS256")
 
     async def get_redirect_url(self, request_data: AuthRequestModel) -> str:
         """
@@ -146,9 +154,7 @@ class IdTokenTokenAuthService(UpdateRedirectUrlMixin):
         await self._validate_request_data(request_data)
 
         current_unix_time = int(time.time())
-        user_id = (
-            await self._user_repo.get_user_by_username(request_data.username)
-        ).id
+        user_id = await self._context.get_user_id(request_data.username)
 
         access_token = await self._get_access_token(
             request_data=request_data,
@@ -11,11 +11,9 @@ from src.business_logic.jwt_manager.dto import (
 from src.dyna_config import DOMAIN_NAME
 
 if TYPE_CHECKING:
+    from src.business_logic.authorization.context import AuthorizationContext
     from src.business_logic.authorization.dto import AuthRequestModel
     from src.business_logic.common.interfaces import ValidatorProtocol
-    from src.data_access.postgresql.repositories import (
-        UserRepository,
-    )
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
 
 
@@ -36,7 +34,7 @@ class TokenAuthService(UpdateRedirectUrlMixin):
         redirect_uri_validator: ValidatorProtocol,
         scope_validator: ValidatorProtocol,
         user_credentials_validator: ValidatorProtocol,
-        user_repo: UserRepository,
+        context: AuthorizationContext,
         jwt_manager: JWTManagerProtocol,
     ) -> None:
         """
@@ -47,14 +45,14 @@ class TokenAuthService(UpdateRedirectUrlMixin):
             redirect_uri_validator: A validator for redirect URIs.
             scope_validator: A validator for scope values.
             user_credentials_validator: A validator for user credentials.
-            user_repo: A repository for managing users.
+            context: The client and user of the request, shared with the validators.
             jwt_manager: A manager for JWT encoding and decoding.
         """
         self._client_validator = client_validator
         self._redirect_uri_validator = redirect_uri_validator
         self._scope_validator = scope_validator
         self._user_credentials_validator = user_credentials_validator
-        self._user_repo = user_repo
+        self._context = context
         self._jwt_manager = jwt_manager
         self.expiration_time = 600
 
@@ -101,7 +99,10 @@ class TokenAuthService(UpdateRedirectUrlMixin):
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm="RS256")
+        client = await self._context.get_client(request_data.client_id)
+        return self._jwt_manager.encode(
+            payload=payload, algorithm=client.signing_algorithm
+        )
 
     async def get_redirect_url(self, request_data: AuthRequestModel) -> str:
         """
@@ -119,9 +120,7 @@ class TokenAuthService(UpdateRedirectUrlMixin):
         await self._validate_request_data(request_data)
 
         current_unix_time = int(time.time())
-        user_id = (
-            await self._user_repo.get_user_by_username(request_data.username)
-        ).id
+        user_id = await self._context.get_user_id(request_data.username)
 
         access_token = await self._get_access_token(
             request_data=request_data,
@@ -1,5 +1,11 @@
 from .scope_validator import ScopeValidator
+from .sso_session_validator import SsoSessionValidator
 from .user_code_validator import UserCodeValidator
 from .user_credentials_validator import UserCredentialsValidator
 
-__all__ = ["ScopeValidator", "UserCredentialsValidator", "UserCodeValidator"]
+__all__ = [
+    "ScopeValidator",
+    "SsoSessionValidator",
+    "UserCredentialsValidator",
+    "UserCodeValidator",
+]
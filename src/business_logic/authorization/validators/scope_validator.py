@@ -25,9 +25,8 @@ class ScopeValidator:
         Raises:
             ClientScopesError: If the scope is invalid.
         """
-        scopes_list = await self._client_repo.list_all_scopes_by_client(
-            client_id=client_id
-        )
+        client = await self._client_repo.get_client_snapshot(client_id=client_id)
+        scopes_list = client.scopes if client is not None else frozenset()
         full_names_scope_list = await self.scope_service.get_full_names(scope)
         if not all(scope in scopes_list for scope in full_names_scope_list):
             raise ClientScopesError("Invalid scope.")
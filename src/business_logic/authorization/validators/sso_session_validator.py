@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from src.data_access.postgresql.errors import UserNotFoundError
+
+if TYPE_CHECKING:
+    from pydantic import SecretStr
+
+    from src.business_logic.cache.sso_sessions import SsoSession
+
+
+class SsoSessionValidator:
+    """Accepts the user of an SSO session in place of the user credentials."""
+
+    def __init__(self, sso_session: SsoSession):
+        """
+        Initializes a SsoSessionValidator object.
+
+        Args:
+            sso_session (SsoSession): The session of the browser making the request.
+        """
+        self._sso_session = sso_session
+
+    async def __call__(
+        self, username: str, password: Optional[SecretStr] = None
+    ) -> None:
+        """
+        Validates that the user signed in with the session, without a password.
+
+        Args:
+            username (str): The username to be validated.
+            password (Optional[SecretStr]): Ignored, the session is already authenticated.
+
+        Raises:
+            UserNotFoundError: If the username is not the one of the session.
+        """
+        if username != self._sso_session.username:
+            raise UserNotFoundError("Invalid username or password.")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.data_access.postgresql.errors import (
     UserCodeExpirationTimeError,
@@ -9,20 +9,27 @@ from src.data_access.postgresql.errors import (
 )
 
 if TYPE_CHECKING:
+    from src.business_logic.cache.device_codes import DeviceCodeStore
     from src.data_access.postgresql.repositories import DeviceRepository
 
 
 class UserCodeValidator:
     """Validates the requested user_code against the user_code stored in the database."""
 
-    def __init__(self, device_repo: DeviceRepository):
+    def __init__(
+        self,
+        device_repo: DeviceRepository,
+        device_store: Optional[DeviceCodeStore] = None,
+    ):
         """
         Initializes a UserCodeValidator object.
 
         Args:
             device_repo (DeviceRepository): The repository for accessing device information.
+            device_store (Optional[DeviceCodeStore]): The store of pending devices, checked first.
         """
         self._device_repo = device_repo
+        self._device_store = device_store
 
     async def __call__(self, user_code: str) -> None:
         """
@@ -35,6 +42,13 @@ class UserCodeValidator:
             UserCodeNotFoundError: If the user code is incorrect.
             UserCodeExpirationTimeError: If the user code has expired.
         """
+        if (
+            self._device_store is not None
+            and await self._device_store.get_by_user_code(user_code) is not None
+        ):
+            # The store forgets expired devices.
+            return
+
         if not await self._device_repo.exists(user_code):
             raise UserCodeNotFoundError("Incorrect user_code.")
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.data_access.postgresql.errors import (
     UserNotFoundError,
@@ -10,6 +10,7 @@ from src.data_access.postgresql.errors import (
 if TYPE_CHECKING:
     from pydantic import SecretStr
 
+    from src.business_logic.authorization.context import AuthorizationContext
     from src.business_logic.services.password import PasswordHash
     from src.data_access.postgresql.repositories import UserRepository
 
@@ -18,7 +19,10 @@ class UserCredentialsValidator:
     """Validates the requested user credentials against the credentials stored in the database."""
 
     def __init__(
-        self, user_repo: UserRepository, password_service: PasswordHash
+        self,
+        user_repo: UserRepository,
+        password_service: PasswordHash,
+        context: Optional[AuthorizationContext] = None,
     ):
         """
         Initializes a UserCredentialsValidator object.
@@ -26,9 +30,12 @@ class UserCredentialsValidator:
         Args:
             user_repo (UserRepository): The repository for accessing user information.
             password_service (PasswordHash): The service for hashing and validating passwords.
+            context (Optional[AuthorizationContext]): The context of the authorization
+                request, which keeps the user for the service once validated.
         """
         self._user_repo = user_repo
         self._password_service = password_service
+        self._users = context if context is not None else user_repo
 
     async def __call__(self, username: str, password: SecretStr) -> None:
         """
@@ -41,14 +48,22 @@ class UserCredentialsValidator:
         Raises:
             UserNotFoundError: If the username or password is invalid.
             WrongPasswordError: If the password is incorrect.
+
+        A hash made with a bcrypt cost other than the configured one is replaced,
+        the caller commits the session.
         """
-        if not await self._user_repo.exists_user(username):
+        user = await self._users.get_user_credentials(username)
+        if user is None:
             raise UserNotFoundError("Invalid username or password.")
 
-        hashed_password = (
-            await self._user_repo.get_hashed_password_by_username(username)
-        )
-        if not self._password_service.is_password_valid(
+        hashed_password = user.password_hash
+        if not await self._password_service.is_password_valid_async(
             password, hashed_password
         ):
             raise WrongPasswordError("Invalid username or password.")
+
+        upgraded_hash = await self._password_service.get_upgraded_hash(
+            password, hashed_password
+        )
+        if upgraded_hash:
+            await self._user_repo.update_password_hash(username, upgraded_hash)
@@ -0,0 +1,123 @@
+"""
+Authorization codes kept outside Postgres until they are redeemed.
+
+The store selected by [authorization_codes] backend holds a code for the
+auth code lifetime of its client, together with everything the token
+endpoint needs to redeem it: the client, user, scope, redirect uri and the
+PKCE challenge of the authorization request, bound to this very code rather
+than to the client. Redis redeems a code with an atomic GETDEL, so it is
+exchanged at most once whichever worker gets it.
+
+Postgres stays the fallback: codes go to persistent_grants when the backend
+is "database" or Redis is unavailable, and codes the store does not know
+are redeemed from there.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.business_logic.cache.invalidation import get_redis
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import (
+    AUTHORIZATION_CODES_BACKEND,
+    AUTHORIZATION_CODES_MEMORY_MAX_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+CODE_KEY_PREFIX = "authorization-code:"
+
+
+@dataclass(frozen=True)
+class AuthorizationCode:
+    client_id: str
+    user_id: int
+    scope: str
+    redirect_uri: str
+    code_challenge: Optional[str] = None
+    code_challenge_method: Optional[str] = None
+
+
+def get_code_digest(code: str) -> str:
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+class AuthorizationCodeStore:
+    async def save(self, code: str, data: AuthorizationCode, ttl: int) -> bool:
+        """
+        Keeps data until code is redeemed or ttl seconds pass. Returns
+        False if it could not be stored.
+        """
+        raise NotImplementedError
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        """
+        Returns the data of code and forgets it, or None if the store does
+        not know the code.
+        """
+        raise NotImplementedError
+
+
+class RedisAuthorizationCodeStore(AuthorizationCodeStore):
+    async def save(self, code: str, data: AuthorizationCode, ttl: int) -> bool:
+        try:
+            await get_redis().set(
+                f"{CODE_KEY_PREFIX}{get_code_digest(code)}",
+                json.dumps(asdict(data)),
+                ex=ttl,
+            )
+        except RedisError as exception:
+            logger.warning(f"Could not store an authorization code: {exception}")
+            return False
+        return True
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        try:
+            value = await get_redis().getdel(
+                f"{CODE_KEY_PREFIX}{get_code_digest(code)}"
+            )
+        except RedisError as exception:
+            logger.warning(f"Could not redeem an authorization code: {exception}")
+            return None
+        if value is None:
+            return None
+        return AuthorizationCode(**json.loads(value))
+
+
+class MemoryAuthorizationCodeStore(AuthorizationCodeStore):
+    """
+    Codes of a single worker, for development and tests: another worker
+    does not know them and they are lost on restart.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._codes: TTLCache[AuthorizationCode] = TTLCache(
+            max_size=max_size, ttl=0
+        )
+
+    async def save(self, code: str, data: AuthorizationCode, ttl: int) -> bool:
+        self._codes.set(get_code_digest(code), data, ttl=ttl)
+        return True
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        digest = get_code_digest(code)
+        data = self._codes.get(digest)
+        self._codes.pop(digest)
+        return data
+
+
+@lru_cache
+def get_authorization_code_store() -> Optional[AuthorizationCodeStore]:
+    """Returns the configured store, or None to keep codes in Postgres."""
+    if AUTHORIZATION_CODES_BACKEND == "redis":
+        return RedisAuthorizationCodeStore()
+    if AUTHORIZATION_CODES_BACKEND == "memory":
+        return MemoryAuthorizationCodeStore(
+            max_size=AUTHORIZATION_CODES_MEMORY_MAX_SIZE
+        )
+    return None
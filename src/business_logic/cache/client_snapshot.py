@@ -0,0 +1,78 @@
+from typing import Any, Iterable
+
+from src.business_logic.cache.invalidation import ALL_KEYS, on_invalidation
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import CLIENT_CACHE_MAX_SIZE, CLIENT_CACHE_TTL
+
+CLIENT_SNAPSHOTS = "client"
+
+
+class ClientSnapshot:
+    """
+    Immutable copy of the client configuration read by the OAuth endpoints.
+    """
+
+    __slots__ = (
+        "id",
+        "client_id",
+        "enabled",
+        "signing_algorithm",
+        "authorization_code_lifetime",
+        "device_code_lifetime",
+        "require_pkce",
+        "redirect_uris",
+        "post_logout_redirect_uris",
+        "scopes",
+        "response_types",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        client_id: str,
+        enabled: bool,
+        signing_algorithm: str,
+        authorization_code_lifetime: int,
+        device_code_lifetime: int,
+        require_pkce: bool,
+        redirect_uris: Iterable[str],
+        post_logout_redirect_uris: Iterable[str],
+        scopes: Iterable[str],
+        response_types: Iterable[str],
+    ) -> None:
+        set_field = super().__setattr__
+        set_field("id", id)
+        set_field("client_id", client_id)
+        set_field("enabled", enabled)
+        set_field("signing_algorithm", signing_algorithm)
+        set_field("authorization_code_lifetime", authorization_code_lifetime)
+        set_field("device_code_lifetime", device_code_lifetime)
+        set_field("require_pkce", require_pkce)
+        set_field("redirect_uris", frozenset(redirect_uris))
+        set_field("post_logout_redirect_uris", frozenset(post_logout_redirect_uris))
+        set_field("scopes", frozenset(scopes))
+        set_field("response_types", frozenset(response_types))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"ClientSnapshot(client_id={self.client_id!r})"
+
+
+client_snapshot_cache: TTLCache[ClientSnapshot] = TTLCache(
+    max_size=CLIENT_CACHE_MAX_SIZE, ttl=CLIENT_CACHE_TTL
+)
+
+
+def _invalidate_client_snapshot(client_id: str) -> None:
+    if client_id == ALL_KEYS:
+        client_snapshot_cache.clear()
+    else:
+        client_snapshot_cache.pop(client_id)
+
+
+on_invalidation(CLIENT_SNAPSHOTS, _invalidate_client_snapshot)
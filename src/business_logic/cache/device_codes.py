@@ -0,0 +1,244 @@
+"""
+Pending device authorizations kept outside Postgres until they are approved.
+
+The store selected by [device_codes] backend holds a device code and its
+user code for the device code lifetime of the client. Polls of a pending
+device are answered from the store, and a device polling faster than its
+interval is told to slow down and must then wait 5 seconds longer between
+polls, see https://www.rfc-editor.org/rfc/rfc8628#section-3.5. Only the approval writes to Postgres: the
+device grant is stored in persistent_grants as before and the device is
+marked approved, so its next poll redeems that grant.
+
+Postgres stays the fallback: devices go to the devices table when the
+backend is "database" or Redis is unavailable, and devices the store does
+not know are looked up there.
+"""
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.business_logic.cache.invalidation import get_redis
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import (
+    DEVICE_CODES_BACKEND,
+    DEVICE_CODES_INTERVAL,
+    DEVICE_CODES_MEMORY_MAX_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+DEVICE_CODE_KEY_PREFIX = "device-code:"
+USER_CODE_KEY_PREFIX = "device-user-code:"
+POLL_KEY_PREFIX = "device-poll:"
+INTERVAL_KEY_PREFIX = "device-interval:"
+
+# Seconds of leeway for the network between polls.
+POLL_LEEWAY = 1
+# Seconds added to the interval of a device by each slow_down.
+SLOW_DOWN_STEP = 5
+
+
+@dataclass(frozen=True)
+class PendingDevice:
+    client_id: str
+    device_code: str
+    user_code: str
+    expires_at: int
+    approved: bool = False
+    interval: int = DEVICE_CODES_INTERVAL
+
+
+def get_device_code_digest(device_code: str) -> str:
+    return hashlib.sha256(device_code.encode()).hexdigest()
+
+
+def get_poll_window(interval: int) -> int:
+    """Seconds after a poll during which the next one gets slow_down."""
+    return max(interval - POLL_LEEWAY, 1)
+
+
+class DeviceCodeStore:
+    async def save(self, device: PendingDevice) -> bool:
+        """
+        Keeps device until it expires. Returns False if it could not be stored.
+        """
+        raise NotImplementedError
+
+    async def get(self, device_code: str) -> Optional[PendingDevice]:
+        raise NotImplementedError
+
+    async def get_by_user_code(self, user_code: str) -> Optional[PendingDevice]:
+        """Returns the device of a user code that was not approved yet."""
+        raise NotImplementedError
+
+    async def approve(self, device: PendingDevice) -> None:
+        """
+        Marks device approved and retires its user code. Raises RedisError
+        if Redis is unavailable, the device would stay pending otherwise.
+        """
+        raise NotImplementedError
+
+    async def delete(self, device: PendingDevice) -> None:
+        raise NotImplementedError
+
+    async def poll(self, device: PendingDevice) -> bool:
+        """
+        Records a poll of device. Returns False if the previous poll was
+        less than its interval ago, the interval then grows by SLOW_DOWN_STEP
+        for the rest of the device's life.
+        """
+        raise NotImplementedError
+
+
+class RedisDeviceCodeStore(DeviceCodeStore):
+    async def save(self, device: PendingDevice) -> bool:
+        value = json.dumps(asdict(device))
+        try:
+            async with get_redis().pipeline(transaction=True) as pipeline:
+                pipeline.set(
+                    self._device_key(device.device_code), value, exat=device.expires_at
+                )
+                pipeline.set(
+                    f"{USER_CODE_KEY_PREFIX}{device.user_code}",
+                    value,
+                    exat=device.expires_at,
+                )
+                await pipeline.execute()
+        except RedisError as exception:
+            logger.warning(f"Could not store a device code: {exception}")
+            return False
+        return True
+
+    async def get(self, device_code: str) -> Optional[PendingDevice]:
+        return await self._get(self._device_key(device_code))
+
+    async def get_by_user_code(self, user_code: str) -> Optional[PendingDevice]:
+        return await self._get(f"{USER_CODE_KEY_PREFIX}{user_code}")
+
+    async def approve(self, device: PendingDevice) -> None:
+        async with get_redis().pipeline(transaction=True) as pipeline:
+            pipeline.set(
+                self._device_key(device.device_code),
+                json.dumps(asdict(replace(device, approved=True))),
+                exat=device.expires_at,
+            )
+            pipeline.delete(f"{USER_CODE_KEY_PREFIX}{device.user_code}")
+            await pipeline.execute()
+
+    async def delete(self, device: PendingDevice) -> None:
+        try:
+            await get_redis().delete(
+                self._device_key(device.device_code),
+                f"{USER_CODE_KEY_PREFIX}{device.user_code}",
+            )
+        except RedisError as exception:
+            logger.warning(f"Could not delete a device code: {exception}")
+
+    async def poll(self, device: PendingDevice) -> bool:
+        digest = get_device_code_digest(device.device_code)
+        poll_key = f"{POLL_KEY_PREFIX}{digest}"
+        interval_key = f"{INTERVAL_KEY_PREFIX}{digest}"
+        try:
+            redis = get_redis()
+            interval = device.interval + int(await redis.get(interval_key) or 0)
+            if await redis.set(
+                poll_key, 1, px=get_poll_window(interval) * 1000, nx=True
+            ):
+                return True
+            interval += SLOW_DOWN_STEP
+            async with redis.pipeline(transaction=True) as pipeline:
+                pipeline.incrby(interval_key, SLOW_DOWN_STEP)
+                pipeline.expireat(interval_key, device.expires_at)
+                pipeline.set(poll_key, 1, px=get_poll_window(interval) * 1000)
+                await pipeline.execute()
+        except RedisError as exception:
+            logger.warning(f"Could not record a device poll: {exception}")
+            return True
+        return False
+
+    @staticmethod
+    def _device_key(device_code: str) -> str:
+        return f"{DEVICE_CODE_KEY_PREFIX}{get_device_code_digest(device_code)}"
+
+    @staticmethod
+    async def _get(key: str) -> Optional[PendingDevice]:
+        try:
+            value = await get_redis().get(key)
+        except RedisError as exception:
+            logger.warning(f"Could not read a device code: {exception}")
+            return None
+        if value is None:
+            return None
+        return PendingDevice(**json.loads(value))
+
+
+class MemoryDeviceCodeStore(DeviceCodeStore):
+    """
+    Devices of a single worker, for development and tests: another worker
+    does not know them and they are lost on restart.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._devices: TTLCache[PendingDevice] = TTLCache(max_size=max_size, ttl=0)
+        self._user_codes: TTLCache[str] = TTLCache(max_size=max_size, ttl=0)
+        self._polls: TTLCache[bool] = TTLCache(max_size=max_size, ttl=0)
+        # Seconds added to the interval of the devices told to slow down.
+        self._slow_downs: TTLCache[int] = TTLCache(max_size=max_size, ttl=0)
+
+    async def save(self, device: PendingDevice) -> bool:
+        ttl = device.expires_at - time.time()
+        self._devices.set(device.device_code, device, ttl=ttl)
+        self._user_codes.set(device.user_code, device.device_code, ttl=ttl)
+        return True
+
+    async def get(self, device_code: str) -> Optional[PendingDevice]:
+        return self._devices.get(device_code)
+
+    async def get_by_user_code(self, user_code: str) -> Optional[PendingDevice]:
+        device_code = self._user_codes.get(user_code)
+        return None if device_code is None else self._devices.get(device_code)
+
+    async def approve(self, device: PendingDevice) -> None:
+        self._devices.set(
+            device.device_code,
+            replace(device, approved=True),
+            ttl=device.expires_at - time.time(),
+        )
+        self._user_codes.pop(device.user_code)
+
+    async def delete(self, device: PendingDevice) -> None:
+        self._devices.pop(device.device_code)
+        self._user_codes.pop(device.user_code)
+
+    async def poll(self, device: PendingDevice) -> bool:
+        slow_down = self._slow_downs.get(device.device_code) or 0
+        if device.device_code in self._polls:
+            slow_down += SLOW_DOWN_STEP
+            self._slow_downs.set(
+                device.device_code, slow_down, ttl=device.expires_at - time.time()
+            )
+            accepted = False
+        else:
+            accepted = True
+        self._polls.set(
+            device.device_code,
+            True,
+            ttl=get_poll_window(device.interval + slow_down),
+        )
+        return accepted
+
+
+@lru_cache
+def get_device_code_store() -> Optional[DeviceCodeStore]:
+    """Returns the configured store, or None to keep devices in Postgres."""
+    if DEVICE_CODES_BACKEND == "redis":
+        return RedisDeviceCodeStore()
+    if DEVICE_CODES_BACKEND == "memory":
+        return MemoryDeviceCodeStore(max_size=DEVICE_CODES_MEMORY_MAX_SIZE)
+    return None
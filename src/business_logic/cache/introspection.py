@@ -0,0 +1,78 @@
+import hashlib
+import time
+from typing import Any, Optional
+
+from prometheus_client import Counter
+
+from src.business_logic.cache.invalidation import (
+    ALL_KEYS,
+    on_invalidation,
+    publish_invalidation,
+)
+from src.business_logic.cache.revocation import REVOCATION_EPOCHS
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import INTROSPECTION_CACHE_MAX_SIZE, INTROSPECTION_CACHE_TTL
+
+INTROSPECTION_RESULTS = "introspection"
+
+INTROSPECTION_CACHE_REQUESTS = Counter(
+    "introspection_cache_requests",
+    "Introspected tokens looked up in the introspection result cache.",
+    ["result"],
+)
+
+# Responses of verified access tokens by the SHA-256 of the token, then by
+# the token_type_hint they were given for.
+introspection_cache: TTLCache[dict[Optional[str], dict[str, Any]]] = TTLCache(
+    max_size=INTROSPECTION_CACHE_MAX_SIZE, ttl=INTROSPECTION_CACHE_TTL
+)
+
+
+def get_token_digest(token: str) -> str:
+    return hashlib.sha256(token.replace("Bearer ", "").encode()).hexdigest()
+
+
+def get_introspection_result(
+    token: str, token_type_hint: Optional[str]
+) -> Optional[dict[str, Any]]:
+    responses = introspection_cache.get(get_token_digest(token))
+    response = None if responses is None else responses.get(token_type_hint)
+    if response is None:
+        INTROSPECTION_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+    INTROSPECTION_CACHE_REQUESTS.labels(result="hit").inc()
+    return dict(response)
+
+
+def set_introspection_result(
+    token: str, token_type_hint: Optional[str], response: dict[str, Any]
+) -> None:
+    """
+    Caches the response of an active token, but never beyond its exp.
+    """
+    ttl = float(INTROSPECTION_CACHE_TTL)
+    exp = response.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl > 0:
+        digest = get_token_digest(token)
+        responses = dict(introspection_cache.get(digest) or {})
+        responses[token_type_hint] = dict(response)
+        introspection_cache.set(digest, responses, ttl=ttl)
+
+
+async def evict_introspection_result(token: str) -> None:
+    """Drops the cached response of a revoked token on all workers."""
+    await publish_invalidation(INTROSPECTION_RESULTS, get_token_digest(token))
+
+
+def _invalidate_introspection_result(digest: str) -> None:
+    if digest == ALL_KEYS:
+        introspection_cache.clear()
+    else:
+        introspection_cache.pop(digest)
+
+
+on_invalidation(INTROSPECTION_RESULTS, _invalidate_introspection_result)
+# Logouts revoke all tokens of a user or client without naming them.
+on_invalidation(REVOCATION_EPOCHS, lambda key: introspection_cache.clear())
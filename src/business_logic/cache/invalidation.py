@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.dyna_config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "auth-service:cache-invalidation"
+ALL_KEYS = "*"
+RECONNECT_DELAY = 5
+
+InvalidationHandler = Callable[[str], None]
+
+_handlers: defaultdict[str, list[InvalidationHandler]] = defaultdict(list)
+
+
+@lru_cache
+def get_redis() -> aioredis.Redis:
+    return aioredis.from_url(REDIS_URL, encoding="utf8", decode_responses=True)
+
+
+def on_invalidation(topic: str, handler: InvalidationHandler) -> None:
+    """
+    Registers handler to be called with the invalidated key (or ALL_KEYS)
+    whenever any worker publishes an invalidation of topic.
+    """
+    _handlers[topic].append(handler)
+
+
+def invalidate_locally(topic: str, key: str = ALL_KEYS) -> None:
+    for handler in _handlers.get(topic, ()):
+        handler(key)
+
+
+def _invalidate_everything() -> None:
+    for topic in list(_handlers):
+        invalidate_locally(topic)
+
+
+async def publish_invalidation(topic: str, key: str = ALL_KEYS) -> None:
+    """
+    Drops the cached entries for key in this worker and tells the other
+    workers to do the same. Call it after the change is committed, otherwise
+    another worker can cache the old data again before the commit.
+    If Redis is unavailable the other workers catch up when their entries
+    expire.
+    """
+    invalidate_locally(topic, key)
+    try:
+        await get_redis().publish(INVALIDATION_CHANNEL, f"{topic}:{key}")
+    except RedisError as exception:
+        logger.warning(f"Could not publish invalidation of {topic}:{key}: {exception}")
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Applies invalidations published by other workers until cancelled.
+    Everything is invalidated after a lost connection, as messages
+    published in the meantime are gone.
+    """
+    while True:
+        pubsub = get_redis().pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            _invalidate_everything()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                topic, _, key = message["data"].partition(":")
+                invalidate_locally(topic, key or ALL_KEYS)
+        except RedisError as exception:
+            logger.warning(f"Cache invalidation listener disconnected: {exception}")
+        finally:
+            await pubsub.aclose()
+        await asyncio.sleep(RECONNECT_DELAY)
@@ -0,0 +1,357 @@
+"""
+Revoked access tokens, stored in Redis by jti until the token expires.
+
+Every worker keeps a Bloom filter of the revoked jtis, filled from Redis
+and kept up to date through the invalidation channel, so a token that was
+not revoked is recognized without leaving the process. Redis is only asked
+about the jtis in the filter.
+
+Postgres stays the record of revocations: tokens without a jti, tokens
+issued before Redis started to track revocations and every case the store
+is not sure about are checked against blacklisted_tokens.
+
+All tokens of a user or a client are revoked at once by a revocation epoch:
+tokens issued before it are invalid. Epochs live in revocation_epochs and
+are cached by every worker. Once a revocation is committed, its epoch is
+copied to Redis for epoch_ttl seconds and announced on the invalidation
+channel. Redis only spares Postgres the lookups of recent revocations,
+epochs missing there are read from the table.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+
+from src.business_logic.cache.invalidation import (
+    ALL_KEYS,
+    get_redis,
+    invalidate_locally,
+    on_invalidation,
+    publish_invalidation,
+)
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.data_access.postgresql.repositories import (
+    BlacklistedTokenRepository,
+    RevocationEpochRepository,
+)
+from src.dyna_config import (
+    REVOCATION_CAPACITY,
+    REVOCATION_EPOCH_CACHE_MAX_SIZE,
+    REVOCATION_EPOCH_CACHE_TTL,
+    REVOCATION_EPOCH_TTL,
+    REVOCATION_ERROR_RATE,
+)
+
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKENS = "revoked"
+REVOKED_KEY_PREFIX = "revoked-token:"
+TRACKING_SINCE_KEY = "revoked-token-tracking-since"
+
+REVOCATION_EPOCHS = "revocation-epoch"
+EPOCH_KEY_PREFIX = "revocation-epoch:"
+SUBJECT = "sub"
+CLIENT = "client"
+
+# session.info key of the epochs to announce when the session commits.
+PENDING_EPOCHS = "revocation_epochs_pending"
+
+# Keeps the announcements started after a commit from being garbage collected.
+_publishing: set[asyncio.Task[None]] = set()
+
+
+class BloomFilter:
+    """
+    Set of strings answering membership with false positives at roughly
+    error_rate while holding at most capacity items, never with false
+    negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self._size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions out of two 64-bit halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + index * second) % self._size
+            for index in range(self._hash_count)
+        ]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationStore:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self._capacity = capacity
+        self._error_rate = error_rate
+        # None until loaded from Redis, the store knows nothing until then.
+        self._filter: Optional[BloomFilter] = None
+        self._tracking_since: Optional[int] = None
+        # jtis revoked while the filter is being rebuilt.
+        self._pending: Optional[set[str]] = None
+        self._rebuild: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def add(self, jti: str) -> None:
+        if self._pending is not None:
+            self._pending.add(jti)
+        if self._filter is None:
+            return
+        self._filter.add(jti)
+        if self._filter.count > self._filter.capacity:
+            # Full of jtis, most of them expired by now.
+            self.schedule_rebuild()
+
+    def clear(self) -> None:
+        self._filter = None
+        self._tracking_since = None
+
+    def schedule_rebuild(self) -> None:
+        if self._rebuild is None or self._rebuild.done():
+            self._rebuild = asyncio.get_running_loop().create_task(
+                self.rebuild()
+            )
+
+    async def rebuild(self) -> None:
+        """Loads the jtis of all unexpired revocations from Redis."""
+        redis = get_redis()
+        self._pending = set()
+        try:
+            await redis.set(TRACKING_SINCE_KEY, int(time.time()), nx=True)
+            tracking_since = int(await redis.get(TRACKING_SINCE_KEY))
+            bloom_filter = BloomFilter(self._capacity, self._error_rate)
+            async for key in redis.scan_iter(match=f"{REVOKED_KEY_PREFIX}*"):
+                bloom_filter.add(key[len(REVOKED_KEY_PREFIX):])
+            for jti in self._pending:
+                bloom_filter.add(jti)
+        except RedisError as exception:
+            logger.warning(f"Could not load revoked tokens: {exception}")
+            self.clear()
+            return
+        finally:
+            self._pending = None
+        if bloom_filter.count > self._capacity:
+            logger.warning(
+                f"{bloom_filter.count} revoked tokens exceed [revocation] "
+                f"capacity, false positives will reach Redis more often"
+            )
+        self._filter = bloom_filter
+        self._tracking_since = tracking_since
+
+    async def revoke(self, jti: str, expiration: int) -> None:
+        """
+        Stores the revocation until the token expires and tells every
+        worker about it. Raises RedisError if it could not be stored.
+        """
+        ttl = expiration - int(time.time())
+        if ttl <= 0:
+            return
+        await get_redis().set(f"{REVOKED_KEY_PREFIX}{jti}", expiration, ex=ttl)
+        await publish_invalidation(REVOKED_TOKENS, jti)
+
+    async def is_revoked(
+        self, jti: Optional[str], issued_at: Optional[int]
+    ) -> Optional[bool]:
+        """
+        Returns whether the token was revoked, or None if only Postgres
+        can tell.
+        """
+        if (
+            self._filter is None
+            or jti is None
+            or issued_at is None
+            or issued_at < self._tracking_since
+        ):
+            return None
+        if jti not in self._filter:
+            return False
+        try:
+            if await get_redis().exists(f"{REVOKED_KEY_PREFIX}{jti}"):
+                return True
+        except RedisError as exception:
+            logger.warning(f"Could not check revocation of {jti}: {exception}")
+        # A false positive, or a revocation lost by Redis.
+        return None
+
+
+revocation_store = RevocationStore(
+    capacity=REVOCATION_CAPACITY, error_rate=REVOCATION_ERROR_RATE
+)
+
+
+def _on_revocation(jti: str) -> None:
+    if jti == ALL_KEYS:
+        # Revocations may have been missed, reload them.
+        revocation_store.clear()
+        revocation_store.schedule_rebuild()
+    else:
+        revocation_store.add(jti)
+
+
+on_invalidation(REVOKED_TOKENS, _on_revocation)
+
+
+revocation_epoch_cache: TTLCache[int] = TTLCache(
+    max_size=REVOCATION_EPOCH_CACHE_MAX_SIZE, ttl=REVOCATION_EPOCH_CACHE_TTL
+)
+
+
+def _get_epoch_key(kind: str, subject: str) -> str:
+    return f"{kind}:{subject}"
+
+
+def _invalidate_revocation_epoch(key: str) -> None:
+    if key == ALL_KEYS:
+        revocation_epoch_cache.clear()
+    else:
+        revocation_epoch_cache.pop(key)
+
+
+on_invalidation(REVOCATION_EPOCHS, _invalidate_revocation_epoch)
+
+
+async def _load_epochs(
+    epoch_repo: RevocationEpochRepository, subjects: list[tuple[str, str]]
+) -> dict[tuple[str, str], int]:
+    redis = get_redis()
+    keys = [
+        f"{EPOCH_KEY_PREFIX}{_get_epoch_key(*subject)}" for subject in subjects
+    ]
+    try:
+        values = await redis.mget(keys)
+    except RedisError as exception:
+        logger.warning(f"Could not read revocation epochs: {exception}")
+        values = [None] * len(keys)
+    epochs = {
+        subject: int(value)
+        for subject, value in zip(subjects, values)
+        if value is not None
+    }
+    unknown = [subject for subject in subjects if subject not in epochs]
+    if unknown:
+        # Not copied to Redis: the session may not see the latest commits,
+        # only revocations themselves write there.
+        stored = await epoch_repo.get_epochs(unknown)
+        for subject in unknown:
+            epochs[subject] = stored.get(subject, 0)
+    for subject, epoch in epochs.items():
+        revocation_epoch_cache.set(_get_epoch_key(*subject), epoch)
+    return epochs
+
+
+async def get_revocation_epoch(
+    epoch_repo: RevocationEpochRepository, subjects: list[tuple[str, str]]
+) -> int:
+    """
+    Returns the latest revocation epoch of the (kind, subject) pairs,
+    0 if there is none.
+    """
+    epochs = []
+    missing = []
+    for subject in subjects:
+        epoch = revocation_epoch_cache.get(_get_epoch_key(*subject))
+        if epoch is None:
+            missing.append(subject)
+        else:
+            epochs.append(epoch)
+    if missing:
+        epochs.extend((await _load_epochs(epoch_repo, missing)).values())
+    return max(epochs, default=0)
+
+
+async def revoke_issued_tokens(
+    epoch_repo: RevocationEpochRepository, kind: str, subject: str
+) -> None:
+    """
+    Revokes every token of the subject issued before the current second,
+    so a token issued right after, e.g. on the next login, stays valid.
+    The epoch reaches the table with the caller's commit, and only then
+    Redis and the other workers, so that none of them caches the previous
+    epoch again in between.
+    """
+    revoked_before = int(time.time())
+    await epoch_repo.set_epoch(kind, subject, revoked_before)
+    session = epoch_repo.session
+    pending = session.info.get(PENDING_EPOCHS)
+    if pending is None:
+        pending = session.info[PENDING_EPOCHS] = {}
+        event.listen(
+            session.sync_session, "after_commit", _announce_pending, once=True
+        )
+    pending[_get_epoch_key(kind, subject)] = revoked_before
+
+
+def _announce_pending(sync_session: Any) -> None:
+    epochs = sync_session.info.pop(PENDING_EPOCHS, {})
+    for key in epochs:
+        invalidate_locally(REVOCATION_EPOCHS, key)
+    if epochs:
+        task = asyncio.get_running_loop().create_task(_announce_epochs(epochs))
+        _publishing.add(task)
+        task.add_done_callback(_publishing.discard)
+
+
+async def _announce_epochs(epochs: dict[str, int]) -> None:
+    """
+    Copies committed epochs to Redis and tells the other workers. If Redis
+    is unavailable they read the table once their cached epochs expire.
+    """
+    for key, revoked_before in epochs.items():
+        try:
+            await get_redis().set(
+                f"{EPOCH_KEY_PREFIX}{key}",
+                revoked_before,
+                ex=REVOCATION_EPOCH_TTL,
+            )
+        except RedisError as exception:
+            logger.warning(f"Could not store revocation epoch of {key}: {exception}")
+        await publish_invalidation(REVOCATION_EPOCHS, key)
+
+
+async def is_token_revoked(
+    token: str,
+    payload: dict[str, Any],
+    blacklisted_repo: BlacklistedTokenRepository,
+    epoch_repo: RevocationEpochRepository,
+) -> bool:
+    issued_at = payload.get("iat")
+    subjects = [
+        (kind, str(payload[claim]))
+        for kind, claim in ((SUBJECT, "sub"), (CLIENT, "client_id"))
+        if claim in payload
+    ]
+    if issued_at is not None and subjects:
+        if issued_at < await get_revocation_epoch(epoch_repo, subjects):
+            return True
+    revoked = await revocation_store.is_revoked(
+        payload.get("jti"), issued_at
+    )
+    if revoked is None:
+        return await blacklisted_repo.exists(token=token)
+    return revoked
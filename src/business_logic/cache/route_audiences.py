@@ -0,0 +1,61 @@
+from typing import Optional
+
+from src.business_logic.cache.invalidation import on_invalidation
+from src.data_access.postgresql.repositories import ResourcesRepository
+
+ROUTE_AUDIENCES = "route-audience"
+
+OIDC_RESOURCE_NAME = "oidc"
+OIDC_USERINFO_ROUTE_NAME = "userinfo"
+
+
+def build_route_audiences(scope_claims: dict[str, list[str]]) -> dict[str, list[str]]:
+    """
+    Maps every route (a scope of the oidc resource) to the audience its
+    tokens need: the claim types of userinfo, "oidc:<route>:<claim type>"
+    for the other routes.
+    """
+    audiences = {}
+    for route, claim_types in scope_claims.items():
+        if route == OIDC_USERINFO_ROUTE_NAME:
+            audiences[route] = list(claim_types)
+        else:
+            audiences[route] = [
+                f"{OIDC_RESOURCE_NAME}:{route}:{claim_type}"
+                for claim_type in claim_types
+            ]
+    return audiences
+
+
+class RouteAudiences:
+    """
+    Audiences of all routes, read from the oidc API resource on first use
+    and kept until the API resources change.
+    """
+
+    def __init__(self) -> None:
+        self._audiences: Optional[dict[str, list[str]]] = None
+        # Tells a load started before an invalidation not to store its result.
+        self._version = 0
+
+    def clear(self) -> None:
+        self._audiences = None
+        self._version += 1
+
+    async def get(
+        self, resource_repo: ResourcesRepository, route: str
+    ) -> Optional[list[str]]:
+        audiences = self._audiences
+        if audiences is None:
+            version = self._version
+            audiences = build_route_audiences(
+                await resource_repo.get_all_scope_claims(OIDC_RESOURCE_NAME)
+            )
+            if version == self._version:
+                self._audiences = audiences
+        return audiences.get(route)
+
+
+route_audiences = RouteAudiences()
+
+on_invalidation(ROUTE_AUDIENCES, lambda key: route_audiences.clear())
@@ -0,0 +1,235 @@
+"""
+Single sign-on sessions of browsers that signed in at the authorization
+endpoint.
+
+A session is tracked by the store selected by [sso_session] backend and
+identified by a random id. The browser only holds the id and its HMAC in a
+compact cookie, so a forged or guessed cookie is refused before the store is
+asked, and a session ended on the server can not be revived by the cookie.
+While the session lasts, the authorization endpoint issues codes and tokens
+without asking for the password again.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.business_logic.cache.invalidation import get_redis
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.config.settings.app import AppSettings
+from src.dyna_config import (
+    SSO_SESSION_BACKEND,
+    SSO_SESSION_LIFETIME,
+    SSO_SESSION_MEMORY_MAX_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY_PREFIX = "sso-session:"
+USER_SESSIONS_KEY_PREFIX = "sso-user-sessions:"
+
+
+@dataclass(frozen=True)
+class SsoSession:
+    session_id: str
+    user_id: int
+    username: str
+    auth_time: int
+    expires_at: int
+
+
+def get_session_digest(session_id: str) -> str:
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+@lru_cache
+def _get_signing_key() -> bytes:
+    return hashlib.sha256(
+        b"sso-session:" + AppSettings().secret_key.get_secret_value().encode()
+    ).digest()
+
+
+def _sign(session_id: str) -> str:
+    signature = hmac.new(
+        _get_signing_key(), session_id.encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(signature[:16]).decode().rstrip("=")
+
+
+def get_session_cookie(session_id: str) -> str:
+    return f"{session_id}.{_sign(session_id)}"
+
+
+def get_session_id(cookie: Optional[str]) -> Optional[str]:
+    """Returns the session id of a cookie with a valid signature."""
+    if not cookie:
+        return None
+    session_id, _, signature = cookie.rpartition(".")
+    if not session_id or not hmac.compare_digest(signature, _sign(session_id)):
+        return None
+    return session_id
+
+
+class SsoSessionStore(ABC):
+    @abstractmethod
+    async def save(self, session: SsoSession) -> bool:
+        """
+        Keeps session until it expires. Returns False if it could not be stored.
+        """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SsoSession]:
+        ...
+
+    @abstractmethod
+    async def end(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def end_user_sessions(self, user_id: int) -> None:
+        ...
+
+
+class RedisSsoSessionStore(SsoSessionStore):
+    async def save(self, session: SsoSession) -> bool:
+        digest = get_session_digest(session.session_id)
+        user_sessions_key = f"{USER_SESSIONS_KEY_PREFIX}{session.user_id}"
+        try:
+            async with get_redis().pipeline(transaction=True) as pipeline:
+                pipeline.set(
+                    f"{SESSION_KEY_PREFIX}{digest}",
+                    json.dumps(asdict(session)),
+                    exat=session.expires_at,
+                )
+                pipeline.sadd(user_sessions_key, digest)
+                # All sessions last as long, the newest one expires last.
+                pipeline.expireat(user_sessions_key, session.expires_at)
+                await pipeline.execute()
+        except RedisError as exception:
+            logger.warning(f"Could not store an SSO session: {exception}")
+            return False
+        return True
+
+    async def get(self, session_id: str) -> Optional[SsoSession]:
+        try:
+            value = await get_redis().get(
+                f"{SESSION_KEY_PREFIX}{get_session_digest(session_id)}"
+            )
+        except RedisError as exception:
+            logger.warning(f"Could not read an SSO session: {exception}")
+            return None
+        if value is None:
+            return None
+        return SsoSession(**json.loads(value))
+
+    async def end(self, session_id: str) -> None:
+        await get_redis().delete(
+            f"{SESSION_KEY_PREFIX}{get_session_digest(session_id)}"
+        )
+
+    async def end_user_sessions(self, user_id: int) -> None:
+        redis = get_redis()
+        user_sessions_key = f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
+        digests = await redis.smembers(user_sessions_key)
+        await redis.delete(
+            user_sessions_key,
+            *(f"{SESSION_KEY_PREFIX}{digest}" for digest in digests),
+        )
+
+
+class MemorySsoSessionStore(SsoSessionStore):
+    """
+    Sessions of a single worker, for development and tests: another worker
+    does not know them and they are lost on restart.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._sessions: TTLCache[SsoSession] = TTLCache(max_size=max_size, ttl=0)
+        self._user_sessions: dict[int, set[str]] = {}
+
+    async def save(self, session: SsoSession) -> bool:
+        self._sessions.set(
+            session.session_id, session, ttl=session.expires_at - time.time()
+        )
+        user_sessions = self._user_sessions.setdefault(session.user_id, set())
+        # Forgets the ids of the sessions that expired meanwhile.
+        user_sessions.intersection_update(
+            session_id
+            for session_id in user_sessions
+            if session_id in self._sessions
+        )
+        user_sessions.add(session.session_id)
+        return True
+
+    async def get(self, session_id: str) -> Optional[SsoSession]:
+        return self._sessions.get(session_id)
+
+    async def end(self, session_id: str) -> None:
+        self._sessions.pop(session_id)
+
+    async def end_user_sessions(self, user_id: int) -> None:
+        for session_id in self._user_sessions.pop(user_id, ()):
+            self._sessions.pop(session_id)
+
+
+@lru_cache
+def get_sso_session_store() -> Optional[SsoSessionStore]:
+    """Returns the configured store, or None if SSO sessions are off."""
+    if SSO_SESSION_BACKEND == "redis":
+        return RedisSsoSessionStore()
+    if SSO_SESSION_BACKEND == "memory":
+        return MemorySsoSessionStore(max_size=SSO_SESSION_MEMORY_MAX_SIZE)
+    return None
+
+
+async def start_sso_session(
+    store: SsoSessionStore, user_id: int, username: str
+) -> Optional[SsoSession]:
+    """Returns the new session, or None if the store could not keep it."""
+    now = int(time.time())
+    session = SsoSession(
+        session_id=secrets.token_urlsafe(24),
+        user_id=user_id,
+        username=username,
+        auth_time=now,
+        expires_at=now + SSO_SESSION_LIFETIME,
+    )
+    if not await store.save(session):
+        return None
+    return session
+
+
+async def get_sso_session(
+    cookie: Optional[str],
+    prompt: Optional[str] = None,
+    max_age: Optional[int] = None,
+) -> Optional[SsoSession]:
+    """
+    Returns the session of the cookie, unless the authorization request asks
+    to sign in again with prompt=login or the session is older than max_age.
+
+    Reference: https://openid.net/specs/openid-connect-core-1_0.html#AuthRequest
+    """
+    store = get_sso_session_store()
+    session_id = get_session_id(cookie)
+    if store is None or session_id is None:
+        return None
+    if prompt and "login" in prompt.split():
+        return None
+    session = await store.get(session_id)
+    if (
+        session is not None
+        and max_age is not None
+        and time.time() - session.auth_time > max_age
+    ):
+        return None
+    return session
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Iterable, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.business_logic.cache.invalidation import (
+    ALL_KEYS,
+    invalidate_locally,
+    on_invalidation,
+    publish_invalidation,
+)
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import USER_CLAIMS_CACHE_MAX_SIZE, USER_CLAIMS_CACHE_TTL
+
+USER_CLAIMS = "user-claims"
+
+# session.info key of the users whose claims change when the session commits.
+PENDING_INVALIDATIONS = "user_claims_invalidations"
+
+Scopes = frozenset[str]
+
+# Userinfo responses of every subject by the scope set of the token.
+user_claims_cache: TTLCache[dict[Scopes, dict[str, Any]]] = TTLCache(
+    max_size=USER_CLAIMS_CACHE_MAX_SIZE, ttl=USER_CLAIMS_CACHE_TTL
+)
+
+# Keeps the invalidations published after a commit from being garbage collected.
+_publishing: set[asyncio.Task[None]] = set()
+
+
+def normalize_scopes(scope: Union[None, str, Iterable[str]]) -> Scopes:
+    """
+    Returns the scopes of a token whatever their order, duplicates or
+    separators, so that equal scope sets share a cache entry.
+    """
+    if not scope:
+        return frozenset()
+    if isinstance(scope, str):
+        return frozenset(scope.split())
+    return frozenset(scope)
+
+
+def get_user_claims(sub: str, scopes: Scopes) -> Optional[dict[str, Any]]:
+    by_scopes = user_claims_cache.get(sub)
+    if by_scopes is None:
+        return None
+    claims = by_scopes.get(scopes)
+    return None if claims is None else dict(claims)
+
+
+def set_user_claims(sub: str, scopes: Scopes, claims: dict[str, Any]) -> None:
+    by_scopes = user_claims_cache.get(sub)
+    if by_scopes is None:
+        by_scopes = {}
+        user_claims_cache.set(sub, by_scopes)
+    by_scopes[scopes] = dict(claims)
+
+
+def invalidate_user_claims_on_commit(session: AsyncSession, user_id: int) -> None:
+    """
+    Drops the cached claims of user_id on all workers once session commits,
+    so that no worker can cache them again before the change is visible.
+    """
+    pending = session.info.get(PENDING_INVALIDATIONS)
+    if pending is None:
+        pending = session.info[PENDING_INVALIDATIONS] = set()
+        event.listen(
+            session.sync_session, "after_commit", _publish_pending, once=True
+        )
+    pending.add(str(user_id))
+
+
+def _publish_pending(sync_session: Any) -> None:
+    loop = asyncio.get_running_loop()
+    for sub in sync_session.info.pop(PENDING_INVALIDATIONS, ()):
+        invalidate_locally(USER_CLAIMS, sub)
+        task = loop.create_task(publish_invalidation(USER_CLAIMS, sub))
+        _publishing.add(task)
+        task.add_done_callback(_publishing.discard)
+
+
+def _invalidate_user_claims(sub: str) -> None:
+    if sub == ALL_KEYS:
+        user_claims_cache.clear()
+    else:
+        user_claims_cache.pop(sub)
+
+
+on_invalidation(USER_CLAIMS, _invalidate_user_claims)
@@ -0,0 +1,67 @@
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, Optional
+
+from src.business_logic.cache.invalidation import on_invalidation
+
+WELL_KNOWN = "well-known"
+
+
+class SerializedDocument(NamedTuple):
+    content: bytes
+    etag: str
+
+
+def serialize_document(document: Any) -> SerializedDocument:
+    """
+    Serializes document to JSON once, with a strong ETag derived from the
+    content, so that equal documents on all workers share the ETag.
+    """
+    content = json.dumps(document, separators=(",", ":")).encode()
+    return SerializedDocument(
+        content=content, etag=f'"{hashlib.sha256(content).hexdigest()}"'
+    )
+
+
+class DocumentCache:
+    """
+    A document served as is until it is invalidated or the version it was
+    built for changes.
+    """
+
+    def __init__(self) -> None:
+        self._document: Optional[SerializedDocument] = None
+        self._built_for: Hashable = None
+        # Tells a build started before an invalidation not to store its result.
+        self._generation = 0
+
+    def clear(self) -> None:
+        self._document = None
+        self._generation += 1
+
+    async def get(
+        self,
+        build: Callable[[], Awaitable[Any]],
+        version: Hashable = None,
+    ) -> SerializedDocument:
+        document = self._document
+        if document is None or self._built_for != version:
+            generation = self._generation
+            document = serialize_document(await build())
+            if generation == self._generation:
+                self._document = document
+                self._built_for = version
+        return document
+
+
+openid_configuration_cache = DocumentCache()
+# Versioned by the kids of the keystore, so a key rotation rebuilds it.
+jwks_cache = DocumentCache()
+
+
+def _invalidate_well_known(key: str) -> None:
+    openid_configuration_cache.clear()
+    jwks_cache.clear()
+
+
+on_invalidation(WELL_KNOWN, _invalidate_well_known)
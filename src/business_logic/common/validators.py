@@ -16,7 +16,7 @@ class ClientValidator:
         self._client_repo = client_repo
 
     async def __call__(self, client_id: str) -> None:
-        if not await self._client_repo.exists(client_id=client_id):
+        if await self._client_repo.get_client_snapshot(client_id=client_id) is None:
             raise ClientNotFoundError("Incorrect client_id.")
 
 
@@ -25,7 +25,7 @@ class ClientIdValidator:
         self._client_repo = client_repo
 
     async def __call__(self, client_id: str) -> None:
-        if not await self._client_repo.exists(client_id=client_id):
+        if await self._client_repo.get_client_snapshot(client_id=client_id) is None:
             raise InvalidClientIdError
 
 
@@ -34,10 +34,8 @@ class RedirectUriValidator:
         self._client_repo = client_repo
 
     async def __call__(self, redirect_uri: str, client_id: str) -> None:
-        uris_list = await self._client_repo.list_all_redirect_uris_by_client(
-            client_id=client_id
-        )
-        if redirect_uri not in uris_list:
+        client = await self._client_repo.get_client_snapshot(client_id=client_id)
+        if client is None or redirect_uri not in client.redirect_uris:
             raise ClientRedirectUriError("Invalid redirect_uri.")
 
 
@@ -46,7 +44,8 @@ class ScopeValidator:
         self._client_repo = client_repo
     
     async def __call__(self, client_id: str, scopes: list[str]) -> None:
-        scopes_from_db = await self._client_repo.list_all_scopes_by_client(client_id=client_id)
+        client = await self._client_repo.get_client_snapshot(client_id=client_id)
+        scopes_from_db = client.scopes if client is not None else frozenset()
         for scope in scopes:
             if scope not in scopes_from_db:
                 raise InvalidClientScopeError
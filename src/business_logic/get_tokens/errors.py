@@ -16,3 +16,11 @@ class InvalidClientCredentialsError(Exception):
 
 class InvalidPkceCodeError(Exception):
     ...
+
+
+class AuthorizationPendingError(Exception):
+    ...
+
+
+class SlowDownError(Exception):
+    ...
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from src.business_logic.services.scope import ScopeService
+from src.business_logic.cache.authorization_codes import get_authorization_code_store
+from src.business_logic.cache.device_codes import get_device_code_store
 from src.business_logic.get_tokens.service_impls import (
     AuthorizationCodeTokenService,
     RefreshTokenGrantService,
@@ -60,14 +62,13 @@ class TokenServiceFactory:
         if grant_type == 'authorization_code':
             return AuthorizationCodeTokenService(
                 session=self._session,
-                grant_validator=ValidatePersistentGrant(persistent_grant_repo=self._persistent_grant_repo),
                 redirect_uri_validator=ValidateRedirectUri(client_repo=self._client_repo),
                 client_validator=ClientIdValidator(client_repo=self._client_repo),
-                code_validator=ValidateGrantByClient(persistent_grant_repo=self._persistent_grant_repo),
-                grant_exp_validator=ValidateGrantExpired(),
                 pkce_code_validator=ValidatePKCECode(code_challenge_repo=self._code_challenge_repo),
                 jwt_manager=self._jwt_manager,
-                persistent_grant_repo=self._persistent_grant_repo
+                persistent_grant_repo=self._persistent_grant_repo,
+                client_repo=self._client_repo,
+                code_store=get_authorization_code_store()
             )
         elif grant_type == 'refresh_token':
             return RefreshTokenGrantService(
@@ -77,7 +78,8 @@ class TokenServiceFactory:
                 refresh_token_validator=ValidateGrantByClient(persistent_grant_repo=self._persistent_grant_repo),
                 grant_exp_validator=ValidateGrantExpired(),
                 jwt_manager=self._jwt_manager,
-                persistent_grant_repo=self._persistent_grant_repo
+                persistent_grant_repo=self._persistent_grant_repo,
+                client_repo=self._client_repo
             )
         elif grant_type == 'client_credentials':
             return ClientCredentialsTokenService(
@@ -86,6 +88,7 @@ class TokenServiceFactory:
                 scope_validator=ScopeValidator(client_repo=self._client_repo),
                 jwt_manager=self._jwt_manager,
                 persistent_grant_repo=self._persistent_grant_repo,
+                client_repo=self._client_repo,
                 scope_service=ScopeService(
                     resource_repo=ResourcesRepository(session=self._session),
                     session=self._session,
@@ -100,6 +103,8 @@ class TokenServiceFactory:
                 redirect_uri_validator=ValidateRedirectUri(client_repo=self._client_repo),
                 jwt_manager=self._jwt_manager,
                 persistent_grant_repo=self._persistent_grant_repo,
+                client_repo=self._client_repo,
+                device_store=get_device_code_store(),
             )
         else:
             raise UnsupportedGrantTypeError
@@ -1,9 +1,11 @@
 from __future__ import annotations
 import time
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.business_logic.get_tokens.dto import RequestTokenModel, ResponseTokenModel
+from src.business_logic.get_tokens.errors import InvalidGrantError, InvalidPkceCodeError
+from src.business_logic.get_tokens.validators.validate_code_challenge import verify_code_verifier
 from src.business_logic.jwt_manager.dto import (
     AccessTokenPayload,
     RefreshTokenPayload,
@@ -13,9 +15,13 @@ from src.dyna_config import DOMAIN_NAME
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from src.business_logic.cache.authorization_codes import AuthorizationCode, AuthorizationCodeStore
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
-    from src.data_access.postgresql.repositories import PersistentGrantRepository
+    from src.data_access.postgresql.repositories import (
+        ClientRepository,
+        PersistentGrantRepository,
+    )
 
 
 class AuthorizationCodeTokenService:
@@ -27,64 +33,79 @@ class AuthorizationCodeTokenService:
     def __init__(
             self,
             session: AsyncSession,
-            grant_validator: ValidatorProtocol,
             redirect_uri_validator: ValidatorProtocol,
             client_validator: ValidatorProtocol,
-            code_validator: ValidatorProtocol,
-            grant_exp_validator: ValidatorProtocol,
             pkce_code_validator: ValidatorProtocol,
             jwt_manager: JWTManagerProtocol,
-            persistent_grant_repo: PersistentGrantRepository
+            persistent_grant_repo: PersistentGrantRepository,
+            client_repo: ClientRepository,
+            code_store: Optional[AuthorizationCodeStore] = None
     ) -> None:
         self._session = session
-        self._grant_validator = grant_validator
         self._redirect_uri_validator = redirect_uri_validator
         self._client_validator = client_validator
-        self._code_validator = code_validator
-        self._grant_expiration_validator = grant_exp_validator
         self._pkce_code_validator = pkce_code_validator
         self._jwt_manager = jwt_manager
         self._persistent_grant_repo = persistent_grant_repo
-        
+        self._client_repo = client_repo
+        self._code_store = code_store
 
     async def get_tokens(self, request_data: RequestTokenModel) -> ResponseTokenModel:
         await self._client_validator(request_data.client_id)
-        await self._code_validator(request_data.code, request_data.client_id, request_data.grant_type)
-        await self._grant_validator(request_data.code, request_data.grant_type)
         await self._redirect_uri_validator(request_data.redirect_uri, request_data.client_id)
+        code = None
+        if self._code_store is not None:
+            code = await self._code_store.redeem(request_data.code)
+        if code is None:
+            await self._pkce_code_validator(request_data.client_id, request_data.code_verifier)
+        else:
+            self._validate_stored_code(code=code, request_data=request_data)
 
-        grant = await self._persistent_grant_repo.get_grant(
-            grant_type=request_data.grant_type, 
-            grant_data=request_data.code
-        )
-
-        await self._grant_expiration_validator(grant.expiration)
-        await self._pkce_code_validator(request_data.client_id, request_data.code_verifier)
-
-        user_id = grant.user_id
         current_unix_time = int(time.time())
-        aud = grant.scope.split(' ') + [request_data.client_id]
-        access_token = await self._get_access_token(
-            request_data=request_data,
-            user_id=user_id,
-            unix_time=current_unix_time,
-            aud=aud
+        algorithm = await self._client_repo.get_signing_algorithm_by_client(request_data.client_id)
+        # The refresh token carries only a jti, so it can be signed before
+        # the code is redeemed and stored along with it.
+        refresh_token, = await self._jwt_manager.encode_many(
+            payloads=[self._get_refresh_token_payload(request_data=request_data)],
+            algorithm=algorithm
         )
-        refresh_token = await self._get_refresh_token(request_data=request_data)
-        id_token = await self._get_id_token(
-            request_data=request_data,
-            user_id=user_id,
-            unix_time=current_unix_time
-        )
-        scope = ' '.join(aud)
-        await self._persistent_grant_repo.delete_grant(grant=grant)
-        await self._persistent_grant_repo.create_grant(
-            client_id=grant.client_id, 
-            grant_data=refresh_token,
-            user_id=user_id,
-            grant_type_id=2,
-            expiration_time=current_unix_time + 84700,
-            scope=scope
+        if code is None:
+            grant = await self._persistent_grant_repo.redeem_authorization_code(
+                authorization_code=request_data.code,
+                client_id=request_data.client_id,
+                refresh_token=refresh_token,
+                refresh_expiration_time=current_unix_time + 84700,
+                grant_type=request_data.grant_type,
+            )
+            if grant is None:
+                raise InvalidGrantError('Invalid data provided.')
+            user_id, scope = grant.user_id, grant.scope
+        else:
+            await self._persistent_grant_repo.create_refresh_grant(
+                client_id=request_data.client_id,
+                refresh_token=refresh_token,
+                refresh_expiration_time=current_unix_time + 84700,
+                user_id=code.user_id,
+                scope=code.scope,
+            )
+            user_id, scope = code.user_id, code.scope
+
+        aud = scope.split(' ') + [request_data.client_id]
+        access_token, id_token = await self._jwt_manager.encode_many(
+            payloads=[
+                self._get_access_token_payload(
+                    request_data=request_data,
+                    user_id=user_id,
+                    unix_time=current_unix_time,
+                    aud=aud
+                ),
+                self._get_id_token_payload(
+                    request_data=request_data,
+                    user_id=user_id,
+                    unix_time=current_unix_time
+                ),
+            ],
+            algorithm=algorithm
         )
         await self._session.commit()
 
@@ -97,7 +118,18 @@ class AuthorizationCodeTokenService:
             refresh_expires_in=1800
         )
 
-    async def _get_access_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud: list[str]) -> str:
+    def _validate_stored_code(self, code: AuthorizationCode, request_data: RequestTokenModel) -> None:
+        """
+        The code is already consumed, so a mismatch can not be retried with it.
+        """
+        if code.client_id != request_data.client_id or code.redirect_uri != request_data.redirect_uri:
+            raise InvalidGrantError('Invalid data provided.')
+        if code.code_challenge and not verify_code_verifier(
+                code.code_challenge_method, code.code_challenge, request_data.code_verifier
+        ):
+            raise InvalidPkceCodeError
+
+    def _get_access_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud: list[str]) -> AccessTokenPayload:
         payload = AccessTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -108,15 +140,15 @@ class AuthorizationCodeTokenService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
 
-    async def _get_refresh_token(self, request_data: RequestTokenModel) -> str:
+    def _get_refresh_token_payload(self, request_data: RequestTokenModel) -> RefreshTokenPayload:
         payload = RefreshTokenPayload(
             jti=str(uuid.uuid4())
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256') 
+        return payload
 
-    async def _get_id_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> str:
+    def _get_id_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> IdTokenPayload:
         payload = IdTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -126,4 +158,4 @@ class AuthorizationCodeTokenService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
-    from src.data_access.postgresql.repositories import PersistentGrantRepository
+    from src.data_access.postgresql.repositories import ClientRepository, PersistentGrantRepository
 from src.business_logic.services.scope import ScopeService
 
 class ClientCredentialsTokenService:
@@ -21,6 +21,7 @@ class ClientCredentialsTokenService:
             scope_validator: ValidatorProtocol,
             jwt_manager: JWTManagerProtocol,
             persistent_grant_repo: PersistentGrantRepository,
+            client_repo: ClientRepository,
             scope_service: ScopeService,
     ) -> None:
         self._session = session
@@ -28,6 +29,7 @@ class ClientCredentialsTokenService:
         self._scope_validator = scope_validator
         self._jwt_manager = jwt_manager
         self._persistent_grant_repo = persistent_grant_repo
+        self._client_repo = client_repo
         self._scope_service = scope_service
 
     async def get_tokens(self, data: RequestTokenModel) -> ResponseTokenModel:
@@ -39,7 +41,10 @@ class ClientCredentialsTokenService:
             data.scope = ''
         current_unix_time = int(time.time())
         aud = data.scope.split(' ') + await self._scope_service.get_revoke_introspection_aud(name='oidc')
-        access_token = await self._get_access_token(request_data=data, unix_time=current_unix_time, aud=aud)
+        algorithm = await self._client_repo.get_signing_algorithm_by_client(data.client_id)
+        access_token = await self._get_access_token(
+            request_data=data, unix_time=current_unix_time, aud=aud, algorithm=algorithm
+        )
 
         return ResponseTokenModel(
             access_token=access_token,
@@ -49,7 +54,9 @@ class ClientCredentialsTokenService:
             scope=data.scope
         )
 
-    async def _get_access_token(self, request_data: RequestTokenModel, unix_time: int, aud: list[str]) -> str:
+    async def _get_access_token(
+            self, request_data: RequestTokenModel, unix_time: int, aud: list[str], algorithm: str
+    ) -> str:
         payload = AccessTokenPayload(
             sub=request_data.client_id,
             iss=DOMAIN_NAME,
@@ -60,4 +67,4 @@ class ClientCredentialsTokenService:
             jti=str(uuid.uuid4()),
             acr=0
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return self._jwt_manager.encode(payload=payload, algorithm=algorithm)
@@ -2,21 +2,34 @@ from __future__ import annotations
 import time
 import uuid
 from src.business_logic.get_tokens.dto import RequestTokenModel, ResponseTokenModel
+from src.business_logic.get_tokens.errors import (
+    AuthorizationPendingError,
+    InvalidGrantError,
+    SlowDownError,
+)
 from src.business_logic.jwt_manager.dto import (
     AccessTokenPayload,
     IdTokenPayload,
     RefreshTokenPayload
 )
 from src.dyna_config import DOMAIN_NAME
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from src.business_logic.cache.device_codes import DeviceCodeStore
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
-    from src.data_access.postgresql.repositories import PersistentGrantRepository
+    from src.data_access.postgresql.repositories import ClientRepository, PersistentGrantRepository
 
 
 class DeviceCodeTokenService:
+    """
+    Service for exchanging the device code of an approved device authorization
+    for tokens. Devices in a device code store are answered without Postgres
+    until they are approved.
+
+    Reference: https://www.rfc-editor.org/rfc/rfc8628#section-3.4
+    """
     def __init__(
             self,
             session: AsyncSession,
@@ -25,7 +38,9 @@ class DeviceCodeTokenService:
             client_validator: ValidatorProtocol,
             redirect_uri_validator: ValidatorProtocol,
             jwt_manager: JWTManagerProtocol,
-            persistent_grant_repo: PersistentGrantRepository
+            persistent_grant_repo: PersistentGrantRepository,
+            client_repo: ClientRepository,
+            device_store: Optional[DeviceCodeStore] = None
     ) -> None:
         self._session = session
         self._device_code_validator = device_code_validator
@@ -34,10 +49,28 @@ class DeviceCodeTokenService:
         self._grant_expiration_validator = grant_exp_validator
         self._jwt_manager = jwt_manager
         self._persistent_grant_repo = persistent_grant_repo
+        self._client_repo = client_repo
+        self._device_store = device_store
 
     async def get_tokens(self, request_data: RequestTokenModel) -> ResponseTokenModel:
         await self._client_validator(request_data.client_id)
-        await self._device_code_validator(request_data.device_code, request_data.client_id, request_data.grant_type)
+        device = None
+        if self._device_store is not None:
+            device = await self._device_store.get(request_data.device_code)
+            if device is not None:
+                if device.client_id != request_data.client_id:
+                    raise InvalidGrantError('Invalid data provided.')
+                if not await self._device_store.poll(device):
+                    raise SlowDownError
+                if not device.approved:
+                    raise AuthorizationPendingError
+        try:
+            await self._device_code_validator(request_data.device_code, request_data.client_id, request_data.grant_type)
+        except InvalidGrantError:
+            if device is not None:
+                # Approved, but the grant is not committed yet.
+                raise AuthorizationPendingError
+            raise
         await self._redirect_uri_validator(request_data.redirect_uri, request_data.client_id)
 
         grant = await self._persistent_grant_repo.get_grant(
@@ -49,10 +82,16 @@ class DeviceCodeTokenService:
 
         user_id = grant.user_id
         current_unix_time = int(time.time())
+        algorithm = await self._client_repo.get_signing_algorithm_by_client(request_data.client_id)
         aud = grant.scope
-        access_token = await self._get_access_token(request_data=request_data, user_id=user_id, unix_time=current_unix_time, aud=aud)
-        refresh_token = await self._get_refresh_token(request_data=request_data)
-        id_token = await self._get_id_token(request_data=request_data, user_id=user_id, unix_time=current_unix_time)
+        access_token, refresh_token, id_token = await self._jwt_manager.encode_many(
+            payloads=[
+                self._get_access_token_payload(request_data=request_data, user_id=user_id, unix_time=current_unix_time, aud=aud),
+                self._get_refresh_token_payload(request_data=request_data),
+                self._get_id_token_payload(request_data=request_data, user_id=user_id, unix_time=current_unix_time),
+            ],
+            algorithm=algorithm
+        )
 
         await self._persistent_grant_repo.delete_grant(grant=grant)
         await self._persistent_grant_repo.create_grant(
@@ -64,6 +103,8 @@ class DeviceCodeTokenService:
             scope=aud
         )
         await self._session.commit()
+        if device is not None:
+            await self._device_store.delete(device)
 
         return ResponseTokenModel(
             access_token=access_token,
@@ -74,7 +115,7 @@ class DeviceCodeTokenService:
             refresh_expires_in=1800
         )
 
-    async def _get_access_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud:list[str]) -> str:
+    def _get_access_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud:list[str]) -> AccessTokenPayload:
         payload = AccessTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -85,15 +126,15 @@ class DeviceCodeTokenService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
 
-    async def _get_refresh_token(self, request_data: RequestTokenModel) -> str:
+    def _get_refresh_token_payload(self, request_data: RequestTokenModel) -> RefreshTokenPayload:
         payload = RefreshTokenPayload(
             jti=str(uuid.uuid4())
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256') 
+        return payload
 
-    async def _get_id_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> str:
+    def _get_id_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> IdTokenPayload:
         payload = IdTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -103,4 +144,4 @@ class DeviceCodeTokenService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
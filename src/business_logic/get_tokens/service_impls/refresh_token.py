@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
     from src.business_logic.common.interfaces import ValidatorProtocol
     from src.business_logic.jwt_manager.interfaces import JWTManagerProtocol
-    from src.data_access.postgresql.repositories import PersistentGrantRepository
+    from src.data_access.postgresql.repositories import ClientRepository, PersistentGrantRepository
 
 
 class RefreshTokenGrantService:
@@ -22,7 +22,8 @@ class RefreshTokenGrantService:
             refresh_token_validator: ValidatorProtocol,
             grant_exp_validator: ValidatorProtocol,
             jwt_manager: JWTManagerProtocol,
-            persistent_grant_repo: PersistentGrantRepository
+            persistent_grant_repo: PersistentGrantRepository,
+            client_repo: ClientRepository
     ) -> None:
         self._session = session
         self._grant_validator = grant_validator
@@ -31,6 +32,7 @@ class RefreshTokenGrantService:
         self._grant_expiration_validator = grant_exp_validator
         self._jwt_manager = jwt_manager
         self._persistent_grant_repo = persistent_grant_repo
+        self._client_repo = client_repo
 
     async def get_tokens(self, request_data: RequestTokenModel) -> ResponseTokenModel:
         await self._client_validator(request_data.client_id)
@@ -50,13 +52,19 @@ class RefreshTokenGrantService:
 
         user_id = grant.user_id
         current_unix_time = int(time.time())
+        algorithm = await self._client_repo.get_signing_algorithm_by_client(request_data.client_id)
 
-        access_token = await self._get_access_token(
-            request_data=request_data, user_id=user_id,
-            unix_time=current_unix_time,
-            aud=grant.scope.split(' ')
+        access_token, id_token = await self._jwt_manager.encode_many(
+            payloads=[
+                self._get_access_token_payload(
+                    request_data=request_data, user_id=user_id,
+                    unix_time=current_unix_time,
+                    aud=grant.scope.split(' ')
+                ),
+                self._get_id_token_payload(request_data=request_data, user_id=user_id, unix_time=current_unix_time),
+            ],
+            algorithm=algorithm
         )
-        id_token = await self._get_id_token(request_data=request_data, user_id=user_id, unix_time=current_unix_time)
         
         return ResponseTokenModel(
             access_token=access_token,
@@ -67,7 +75,7 @@ class RefreshTokenGrantService:
             refresh_expires_in=1800
         )
 
-    async def _get_access_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud = list[str]) -> str:
+    def _get_access_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int, aud = list[str]) -> AccessTokenPayload:
         payload = AccessTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -78,9 +86,9 @@ class RefreshTokenGrantService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
 
-    async def _get_id_token(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> str:
+    def _get_id_token_payload(self, request_data: RequestTokenModel, user_id: int, unix_time: int) -> IdTokenPayload:
         payload = IdTokenPayload(
             sub=user_id,
             iss=DOMAIN_NAME,
@@ -91,4 +99,4 @@ class RefreshTokenGrantService:
             jti=str(uuid.uuid4()),
             acr=0,
         )
-        return self._jwt_manager.encode(payload=payload, algorithm='RS256')
+        return payload
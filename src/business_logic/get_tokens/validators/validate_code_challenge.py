@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import base64
 import hashlib
-from typing import TYPE_CHECKING
+import secrets
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from sqlalchemy.exc import NoResultFound
 from cryptography.fernet import Fernet
 
@@ -13,7 +15,38 @@ if TYPE_CHECKING:
     from src.data_access.postgresql.repositories import CodeChallengeRepository
 
 
+@lru_cache
+def get_fernet() -> Fernet:
+    return Fernet(AppSettings().secret_key.get_secret_value())
+
+
+def verify_code_verifier(
+        code_challenge_method: Optional[str],
+        code_challenge: str,
+        code_verifier: Optional[str]
+) -> bool:
+    """
+    Checks code_verifier against a plain text code_challenge.
+
+    Reference: https://www.rfc-editor.org/rfc/rfc7636#section-4.6
+    """
+    if code_verifier is None:
+        return False
+    if code_challenge_method == "S256":
+        code_verifier = base64.urlsafe_b64encode(
+            hashlib.sha256(code_verifier.encode("utf-8")).digest()
+        ).decode().rstrip("=")
+    elif code_challenge_method not in (None, "plain"):
+        return False
+    return secrets.compare_digest(code_verifier.encode(), code_challenge.encode())
+
+
 class ValidatePKCECode:
+    """
+    Validates the code verifier against the challenge stored for the client
+    by the authorization endpoint. Codes kept in an authorization code store
+    carry their own challenge, see verify_code_verifier.
+    """
     def __init__(
             self, 
             code_challenge_repo: CodeChallengeRepository
@@ -32,18 +65,11 @@ class ValidatePKCECode:
             code_challenge_method = None
         
         if code_challenge:
-            if code_challenge_method == "plain":
-                if code_verifier != code_challenge:
-                    raise InvalidPkceCodeError
-            elif code_challenge_method == "S256":
-                fernet = Fernet(AppSettings().secret_key.get_secret_value())
-                expected_code_challenge = fernet.decrypt(
+            if code_challenge_method == "S256":
+                code_challenge = get_fernet().decrypt(
                     code_challenge.encode()
                 ).decode()
-                actual_code_challenge = base64.urlsafe_b64encode(
-                    hashlib.sha256(code_verifier.encode("utf-8")).digest()
-                ).decode().rstrip("=")
-                if expected_code_challenge != actual_code_challenge:
-                    raise InvalidPkceCodeError
+            if not verify_code_verifier(code_challenge_method, code_challenge, code_verifier):
+                raise InvalidPkceCodeError
             
             await self._code_challenge_repo.delete_code_challenge_by_client_id(client_id=client_id)
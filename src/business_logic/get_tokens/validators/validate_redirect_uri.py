@@ -13,6 +13,6 @@ class ValidateRedirectUri:
         self._client_repo = client_repo
     
     async def __call__(self, redirect_uri: str, client_id: str) -> None:
-        uris_list = await self._client_repo.list_all_redirect_uris_by_client(client_id=client_id)
-        if redirect_uri not in uris_list:
+        client = await self._client_repo.get_client_snapshot(client_id=client_id)
+        if client is None or redirect_uri not in client.redirect_uris:
             raise InvalidRedirectUriError
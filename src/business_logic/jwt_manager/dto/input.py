@@ -23,6 +23,7 @@ class RefreshTokenPayload(BaseModel):
 
 class IdTokenPayload(BaseJWTPayload):
     typ: str = 'ID'
+    auth_time: Optional[int] = None  # time when the user signed in
     email: Optional[str] = None
     email_verified: Optional[str] = None
     given_name: Optional[str] = None
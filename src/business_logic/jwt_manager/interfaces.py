@@ -12,6 +12,9 @@ Payload = Union[AccessTokenPayload, RefreshTokenPayload, IdTokenPayload]
 class JWTManagerProtocol(Protocol):
     def encode(self, payload: Payload, algorithm: str) -> str:
         raise NotImplementedError
+
+    async def encode_many(self, payloads: list[Payload], algorithm: str) -> list[str]:
+        raise NotImplementedError
     
     def decode(self, token: str, audience: str,**kwargs: Any) -> dict[str, Any]:
         raise NotImplementedError
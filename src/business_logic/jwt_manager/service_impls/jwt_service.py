@@ -1,7 +1,18 @@
 from __future__ import annotations
 import logging
 import jwt
-from src.config.rsa_keys import RSAKeypair
+from jwt.exceptions import InvalidKeyError
+from src.config.rsa_keys import (
+    SIGNING_ALGORITHMS,
+    BaseKeyStore,
+    RSAKeypair,
+    SigningKeypair,
+    get_keystore,
+)
+from src.business_logic.jwt_manager.signing_executor import (
+    SigningExecutor,
+    get_signing_executor,
+)
 from src.di import Container
 from src.business_logic.jwt_manager.dto import (
     AccessTokenPayload,
@@ -18,37 +29,86 @@ Payload = Union[AccessTokenPayload, RefreshTokenPayload, IdTokenPayload]
 
 
 class JWTManager:
-    def __init__(self, keys: RSAKeypair = Container().config().keys) -> None:
+    def __init__(
+        self,
+        keys: Optional[RSAKeypair] = None,
+        keystore: Optional[BaseKeyStore] = None,
+        signing_executor: Optional[SigningExecutor] = None,
+    ) -> None:
+        if keys is None:
+            keys = Container().config().keys
+        if keystore is None:
+            keystore = get_keystore()
         self.keys = keys
+        self.keystore = keystore
+        if signing_executor is None:
+            signing_executor = get_signing_executor()
+        self.signing_executor = signing_executor
+        self.algorithms = list(SIGNING_ALGORITHMS)
+
+    def get_signing_key(self, algorithm: str) -> SigningKeypair:
+        if algorithm == self.keys.alg:
+            return self.keys
+        return self.keystore.get_signing_key(algorithm)
 
     def encode(self, payload: Payload, algorithm: str, secret: Optional[str] = None) -> str:
         if secret:
             key = secret
+            headers = None
         else:
-            key = self.keys.private_key
+            signing_key = self.get_signing_key(algorithm)
+            key = signing_key.parsed_private_key
+            headers = {"kid": signing_key.kid}
 
         token = jwt.encode(
-            payload=payload.dict(exclude_none=True), key=key, algorithm=algorithm
+            payload=payload.dict(exclude_none=True), key=key, algorithm=algorithm, headers=headers
         )
         return token
 
+    async def encode_many(self, payloads: list[Payload], algorithm: str) -> list[str]:
+        """
+        Signs the tokens of one request, in the signing executor when it is configured.
+        Only RSA signing is slow enough to be worth it, ES256 and EdDSA are signed in place.
+        """
+        if self.signing_executor is None or algorithm != self.signing_executor.keys.alg:
+            return [self.encode(payload=payload, algorithm=algorithm) for payload in payloads]
+        return await self.signing_executor.sign_many(
+            payloads=[payload.dict(exclude_none=True) for payload in payloads],
+            algorithm=algorithm,
+        )
+
+    def get_verification_key(self, token: str) -> SigningKeypair:
+        """
+        Returns the key the token was signed with, found by the kid header.
+        Tokens without kid are checked with the current RS256 key.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None or kid == self.keys.kid:
+            return self.keys
+        key = self.keystore.get_key(kid)
+        if key is None:
+            raise InvalidKeyError(f"Unknown signing key: {kid}")
+        return key
+
     def decode(self, token: str, audience: Optional[str] = None, **kwargs: Any) -> dict[str, Any]:
         token = token.replace("Bearer ", "")
+        key = self.get_verification_key(token)
         if audience:
-            decoded_info = jwt.decode(token, key=self.keys.public_key, algorithms=self.algorithms,
+            decoded_info = jwt.decode(token, key=key.parsed_public_key, algorithms=[key.alg],
                                       audience=audience, **kwargs,)
         else:
-            decoded_info = jwt.decode(token, key=self.keys.public_key, algorithms=self.algorithms,
+            decoded_info = jwt.decode(token, key=key.parsed_public_key, algorithms=[key.alg],
                                       **kwargs,)
 
         return decoded_info
     
     async def decode_token_no_aud_iss_check(self, token: str, **kwargs: Any) -> dict[str, Any]:
         token = token.replace("Bearer ", "")
+        key = self.get_verification_key(token)
         decoded = jwt.decode(
             token,
-            key=self.keys.public_key,
-            algorithms=["RS256"],
+            key=key.parsed_public_key,
+            algorithms=[key.alg],
             options={"verify_aud":False, 'verify_iss':False},
             **kwargs,
         )
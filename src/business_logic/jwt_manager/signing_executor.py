@@ -0,0 +1,140 @@
+from __future__ import annotations
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Optional
+
+import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from prometheus_client import Counter, Gauge
+
+from src.config.rsa_keys import RSAKeypair
+from src.di import Container
+from src.dyna_config import (
+    JWT_SIGNING_EXECUTOR,
+    JWT_SIGNING_MAX_QUEUE,
+    JWT_SIGNING_MAX_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+SIGNING_QUEUE_DEPTH = Gauge(
+    "jwt_signing_queue_depth",
+    "Number of tokens submitted to the signing executor and not signed yet.",
+)
+SIGNED_IN_PLACE = Counter(
+    "jwt_signed_in_place",
+    "Tokens signed in the event loop because the signing executor was full.",
+)
+
+# Private key of a signing worker process, parsed once by _init_worker.
+_worker_key: Any = None
+
+
+def _init_worker(private_key: bytes) -> None:
+    global _worker_key
+    _worker_key = load_pem_private_key(private_key, password=None)
+
+
+def _sign_in_worker(
+    payload: dict[str, Any], algorithm: str, headers: dict[str, Any]
+) -> str:
+    return jwt.encode(
+        payload=payload, key=_worker_key, algorithm=algorithm, headers=headers
+    )
+
+
+class SigningExecutor:
+    """
+    Signs tokens outside of the event loop.
+
+    "process" runs RS256 signing in a ProcessPoolExecutor, each worker keeping
+    its own parsed copy of the private key; "thread" uses a dedicated thread
+    pool (the signing itself releases the GIL in OpenSSL).
+    At most max_workers + max_queue tokens are in flight. Further tokens are
+    signed in the event loop right away instead of waiting for a free slot.
+    """
+
+    def __init__(
+        self,
+        keys: RSAKeypair,
+        kind: str = "thread",
+        max_workers: int = 2,
+        max_queue: int = 64,
+    ) -> None:
+        self.keys = keys
+        self.kind = kind
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(keys.private_key,),
+            )
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="jwt-signing"
+            )
+        else:
+            raise ValueError(f"Unknown signing executor: {kind}")
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+
+    def _sign_in_place(
+        self, payload: dict[str, Any], algorithm: str, headers: dict[str, Any]
+    ) -> str:
+        return jwt.encode(
+            payload=payload,
+            key=self.keys.parsed_private_key,
+            algorithm=algorithm,
+            headers=headers,
+        )
+
+    async def sign(self, payload: dict[str, Any], algorithm: str) -> str:
+        headers = {"kid": self.keys.kid}
+        if self._slots.locked():
+            SIGNED_IN_PLACE.inc()
+            return self._sign_in_place(payload, algorithm, headers)
+        SIGNING_QUEUE_DEPTH.inc()
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                if self.kind == "process":
+                    return await loop.run_in_executor(
+                        self._executor, _sign_in_worker, payload, algorithm, headers
+                    )
+                return await loop.run_in_executor(
+                    self._executor, self._sign_in_place, payload, algorithm, headers
+                )
+        finally:
+            SIGNING_QUEUE_DEPTH.dec()
+
+    async def sign_many(
+        self, payloads: list[dict[str, Any]], algorithm: str
+    ) -> list[str]:
+        """Signs all payloads of one request in parallel, keeping their order."""
+        return list(
+            await asyncio.gather(
+                *(self.sign(payload, algorithm) for payload in payloads)
+            )
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_signing_executor() -> Optional[SigningExecutor]:
+    """
+    Returns the executor configured in [jwt_signing], or None to sign
+    in the event loop. The pool is started by the first call.
+    """
+    if not JWT_SIGNING_EXECUTOR:
+        return None
+    logger.info(f"Starting {JWT_SIGNING_EXECUTOR} pool for token signing.")
+    return SigningExecutor(
+        keys=Container().config().keys,
+        kind=JWT_SIGNING_EXECUTOR,
+        max_workers=JWT_SIGNING_MAX_WORKERS,
+        max_queue=JWT_SIGNING_MAX_QUEUE,
+    )
@@ -137,7 +137,7 @@ class AdminUserService():
         await self.user_repo.create(**kwargs)
         
     async def change_password(self, user_id:int, new_password:str) -> None:
-        new_password = PasswordHash.hash_password(password=new_password)
+        new_password = await PasswordHash.hash_password_async(password=new_password)
         await self.user_repo.change_password(user_id=user_id, password = new_password)
     
 
@@ -169,7 +169,7 @@ class AdminUserService():
             )
         
         user_id = (await self.user_repo.get_user_by_email(email=email)).id
-        password_hashed = PasswordHash.hash_password(password=password)
+        password_hashed = await PasswordHash.hash_password_async(password=password)
         await self.user_repo.change_password(user_id=user_id, password=password_hashed)
         #if len([v for v in kwargs.values() if v is not None])>6:
         kwargs["birthdate"] = str(kwargs['birthdate'])
@@ -183,7 +183,7 @@ class AdminUserService():
 
     async def validate_password(self, email:str, password:str):
         user:User = await self.user_repo.get_user_by_email(email=email)
-        return PasswordHash.validate_password(str_password=password,hash_password=user.password_hash.value), user
+        return await PasswordHash.validate_password_async(str_password=password,hash_password=user.password_hash.value), user
     
     def user_to_dict(self, user:User)->dict[str, str]:
         user_data = user.__dict__
@@ -30,10 +30,16 @@ class AdminAuthService:
         user_hash_password, user_id = await self.user_repo.get_hash_password(
             credentials.username
         )
-        self.password_service.validate_password(
+        await self.password_service.validate_password_async(
             credentials.password, 
             user_hash_password
         )
+        upgraded_hash = await self.password_service.get_upgraded_hash(
+            credentials.password, user_hash_password
+        )
+        if upgraded_hash:
+            await self.user_repo.update_password_hash(credentials.username, upgraded_hash)
+            await self.user_repo.session.commit()
         if not await self.user_repo.check_user_group(username=credentials.username, groupname='administration'):
             raise UserNotInGroupError('administration')
         return await self.jwt_service.encode_jwt(
@@ -72,9 +72,16 @@ class AuthorizationService:
         hashed_password, user_id = await self.user_repo.get_hash_password(
             self.request_model.username
         )
-        self.password_service.validate_password(
+        await self.password_service.validate_password_async(
             self.request_model.password, hashed_password
         )
+        upgraded_hash = await self.password_service.get_upgraded_hash(
+            self.request_model.password, hashed_password
+        )
+        if upgraded_hash:
+            await self.user_repo.update_password_hash(
+                self.request_model.username, upgraded_hash
+            )
         return user_id
 
     async def _validate_client_data(self) -> None:
@@ -96,6 +96,7 @@ class ClientService:
 
         return{
             "token_endpoint_auth_method": getattr(self.request_model, "token_endpoint_auth_method", "client_secret_post"),
+            "signing_algorithm": getattr(self.request_model, "signing_algorithm", "RS256"),
             "client_id":client_id,
             "absolute_refresh_token_lifetime": getattr(self.request_model, "absolute_refresh_token_lifetime", DEFAULT_ABSOLUTE_REFRESH_TOKEN_LIFETIME),
             "access_token_lifetime": getattr(self.request_model, "access_token_lifetime", DEFAULT_ACCESS_TOKEN_LIFETIME),
@@ -145,6 +146,8 @@ class ClientService:
             params["logo_uri"] = self.request_model.logo_uri
         if self.request_model.token_endpoint_auth_method:
             params["token_endpoint_auth_method"] = self.request_model.token_endpoint_auth_method
+        if self.request_model.signing_algorithm:
+            params["signing_algorithm"] = self.request_model.signing_algorithm
 
         await self.client_repo.update(client_id=client_id, **params)
 
@@ -5,12 +5,13 @@ import time
 from string import ascii_uppercase
 from typing import Any, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.business_logic.cache.device_codes import DeviceCodeStore, PendingDevice
 from src.data_access.postgresql.repositories import (
     ClientRepository,
     DeviceRepository,
 )
 from src.data_access.postgresql.errors.client import ClientNotFoundError
-from src.dyna_config import DOMAIN_NAME
+from src.dyna_config import DEVICE_CODES_INTERVAL, DOMAIN_NAME
 from src.presentation.api.models import (
     DeviceCancelModel,
     DeviceRequestModel,
@@ -26,12 +27,14 @@ class DeviceService:
         session: AsyncSession,
         client_repo: ClientRepository,
         device_repo: DeviceRepository,
+        device_store: Optional[DeviceCodeStore] = None,
     ) -> None:
         self._request_model: Union[
             DeviceRequestModel, DeviceUserCodeModel, DeviceCancelModel, None
         ] = None
         self.client_repo = client_repo
         self.device_repo = device_repo
+        self.device_store = device_store
         self.session = session
 
     async def get_response(self) -> Optional[dict[str, Any]]:
@@ -56,8 +59,18 @@ class DeviceService:
                     "verification_uri": verification_uri,
                     "verification_uri_complete": verification_uri_complete,
                     "expires_in": device_code_lifetime,
-                    "interval": 5,
+                    "interval": DEVICE_CODES_INTERVAL,
                 }
+                if self.device_store is not None and await self.device_store.save(
+                    PendingDevice(
+                        client_id=self.request_model.client_id,
+                        device_code=device_code,
+                        user_code=user_code,
+                        expires_at=device_code_lifetime + int(time.time()),
+                        interval=DEVICE_CODES_INTERVAL,
+                    )
+                ):
+                    return device_data
                 await self.device_repo.create(
                     client_id=self.request_model.client_id,
                     **device_data
@@ -75,11 +88,20 @@ class DeviceService:
 
         uri_start = f"http://{DOMAIN_NAME}/authorize/?"
         redirect_uri = "https://www.google.com/"
-        device = await self.device_repo.get_device_by_user_code(
-            user_code=self.request_model.user_code
-        )
+        client_id = None
+        if self.device_store is not None:
+            pending_device = await self.device_store.get_by_user_code(
+                self.request_model.user_code
+            )
+            if pending_device is not None:
+                client_id = pending_device.client_id
+        if client_id is None:
+            device = await self.device_repo.get_device_by_user_code(
+                user_code=self.request_model.user_code
+            )
+            client_id = device.client.client_id
         return (
-            uri_start + f"client_id={device.client.client_id}"
+            uri_start + f"client_id={client_id}"
             f"&response_type=urn:ietf:params:oauth:grant-type:device_code"
             f"&redirect_uri={redirect_uri}"
         )
@@ -88,6 +110,11 @@ class DeviceService:
         if type(self.request_model) != DeviceCancelModel:
             raise ValueError
         if await self._validate_client(client_id=self.request_model.client_id):
+            if self.device_store is not None:
+                pending_device = await self.device_store.get_by_user_code(user_code)
+                if pending_device is not None:
+                    await self.device_store.delete(pending_device)
+                    return f"http://{DOMAIN_NAME}/device/auth/cancel"
             if await self._validate_user_code(user_code=user_code):
                 await self.device_repo.delete_by_user_code(user_code=user_code)
         else:
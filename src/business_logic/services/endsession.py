@@ -3,6 +3,11 @@ from src.data_access.postgresql.repositories.client import ClientRepository
 from src.data_access.postgresql.repositories.persistent_grant import (
     PersistentGrantRepository,
 )
+from src.data_access.postgresql.repositories.revocation_epoch import (
+    RevocationEpochRepository,
+)
+from src.business_logic.cache.revocation import SUBJECT, revoke_issued_tokens
+from src.business_logic.cache.sso_sessions import SsoSessionStore
 from src.business_logic.services.jwt_token import JWTService
 from typing import Union, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,11 +19,17 @@ class EndSessionService:
         session:AsyncSession,
         client_repo: ClientRepository,
         persistent_grant_repo: PersistentGrantRepository,
-        jwt_service = JWTService()
+        revocation_epoch_repo: RevocationEpochRepository,
+        jwt_service = JWTService(),
+        sso_session_store: Optional[SsoSessionStore] = None,
     ) -> None:
         self.client_repo = client_repo
         self.persistent_grant_repo = persistent_grant_repo
+        self.revocation_epoch_repo = revocation_epoch_repo
         self.jwt_service = jwt_service
+        self.sso_session_store = sso_session_store
+        # The SSO session of the browser, ended along with those of the user.
+        self.sso_session_id: Optional[str] = None
         self._request_model: Optional[RequestEndSessionModel] = None
         self.session = session
 
@@ -60,6 +71,14 @@ class EndSessionService:
         await self.persistent_grant_repo.delete_persistent_grant_by_client_and_user_id(
             client_id=client_id, user_id=user_id
         )
+        # The access tokens of the user issued so far stop working as well.
+        await revoke_issued_tokens(
+            self.revocation_epoch_repo, SUBJECT, str(user_id)
+        )
+        if self.sso_session_store is not None:
+            await self.sso_session_store.end_user_sessions(user_id)
+            if self.sso_session_id is not None:
+                await self.sso_session_store.end(self.sso_session_id)
 
     async def _validate_logout_redirect_uri(
         self, client_id: str, logout_redirect_uri: str
@@ -1,19 +1,42 @@
+import time
 from typing import Any, Optional
 from fastapi import Request
 from jwt.exceptions import ExpiredSignatureError, PyJWTError
+from src.business_logic.cache.introspection import (
+    get_introspection_result,
+    set_introspection_result,
+)
+from src.business_logic.cache.revocation import is_token_revoked
 from src.data_access.postgresql.errors import TokenIncorrectError
-from src.business_logic.services.jwt_token import JWTService
+from src.business_logic.services.jwt_token import JWTService, VerifiedToken
+from src.data_access.postgresql.repositories.blacklisted_token import (
+    BlacklistedTokenRepository,
+)
 from src.data_access.postgresql.repositories.client import ClientRepository
 from src.data_access.postgresql.repositories.persistent_grant import (
     PersistentGrantRepository,
 )
+from src.data_access.postgresql.repositories.revocation_epoch import (
+    RevocationEpochRepository,
+)
 from src.data_access.postgresql.repositories.user import UserRepository
 
 from src.presentation.api.models.introspection import (
     BodyRequestIntrospectionModel,
+    IntrospectedTokenModel,
 )
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Hints of tokens that are only verified, without looking up a grant.
+ACCESS_TOKEN_HINTS = (
+    "access-token",
+    "access_token",
+    "access",
+    "authorization_code",
+    "authorization-code",
+)
+
 
 class IntrospectionService:
     """A class that provides token introspection functionality. It allows authorized
@@ -35,6 +58,8 @@ class IntrospectionService:
         client_repo (ClientRepository): The repository for client-related operations.
         persistent_grant_repo (PersistentGrantRepository): The repository for persistent grant-related operations.
         jwt (JWTService, optional): The JWT service for token decoding. Defaults to JWTService().
+        blacklisted_repo (BlacklistedTokenRepository, optional): The repository of revoked tokens.
+        revocation_epoch_repo (RevocationEpochRepository, optional): The repository of revocation epochs.
 
     Raises:
         TokenIncorrectError: If the token is incorrect or missing.
@@ -43,10 +68,13 @@ class IntrospectionService:
         jwt (JWTService): The JWT service for token decoding.
         request (Optional[Request]): The request object.
         authorization (Optional[str]): The authorization header.
+        verified_token (Optional[VerifiedToken]): The token of the request verified by the middleware.
         request_body (Optional[BodyRequestIntrospectionModel]): The introspection request body.
         user_repo (UserRepository): The repository for user-related operations.
         client_repo (ClientRepository): The repository for client-related operations.
         persistent_grant_repo (PersistentGrantRepository): The repository for persistent grant-related operations.
+        blacklisted_repo (BlacklistedTokenRepository): The repository of revoked tokens.
+        revocation_epoch_repo (RevocationEpochRepository): The repository of revocation epochs.
         session (AsyncSession): The asynchronous session for database operations.
     """
 
@@ -57,6 +85,8 @@ class IntrospectionService:
         client_repo: ClientRepository,
         persistent_grant_repo: PersistentGrantRepository,
         jwt: JWTService = JWTService(),
+        blacklisted_repo: Optional[BlacklistedTokenRepository] = None,
+        revocation_epoch_repo: Optional[RevocationEpochRepository] = None,
     ) -> None:
         """Initialize the IntrospectionServices class.
 
@@ -66,6 +96,10 @@ class IntrospectionService:
             client_repo (ClientRepository): The client repository object.
             persistent_grant_repo (PersistentGrantRepository): The persistent grant repository object.
             jwt (JWTService): The JWT service object. Defaults to JWTService()
+            blacklisted_repo (BlacklistedTokenRepository): The repository of revoked tokens.
+                Defaults to one on session.
+            revocation_epoch_repo (RevocationEpochRepository): The repository of revocation
+                epochs. Defaults to one on session.
 
         Returns:
             None
@@ -73,10 +107,17 @@ class IntrospectionService:
         self.jwt = jwt
         self.request: Optional[Request] = None
         self.authorization: Optional[str] = None
+        self.verified_token: Optional[VerifiedToken] = None
         self.request_body: Optional[BodyRequestIntrospectionModel] = None
         self.user_repo = user_repo
         self.client_repo = client_repo
         self.persistent_grant_repo = persistent_grant_repo
+        self.blacklisted_repo = blacklisted_repo or BlacklistedTokenRepository(
+            session
+        )
+        self.revocation_epoch_repo = (
+            revocation_epoch_repo or RevocationEpochRepository(session)
+        )
         self.session = session
 
     async def analyze_token(self) -> dict[str, Any]:
@@ -110,84 +151,208 @@ class IntrospectionService:
         if self.request_body is None:
             raise TokenIncorrectError
 
-        decoded_token = {}
-        response: dict[str, Any] = {}
+        token_type_hint = self.request_body.token_type_hint
+        if token_type_hint in ACCESS_TOKEN_HINTS:
+            # Revoking a token drops its cached responses.
+            cached_response = get_introspection_result(
+                self.request_body.token, token_type_hint
+            )
+            if cached_response is not None:
+                return cached_response
 
         try:
-            decoded_token = await self.jwt.decode_token_no_aud_iss_check(
-                token=self.request_body.token,
-            )
+            decoded_token = await self.decode_token(self.request_body.token)
         except ExpiredSignatureError:
             return {"active": False}
         except PyJWTError:
             raise TokenIncorrectError
-        else:
-            if self.request_body.token_type_hint in (
-                "access-token",
-                "access_token",
-                "access",
-                "authorization_code",
-                "authorization-code",
-            ):
-                response["active"] = True
-
-        if self.request_body.token_type_hint in (
-            "access-token",
-            "access_token",
-            "access",
-            "authorization_code",
-            "authorization-code",
+        if await self.is_revoked(self.request_body.token, decoded_token):
+            return {"active": False}
+
+        if self.request_body.token_type_hint not in ACCESS_TOKEN_HINTS:
+            # A single query finds the grant of the hinted type, or of any
+            # type if there is no hint, along with its client and user.
+            grant = await self.persistent_grant_repo.get_grant_summary(
+                grant_data=self.request_body.token,
+                grant_type=self.request_body.token_type_hint,
+            )
+            if grant is None:
+                return {"active": False}
+            self.request_body.token_type_hint = grant.type_of_grant
+            return self.get_active_response(decoded_token, grant, grant.username)
+
+        response = self.get_active_response(
+            decoded_token, None, await self.get_username(decoded_token)
+        )
+        set_introspection_result(self.request_body.token, token_type_hint, response)
+        return response
+
+    async def analyze_tokens(
+        self, tokens: list[IntrospectedTokenModel]
+    ) -> list[dict[str, Any]]:
+        """Analyzes many tokens at once, see analyze_token.
+
+        Cached access tokens are answered from the cache, the others are
+        verified one after another, the grants of those not hinted as access
+        tokens are looked up with one query and the usernames of the access
+        tokens with another. Unlike analyze_token, a token that can not
+        be decoded is reported inactive instead of failing the whole batch.
+        Revoked tokens are reported inactive as well.
+
+        Returns:
+            list[dict[str, Any]]: The introspection responses in the order of tokens.
+        """
+        cached_responses: list[Optional[dict[str, Any]]] = [
+            get_introspection_result(token.token, token.token_type_hint)
+            if token.token_type_hint in ACCESS_TOKEN_HINTS
+            else None
+            for token in tokens
+        ]
+        decoded_tokens: list[Optional[dict[str, Any]]] = []
+        for token, cached_response in zip(tokens, cached_responses):
+            decoded_token = None
+            if cached_response is None:
+                try:
+                    decoded_token = await self.decode_token(token.token)
+                except PyJWTError:
+                    pass
+                else:
+                    if await self.is_revoked(token.token, decoded_token):
+                        decoded_token = None
+            decoded_tokens.append(decoded_token)
+
+        grants_data = [
+            token.token
+            for token, decoded_token in zip(tokens, decoded_tokens)
+            if decoded_token is not None
+            and token.token_type_hint not in ACCESS_TOKEN_HINTS
+        ]
+        grants = {}
+        if grants_data:
+            grants = await self.persistent_grant_repo.get_grant_summaries(
+                grants_data
+            )
+        # Without a hint a grant of any type will do, as in analyze_token.
+        any_type_grants: dict[str, Row] = {}
+        for (grant_data, _), grant in grants.items():
+            any_type_grants.setdefault(grant_data, grant)
+
+        user_ids = {
+            self._get_user_id(decoded_token)
+            for token, decoded_token in zip(tokens, decoded_tokens)
+            if decoded_token is not None
+            and token.token_type_hint in ACCESS_TOKEN_HINTS
+        } - {None}
+        usernames = {}
+        if user_ids:
+            usernames = await self.user_repo.get_usernames_by_ids(list(user_ids))
+
+        responses: list[dict[str, Any]] = []
+        for token, decoded_token, cached_response in zip(
+            tokens, decoded_tokens, cached_responses
         ):
-            response["active"] = True
-
-        if not response:
-            if self.request_body.token_type_hint is None:
-                # If token type hint is not provided, check all grant types for the token
-                list_of_types = [
-                    token_type[0]
-                    for token_type in await self.persistent_grant_repo.get_all_types()
-                ]
-
-                for token_type in list_of_types:
-                    if await self.persistent_grant_repo.exists(
-                        grant_type=token_type,
-                        grant_data=self.request_body.token,
-                    ):
-                        # If the token exists for a grant type, update the token type hint and set the response as active
-                        self.request_body.token_type_hint = token_type
-                        response = {"active": True}
-                        break
-            else:
-                # Check if the token exists for the provided token type hint
-                exists = await self.persistent_grant_repo.exists(
-                    grant_type=self.request_body.token_type_hint,
-                    grant_data=self.request_body.token,
+            if cached_response is not None:
+                response = cached_response
+            elif decoded_token is None:
+                response = {"active": False}
+            elif token.token_type_hint in ACCESS_TOKEN_HINTS:
+                username = usernames.get(self._get_user_id(decoded_token))
+                response = self.get_active_response(decoded_token, None, username)
+                set_introspection_result(
+                    token.token, token.token_type_hint, response
                 )
-                response = {"active": exists}
-
-        if response.get("active"):
-            # If response is "active", get other available parameters
-            response["iss"] = self.slice_url()
-            response["token_type"] = self.get_token_type()
-            response["username"] = await self.get_username(decoded_token)
-
-            for parameter in (
-                "sub",
-                "exp",
-                "iat",
-                "client_id",
-                "jti",
-                "aud",
-                "nbf",
-                "scope",
+            else:
+                if token.token_type_hint is None:
+                    grant = any_type_grants.get(token.token)
+                else:
+                    grant = grants.get((token.token, token.token_type_hint))
+                if grant is None:
+                    response = {"active": False}
+                else:
+                    response = self.get_active_response(
+                        decoded_token, grant, grant.username
+                    )
+            responses.append(response)
+        return responses
+
+    def get_active_response(
+        self,
+        decoded_token: dict[str, Any],
+        grant: Optional[Row],
+        username: Optional[str],
+    ) -> dict[str, Any]:
+        """Builds the introspection response of a token that could be decoded.
+
+        The token is inactive if its grant has expired, even though the token
+        itself may not carry an exp claim.
+
+        Args:
+            decoded_token (dict[str, Any]): The claims of the token.
+            grant (Optional[Row]): The grant of the token, see PersistentGrantRepository.get_grant_summary.
+            username (Optional[str]): The username of the resource owner.
+
+        Returns:
+            dict[str, Any]: The introspection response.
+        """
+        if grant is not None and grant.expiration <= time.time():
+            return {"active": False}
+
+        response: dict[str, Any] = {"active": True}
+        response["iss"] = self.slice_url()
+        response["token_type"] = self.get_token_type()
+        response["username"] = username
+
+        for parameter in (
+            "sub",
+            "exp",
+            "iat",
+            "client_id",
+            "jti",
+            "aud",
+            "nbf",
+            "scope",
+        ):
+            response[parameter] = decoded_token.get(parameter)
+
+        if grant is not None:
+            # Tokens such as refresh tokens may not carry these claims.
+            for parameter, value in (
+                ("sub", None if grant.user_id is None else str(grant.user_id)),
+                ("client_id", grant.client_id),
+                ("scope", grant.scope),
+                ("exp", grant.expiration),
             ):
-                try:
-                    response[parameter] = decoded_token.get(parameter)
-                except:
-                    pass
+                if response.get(parameter) is None:
+                    response[parameter] = value
 
         return response
 
+    async def decode_token(self, token: str) -> dict[str, Any]:
+        """Decode the inspected token, unless it is the verified token of the request.
+
+        Returns:
+            dict[str, Any]: The claims of the token.
+        """
+        if (
+            self.verified_token is not None
+            and self.verified_token.token == token.replace("Bearer ", "")
+        ):
+            return self.verified_token.claims
+        return await self.jwt.decode_token_no_aud_iss_check(token=token)
+
+    async def is_revoked(self, token: str, decoded_token: dict[str, Any]) -> bool:
+        """Checks the inspected token against revoked tokens and revocation epochs.
+
+        Returns:
+            bool: True if the token was revoked.
+        """
+        return await is_token_revoked(
+            token,
+            decoded_token,
+            self.blacklisted_repo,
+            self.revocation_epoch_repo,
+        )
+
     async def get_client_id(self) -> str:
         """Get the client ID of the inspected token.
 
@@ -234,10 +399,17 @@ class IntrospectionService:
             str: a string containing the username.
         """
 
-        user_id = decoded_token.get("sub")
+        user_id = self._get_user_id(decoded_token)
         if user_id is not None:
             try:
-                return await self.user_repo.get_username_by_id(id=int(user_id))
+                return await self.user_repo.get_username_by_id(id=user_id)
             except:
                 pass
         return None
+
+    @staticmethod
+    def _get_user_id(decoded_token: dict[str, Any]) -> Optional[int]:
+        try:
+            return int(decoded_token["sub"])
+        except (KeyError, TypeError, ValueError):
+            return None
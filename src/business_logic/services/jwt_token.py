@@ -1,46 +1,89 @@
 import logging
 
 import jwt
-from typing import Any, no_type_check, Optional
-from src.config.rsa_keys import RSAKeypair
+from jwt.exceptions import InvalidKeyError
+from typing import Any, NamedTuple, no_type_check, Optional
+from src.config.rsa_keys import (
+    SIGNING_ALGORITHMS,
+    BaseKeyStore,
+    RSAKeypair,
+    SigningKeypair,
+    get_keystore,
+)
 from src.di import Container
 
 logger = logging.getLogger(__name__)
 
 
+class VerifiedToken(NamedTuple):
+    """
+    A token of the current request with the claims it was verified with.
+    Set as request.state.verified_token by the authorization middlewares,
+    so that services don't verify the signature again.
+    """
+    token: str
+    claims: dict[str, Any]
+
+
 class JWTService:
-    def __init__(self, keys: RSAKeypair = Container().config().keys) -> None:
+    def __init__(
+        self,
+        keys: Optional[RSAKeypair] = None,
+        keystore: Optional[BaseKeyStore] = None,
+    ) -> None:
         self.algorithm = "RS256"
-        self.algorithms = ["RS256"]
+        self.algorithms = list(SIGNING_ALGORITHMS)
+        if keys is None:
+            keys = Container().config().keys
+        if keystore is None:
+            keystore = get_keystore()
         self.keys = keys
+        self.keystore = keystore
 
     @no_type_check
     async def encode_jwt(self, payload: dict[str, Any] = {}, secret: None = None) -> str:
         token = jwt.encode(
-            payload=payload, key=self.keys.private_key, algorithm=self.algorithm
+            payload=payload,
+            key=self.keys.parsed_private_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.keys.kid},
         )
 
         logger.info(f"Created token.")
 
         return token
 
+    def get_verification_key(self, token: str) -> SigningKeypair:
+        """
+        Returns the key the token was signed with, found by the kid header.
+        Tokens without kid are checked with the current RS256 key.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None or kid == self.keys.kid:
+            return self.keys
+        key = self.keystore.get_key(kid)
+        if key is None:
+            raise InvalidKeyError(f"Unknown signing key: {kid}")
+        return key
+
     @no_type_check
     async def decode_token(self, token: str, audience: str =None ,**kwargs: Any) -> dict[str, Any]:
 
         token = token.replace("Bearer ", "")
+        key = self.get_verification_key(token)
         if audience:
             decoded = jwt.decode(
                 token,
-                key=self.keys.public_key,
-                algorithms=self.algorithms,
+                key=key.parsed_public_key,
+                algorithms=[key.alg],
                 audience=audience,
                 **kwargs,
             )
             return decoded
         decoded = jwt.decode(
             token,
-            key=self.keys.public_key,
-            algorithms=self.algorithms,
+            key=key.parsed_public_key,
+            algorithms=[key.alg],
             **kwargs,
         )
         return decoded
@@ -61,15 +104,19 @@ class JWTService:
     async def get_pub_key_expanent(self) -> int:
         return self.keys.e
 
+    async def get_kid(self) -> str:
+        return self.keys.kid
+
     @no_type_check
     async def decode_token_no_aud_iss_check(self, token: str, **kwargs: Any) -> dict[str, Any]:
 
         token = token.replace("Bearer ", "")
+        key = self.get_verification_key(token)
         decoded = jwt.decode(
             token,
-            key=self.keys.public_key,
-            algorithms=self.algorithms,
+            key=key.parsed_public_key,
+            algorithms=[key.alg],
             options={"verify_aud":False, 'verify_iss':False},
             **kwargs,
         )
-        return decoded
\ No newline at end of file
+        return decoded
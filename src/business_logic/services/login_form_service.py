@@ -6,6 +6,9 @@ from typing import Any, Dict, Optional, TYPE_CHECKING
 from cryptography.fernet import Fernet
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.business_logic.cache.authorization_codes import (
+    get_authorization_code_store,
+)
 from src.config.settings.app import AppSettings
 from src.data_access.postgresql.errors import WrongResponseTypeError
 from src.data_access.postgresql.repositories import (
@@ -47,9 +50,12 @@ class LoginFormService:
                         "id_token token",
                         "urn:ietf:params:oauth:grant-type:device_code",
                     ]:
-                        if self.request_model.response_type == "code" and (
-                            self.request_model.code_challenge
+                        # A code store keeps the challenge with the code.
+                        if (
+                            self.request_model.response_type == "code"
+                            and self.request_model.code_challenge
                             and self.request_model.code_challenge_method
+                            and get_authorization_code_store() is None
                         ):
                             await self._save_code_challenge()
                         return True
@@ -1,19 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import bcrypt
 
 from src.data_access.postgresql.errors import (
     WrongPasswordError,
     WrongPasswordFormatError,
 )
+from src.dyna_config import PASSWORD_BCRYPT_ROUNDS, PASSWORD_HASHING_THREADS
 from pydantic import SecretStr
 
 
+# bcrypt releases the GIL, so hashing in these threads lets the event loop
+# serve other requests. The pool size bounds the CPU spent on logins.
+_hashing_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASHING_THREADS, thread_name_prefix="bcrypt"
+)
+
+
 class PasswordHash:
+    rounds: int = PASSWORD_BCRYPT_ROUNDS
+
     @classmethod
     def hash_password(cls, password: str) -> str:
         if not isinstance(password, str):
             raise WrongPasswordFormatError("The password should be a string")
         bts = password.encode("utf-8")
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=cls.rounds)
         hash_password = bcrypt.hashpw(bts, salt)
 
         return str(hash_password).strip("b'")
@@ -38,3 +52,45 @@ class PasswordHash:
         str_password_bytes = str_password.get_secret_value().encode("utf-8")
         hash_password_bytes = bytes(hash_password.encode())
         return bcrypt.checkpw(str_password_bytes, hash_password_bytes)
+
+    @classmethod
+    def needs_rehash(cls, hash_password: str) -> bool:
+        """Checks if the hash was made with a cost other than the configured one."""
+        try:
+            return int(hash_password.split("$")[2]) != cls.rounds
+        except (IndexError, ValueError):
+            return True
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hashing_pool, cls.hash_password, password
+        )
+
+    @classmethod
+    async def validate_password_async(
+        cls, str_password: SecretStr, hash_password: str
+    ) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hashing_pool, cls.validate_password, str_password, hash_password
+        )
+
+    @classmethod
+    async def is_password_valid_async(
+        cls, str_password: SecretStr, hash_password: str
+    ) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hashing_pool, cls.is_password_valid, str_password, hash_password
+        )
+
+    @classmethod
+    async def get_upgraded_hash(
+        cls, str_password: SecretStr, hash_password: str
+    ) -> Optional[str]:
+        """
+        Returns a new hash of the already validated password if the stored one
+        was made with another cost, otherwise None.
+        """
+        if not cls.needs_rehash(hash_password):
+            return None
+        return await cls.hash_password_async(str_password.get_secret_value())
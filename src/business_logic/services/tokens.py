@@ -19,6 +19,8 @@ from itsdangerous import base64_encode
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from .scope import ScopeService
+from src.business_logic.cache.introspection import evict_introspection_result
+from src.business_logic.cache.revocation import revocation_store
 from src.business_logic.services.jwt_token import JWTService
 from src.config.settings.app import AppSettings
 from src.data_access.postgresql.errors import (
@@ -189,9 +191,15 @@ class TokenService:
             decoded_token = await self.jwt_service.decode_token_no_aud_iss_check(
                 self.request_body.token,
             )
+            # First, so that a revocation Redis missed fails as a whole.
+            if "jti" in decoded_token:
+                await revocation_store.revoke(
+                    jti=decoded_token["jti"], expiration=decoded_token["exp"]
+                )
             await self.blacklisted_repo.create(
                 token=self.request_body.token, expiration=decoded_token["exp"]
             )
+            await evict_introspection_result(self.request_body.token)
         else:
             raise GrantNotFoundError
 
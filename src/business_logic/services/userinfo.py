@@ -2,7 +2,12 @@ from typing import Any, Optional
 
 from jwt.exceptions import PyJWTError
 
-from src.business_logic.services.jwt_token import JWTService
+from src.business_logic.cache.user_claims import (
+    get_user_claims,
+    normalize_scopes,
+    set_user_claims,
+)
+from src.business_logic.services.jwt_token import JWTService, VerifiedToken
 from src.data_access.postgresql.repositories.client import ClientRepository
 from src.data_access.postgresql.repositories.persistent_grant import (
     PersistentGrantRepository,
@@ -22,6 +27,7 @@ class UserInfoService:
     ) -> None:
         self.jwt = jwt
         self.authorization: Optional[str] = None
+        self.verified_token: Optional[VerifiedToken] = None
         self.user_repo = user_repo
         self.client_repo = client_repo
         self.persistent_grant_repo = persistent_grant_repo
@@ -30,22 +36,33 @@ class UserInfoService:
     async def get_user_info(
         self,
     ) -> dict[str, Any]:
-        token = self.authorization
-        decoded_token = await self.jwt.decode_token_no_aud_iss_check(token=token)
+        if self.verified_token is not None:
+            decoded_token = self.verified_token.claims
+        else:
+            decoded_token = await self.jwt.decode_token_no_aud_iss_check(
+                token=self.authorization
+            )
         try:
             sub = int(decoded_token["sub"])
         except KeyError:
             raise KeyError("No parameter 'sub' in token")
 
+        scopes = normalize_scopes(decoded_token.get("scope"))
+        response = get_user_claims(str(sub), scopes)
+        if response is None:
+            response = await self._get_claims_for_scopes(sub, scopes)
+            set_user_claims(str(sub), scopes, response)
+        return response
+
+    async def _get_claims_for_scopes(
+        self, sub: int, scopes: frozenset[str]
+    ) -> dict[str, Any]:
         claims_dict = await self.user_repo.get_claims(id=sub)
         if not claims_dict.get("sub", False):
             claims_dict["sub"] = str(sub)
 
         response = {}
-        if (
-            not decoded_token.get("scope", False)
-            or "openid" in decoded_token["scope"]
-        ):
+        if not scopes or "openid" in scopes:
             response = {
                 "sub": claims_dict.get("sub", None),
                 "aud": claims_dict.get("aud", None),
@@ -53,10 +70,10 @@ class UserInfoService:
                 "iss": claims_dict.get("iss", None),
                 "iat": claims_dict.get("iat", None),
             }
-            if not decoded_token.get("scope", False):
+            if not scopes:
                 return response
 
-        if "profile" in decoded_token["scope"]:
+        if "profile" in scopes:
             response = response | {
                 "name": claims_dict.get("name", None),
                 "given_name": claims_dict.get("given_name", None),
@@ -80,7 +97,7 @@ class UserInfoService:
                 "address": claims_dict.get("address", None),
                 "updated_at": claims_dict.get("updated_at", None),
             }
-        if "email" in decoded_token["scope"]:
+        if "email" in scopes:
             response = response | {
                 "email": claims_dict.get("email", None),
                 "email_verified": claims_dict.get("email_verified", None),
@@ -7,6 +7,7 @@ from jwkest import base64_to_long, long_to_base64
 from fastapi import Request
 from src.business_logic.services.scope import ScopeService
 from src.business_logic.services import JWTService 
+from src.config.rsa_keys import SigningKeypair
 from typing import Any, Union, Optional
 from src.data_access.postgresql.repositories.wellknown import WellKnownRepository
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -78,7 +79,8 @@ class WellKnownService:
         """Retrieves a list of algorithms from the JWTService.
 
         Returns:
-            List[str]: The list of algorithms, currently contains only "RS256".
+            List[str]: The list of algorithms tokens can be signed with:
+            "RS256" (default), "ES256" and "EdDSA", selected per client.
         """
         return JWTService().algorithms
 
@@ -175,36 +177,48 @@ class WellKnownService:
         return result_model
 
     async def get_jwks(self) -> dict[str, Any]:
-        """Retrieves the JWKS (JSON Web Key Set).
+        """Retrieves the JWK (JSON Web Key) of the current signing key.
 
         Returns:
-            Dict[str, Any]: The JWKS dictionary. Contains properties:
+            Dict[str, Any]: The JWK dictionary. Contains properties:
             - kty - The family of cryptographic algorithms used with the key.
             - alg - The specific cryptographic algorithm used with the key.
             - use - How the key is meant to be used.
+            - kid - The identifier of the key, matches the "kid" header of issued tokens.
             - n - The modulus for the RSA public key.
             - e - The exponent for the RSA public key.
 
         """
         jwt_service = JWTService()
-        kty = ""
-        if "RS" in jwt_service.algorithm:
-            kty = "RSA"
-        elif "HS" in jwt_service.algorithm:
-            kty = "HMAC"
-        else:
-            raise ValueError
+        return self._get_jwk(jwt_service=jwt_service, key=jwt_service.keys)
+
+    async def get_all_jwks(self) -> list[dict[str, Any]]:
+        """Retrieves the JWKs of all active keys in the keystore, the current
+        signing key goes first. Tokens signed with any of them are still valid,
+        so relying parties need all of them to verify signatures.
+
+        Returns:
+            List[Dict[str, Any]]: The list of JWK dictionaries, see get_jwks.
+        """
+        jwt_service = JWTService()
+        return [
+            self._get_jwk(jwt_service=jwt_service, key=key)
+            for key in [jwt_service.keys] + [
+                key
+                for key in jwt_service.keystore.keys
+                if key.kid != jwt_service.keys.kid
+            ]
+        ]
 
+    def _get_jwk(
+        self, jwt_service: JWTService, key: SigningKeypair
+    ) -> dict[str, Any]:
         result = {
-            "kty": kty,
-            "alg": jwt_service.algorithm,
+            **key.jwk,
+            "alg": key.alg,
             "use": "sig",
-            # "kid" : ... ,
-            "n": long_to_base64(await jwt_service.get_module()),
-            "e": long_to_base64(await jwt_service.get_pub_key_expanent()),
+            "kid": key.kid,
         }
-        logger.info(
-            f"n =  {base64_to_long(result['n'])}\ne = {base64_to_long(result['e'])}"
-        )
+        logger.info(f"JWK {key.kid}: {result}")
 
         return result
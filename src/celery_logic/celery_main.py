@@ -2,8 +2,11 @@ from src.dyna_config import (
     DB_URL,
     REDIS_URL,
     CELERY_CLEANER_CRONE,
+    REAPER_METRICS_PORT,
 )
 from celery import Celery
+from celery.signals import worker_init
+from prometheus_client import start_http_server
 import logging
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -28,4 +31,15 @@ celery.conf.beat_schedule = {
         'task': 'src.celery_logic.token_tasks.clear_database',
         'schedule': CELERY_CLEANER_CRONE,
     },
+    'maintain_grant_partitions': {
+        'task': 'src.celery_logic.token_tasks.maintain_grant_partitions',
+        'schedule': crontab(minute=15),
+    },
 }
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs) -> None:
+    # Tasks only run in this process with --pool solo.
+    if REAPER_METRICS_PORT:
+        start_http_server(REAPER_METRICS_PORT)
@@ -0,0 +1,195 @@
+"""
+Batched removal of expired rows.
+
+Every batch picks at most batch_size expired rows by ctid through the
+expiration index, skipping rows locked by requests, and deletes them in its
+own short transaction, so neither locks nor WAL pile up on large tables.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import Interval, Table, delete, func, literal_column, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.data_access.postgresql.tables import (
+    BlacklistedToken,
+    CodeChallenge,
+    Device,
+    PersistentGrant,
+)
+from src.data_access.postgresql.tables.identity_resource import (
+    IdentityProviderState,
+)
+from src.dyna_config import (
+    REAPER_BATCH_SIZE,
+    REAPER_CODE_CHALLENGE_LIFETIME,
+    REAPER_IDENTITY_PROVIDER_STATE_LIFETIME,
+    REAPER_MAX_BATCHES,
+    REAPER_PAUSE,
+)
+
+REAPED_ROWS = Counter(
+    "db_reaper_deleted_rows",
+    "Expired rows deleted by the reaper.",
+    ["table"],
+)
+REAPER_DURATION = Histogram(
+    "db_reaper_duration_seconds",
+    "Time spent deleting the expired rows of a table in one run.",
+    ["table"],
+)
+
+
+class ExpiringTable(NamedTuple):
+    table: Table
+    # Indexed expression holding the moment a row expires.
+    expires_at: ColumnElement
+    # Converts a unix time to a value comparable with expires_at and back.
+    to_db_time: Callable[[float], Any]
+    from_db_time: Callable[[Any], float]
+
+
+class ReaperReport(NamedTuple):
+    deleted: dict[str, int]
+    # False when max_batches was reached before all expired rows were gone.
+    complete: bool
+
+
+def _to_timestamp(lifetime: int = 0) -> Callable[[float], datetime]:
+    # created_at is a naive UTC timestamp.
+    def to_timestamp(unix_time: float) -> datetime:
+        moment = datetime.fromtimestamp(unix_time - lifetime, timezone.utc)
+        return moment.replace(tzinfo=None)
+    return to_timestamp
+
+
+def _from_timestamp(lifetime: int = 0) -> Callable[[datetime], float]:
+    def from_timestamp(moment: datetime) -> float:
+        return moment.replace(tzinfo=timezone.utc).timestamp() + lifetime
+    return from_timestamp
+
+
+def _get_expiring_tables() -> tuple[ExpiringTable, ...]:
+    grants = PersistentGrant.__table__
+    blacklisted_tokens = BlacklistedToken.__table__
+    devices = Device.__table__
+    code_challenges = CodeChallenge.__table__
+    states = IdentityProviderState.__table__
+    return (
+        ExpiringTable(grants, grants.c.expiration, int, float),
+        ExpiringTable(
+            blacklisted_tokens, blacklisted_tokens.c.expiration, int, float
+        ),
+        ExpiringTable(
+            devices,
+            # Same expression as ix_devices_expires_at.
+            devices.c.created_at
+            + devices.c.expires_in * literal_column("interval '1 second'", Interval),
+            _to_timestamp(),
+            _from_timestamp(),
+        ),
+        ExpiringTable(
+            code_challenges,
+            code_challenges.c.created_at,
+            _to_timestamp(REAPER_CODE_CHALLENGE_LIFETIME),
+            _from_timestamp(REAPER_CODE_CHALLENGE_LIFETIME),
+        ),
+        ExpiringTable(
+            states,
+            states.c.created_at,
+            _to_timestamp(REAPER_IDENTITY_PROVIDER_STATE_LIFETIME),
+            _from_timestamp(REAPER_IDENTITY_PROVIDER_STATE_LIFETIME),
+        ),
+    )
+
+
+EXPIRING_TABLES = _get_expiring_tables()
+
+
+def delete_expired_batch(
+    session: Session, expiring: ExpiringTable, now: float, batch_size: int
+) -> int:
+    ctid = literal_column("ctid")
+    expired_rows = (
+        select(ctid)
+        .select_from(expiring.table)
+        .where(expiring.expires_at <= expiring.to_db_time(now))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = session.execute(
+        delete(expiring.table).where(
+            ctid == func.any(func.array(expired_rows.scalar_subquery()))
+        )
+    )
+    session.commit()
+    return result.rowcount
+
+
+def reap_table(
+    session: Session,
+    expiring: ExpiringTable,
+    now: float,
+    batch_size: int = REAPER_BATCH_SIZE,
+    max_batches: int = REAPER_MAX_BATCHES,
+    pause: float = REAPER_PAUSE,
+) -> tuple[int, bool]:
+    """
+    Deletes the rows of the table expired by now.
+    Returns the number of deleted rows and whether none are left.
+    """
+    table_name = expiring.table.name
+    deleted = 0
+    with REAPER_DURATION.labels(table_name).time():
+        for batch in range(max_batches):
+            if batch:
+                time.sleep(pause)
+            count = delete_expired_batch(session, expiring, now, batch_size)
+            deleted += count
+            REAPED_ROWS.labels(table_name).inc(count)
+            if count < batch_size:
+                return deleted, True
+    return deleted, False
+
+
+def reap_expired_rows(
+    session: Session,
+    tables: Iterable[ExpiringTable] = EXPIRING_TABLES,
+    **limits: Any,
+) -> ReaperReport:
+    now = time.time()
+    deleted = {}
+    complete = True
+    for expiring in tables:
+        count, table_complete = reap_table(session, expiring, now, **limits)
+        deleted[expiring.table.name] = count
+        complete = complete and table_complete
+    return ReaperReport(deleted=deleted, complete=complete)
+
+
+def get_next_cleaning_time(
+    session: Session, tables: Iterable[ExpiringTable] = EXPIRING_TABLES
+) -> Optional[float]:
+    """
+    Returns the seconds left until the next row of any table expires,
+    or None if there is nothing to expire.
+    """
+    now = time.time()
+    next_expiration = None
+    for expiring in tables:
+        earliest = session.execute(
+            select(func.min(expiring.expires_at)).where(
+                expiring.expires_at > expiring.to_db_time(now)
+            )
+        ).scalar()
+        if earliest is None:
+            continue
+        expiration = expiring.from_db_time(earliest)
+        if next_expiration is None or expiration < next_expiration:
+            next_expiration = expiration
+    if next_expiration is None:
+        return None
+    return max(next_expiration - now, 0.0)
@@ -1,47 +1,109 @@
-from sqlalchemy import delete, func
-from datetime import datetime
-from src.data_access.postgresql.tables import PersistentGrant, BlacklistedToken
+import time
+from typing import Optional
+
+from celery import Task
+from redis import Redis
+from redis.exceptions import RedisError
+
 from src.celery_logic.celery_main import celery, Session, logger
+from src.celery_logic.reaper import (
+    EXPIRING_TABLES,
+    get_next_cleaning_time,
+    reap_expired_rows,
+)
+from src.data_access.postgresql.partitioning import (
+    TABLE as PARTITIONED_TABLE,
+    create_partitions,
+    delete_expired_default_rows,
+    drop_expired_partitions,
+    is_partitioned,
+)
+from src.dyna_config import (
+    PERSISTENT_GRANTS_PARTITIONS_AHEAD,
+    REAPER_MAX_INTERVAL,
+    REAPER_MIN_INTERVAL,
+    REDIS_URL,
+)
 
+NEXT_CLEANING_KEY = "reaper:next-cleaning"
 
-@celery.task
-def clear_database() -> str:
+
+@celery.task(bind=True)
+def clear_database(self: Task) -> str:
     session = Session()
-    result = delete_expired_tokens(session) + delete_expired_blacklisted_tokens(session)
-    session.close()
-    return f'Total deleted: {result}'
-
-def delete_expired_tokens(session) -> int:
-    delete_query = (
-        delete(PersistentGrant)
-        .where(
-            func.trunc(
-                func.extract('epoch', datetime.utcnow())
-            ) >= PersistentGrant.expiration
-        )
-        .execution_options(synchronize_session=False)
-    )
+    try:
+        tables = EXPIRING_TABLES
+        if is_partitioned(session.connection()):
+            # Expired grants go away with their partitions.
+            tables = tuple(
+                expiring for expiring in tables
+                if expiring.table.name != PARTITIONED_TABLE
+            )
+        report = reap_expired_rows(session, tables)
+        if report.complete:
+            delay = get_next_cleaning_time(session, tables)
+        else:
+            delay = REAPER_MIN_INTERVAL
+    finally:
+        session.close()
 
-    result = session.execute(delete_query)
-    n = result.rowcount
-    session.commit()
-    logger.info(f"Deleted {n} expired tokens")
-    return n
+    for table, count in report.deleted.items():
+        logger.info(f"Deleted {count} expired rows from {table}")
+    if not self.request.called_directly:
+        schedule_next_cleaning(delay)
+    return f'Total deleted: {sum(report.deleted.values())}'
 
 
-def delete_expired_blacklisted_tokens(session) -> int:
-    delete_query = (
-        delete(BlacklistedToken)
-        .where(
-            func.trunc(
-                func.extract('epoch', datetime.utcnow())
-            ) >= BlacklistedToken.expiration
+def schedule_next_cleaning(delay: Optional[float]) -> None:
+    """
+    Runs clear_database again when the next row expires, within
+    [reaper] min_interval and max_interval. Runs started by the cron and by
+    this schedule share one pending run through a Redis key.
+    """
+    if delay is None:
+        delay = REAPER_MAX_INTERVAL
+    delay = int(min(max(delay, REAPER_MIN_INTERVAL), REAPER_MAX_INTERVAL))
+    try:
+        scheduled = Redis.from_url(REDIS_URL).set(
+            NEXT_CLEANING_KEY, int(time.time()) + delay, nx=True, ex=max(delay - 1, 1)
         )
-        .execution_options(synchronize_session=False)
-    )
+    except RedisError as exception:
+        logger.warning(f"Could not schedule the next cleaning: {exception}")
+        return
+    if scheduled:
+        clear_database.apply_async(countdown=delay)
+        logger.info(f"Next cleaning in {delay} seconds")
 
-    result = session.execute(delete_query)
-    n = result.rowcount
-    session.commit()
-    logger.info(f"Deleted {n} expired blacklisted tokens")
-    return n
\ No newline at end of file
+
+@celery.task
+def maintain_grant_partitions() -> str:
+    """
+    Creates the partitions of persistent_grants for the coming days and
+    drops the expired ones. Does nothing unless the table is partitioned.
+    """
+    session = Session()
+    try:
+        connection = session.connection()
+        if not is_partitioned(connection):
+            return 'persistent_grants is not partitioned'
+        # DETACH PARTITION locks the whole table, rather retry next time
+        # than queue every grant query behind a long transaction.
+        connection.exec_driver_sql("SET LOCAL lock_timeout = '5s'")
+        now = time.time()
+        created = create_partitions(
+            connection, now, PERSISTENT_GRANTS_PARTITIONS_AHEAD
+        )
+        dropped = drop_expired_partitions(connection, now)
+        deleted = delete_expired_default_rows(connection, now)
+        session.commit()
+    finally:
+        session.close()
+
+    for name in created:
+        logger.info(f"Created partition {name}")
+    for name in dropped:
+        logger.info(f"Dropped partition {name}")
+    return (
+        f'Created {len(created)}, dropped {len(dropped)} partitions, '
+        f'deleted {deleted} rows from the default partition'
+    )
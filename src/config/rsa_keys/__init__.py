@@ -1,2 +1,14 @@
-from .create_rsa_keypair import CreateRSAKeypair
-from .dto import RSAKeypair
\ No newline at end of file
+from .create_rsa_keypair import (
+    SIGNING_ALGORITHMS,
+    CreateRSAKeypair,
+    CreateSigningKeypair,
+    LoadRSAKeypair,
+    LoadSigningKeypair,
+)
+from .dto import RSAKeypair, SigningKeypair
+from .keystore import (
+    BaseKeyStore,
+    DatabaseKeyStore,
+    FileKeyStore,
+    get_keystore,
+)
@@ -1,21 +1,142 @@
+import base64
+import hashlib
+import json
 import logging
+from typing import Any
 
 from Crypto.PublicKey import RSA
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 
-from .dto import RSAKeypair
+from .dto import RSAKeypair, SigningKeypair
 
 logger = logging.getLogger(__name__)
 
+# Asymmetric algorithms tokens can be signed with, the first one is the default.
+SIGNING_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+def _int_to_base64(value: int, length: int = 0) -> str:
+    value_bytes = value.to_bytes(
+        max(length, (value.bit_length() + 7) // 8), "big"
+    )
+    return _bytes_to_base64(value_bytes)
+
+
+def _bytes_to_base64(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def get_jwk_thumbprint(jwk: dict[str, str]) -> str:
+    """
+    Calculates the JWK thumbprint of a public key, which is used as its kid.
+
+    Reference: https://www.rfc-editor.org/rfc/rfc7638
+    """
+    members = json.dumps(jwk, separators=(",", ":"), sort_keys=True)
+    return _bytes_to_base64(hashlib.sha256(members.encode()).digest())
+
+
+def get_key_thumbprint(n: int, e: int) -> str:
+    """Calculates the JWK thumbprint of an RSA public key."""
+    return get_jwk_thumbprint(
+        {"e": _int_to_base64(e), "kty": "RSA", "n": _int_to_base64(n)}
+    )
+
 
 class CreateRSAKeypair:
     def execute(self) -> RSAKeypair:
         key = RSA.generate(2048)
-        private_key = key.export_key("PEM")
+        return LoadRSAKeypair().execute(private_key=key.export_key("PEM"))
+
+
+class LoadRSAKeypair:
+    def execute(self, private_key: bytes) -> RSAKeypair:
+        key = RSA.import_key(private_key)
         public_key = key.public_key().export_key("PEM")
 
-        return RSAKeypair(
-            private_key=private_key,
+        keypair = RSAKeypair(
+            private_key=key.export_key("PEM"),
             public_key=public_key,
             n=key.n,
             e=key.e,
+            kid=get_key_thumbprint(n=key.n, e=key.e),
+            jwk={
+                "kty": "RSA",
+                "n": _int_to_base64(key.n),
+                "e": _int_to_base64(key.e),
+            },
+        )
+        keypair.warm_up()
+        return keypair
+
+
+class CreateSigningKeypair:
+    """Generates a keypair for one of SIGNING_ALGORITHMS."""
+
+    def execute(self, alg: str) -> SigningKeypair:
+        key: Any
+        if alg == "RS256":
+            return CreateRSAKeypair().execute()
+        elif alg == "ES256":
+            key = ec.generate_private_key(ec.SECP256R1())
+        elif alg == "EdDSA":
+            key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            raise ValueError(f"Unsupported signing algorithm: {alg}")
+        return LoadSigningKeypair().execute(
+            private_key=key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        )
+
+
+class LoadSigningKeypair:
+    """Loads a PEM private key, the algorithm is defined by the key type."""
+
+    def execute(self, private_key: bytes) -> SigningKeypair:
+        key = serialization.load_pem_private_key(private_key, password=None)
+        if isinstance(key, rsa.RSAPrivateKey):
+            return LoadRSAKeypair().execute(private_key=private_key)
+
+        if isinstance(key, ec.EllipticCurvePrivateKey) and isinstance(
+            key.curve, ec.SECP256R1
+        ):
+            alg = "ES256"
+            numbers = key.public_key().public_numbers()
+            jwk = {
+                "kty": "EC",
+                "crv": "P-256",
+                "x": _int_to_base64(numbers.x, length=32),
+                "y": _int_to_base64(numbers.y, length=32),
+            }
+        elif isinstance(key, ed25519.Ed25519PrivateKey):
+            alg = "EdDSA"
+            jwk = {
+                "kty": "OKP",
+                "crv": "Ed25519",
+                "x": _bytes_to_base64(
+                    key.public_key().public_bytes(
+                        encoding=serialization.Encoding.Raw,
+                        format=serialization.PublicFormat.Raw,
+                    )
+                ),
+            }
+        else:
+            raise ValueError(f"Unsupported signing key type: {type(key)}")
+
+        keypair = SigningKeypair(
+            alg=alg,
+            private_key=private_key,
+            public_key=key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ),
+            kid=get_jwk_thumbprint(jwk),
+            jwk=jwk,
         )
+        keypair._parsed_private_key = key
+        keypair._parsed_public_key = key.public_key()
+        return keypair
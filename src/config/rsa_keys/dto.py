@@ -1,10 +1,50 @@
-from pydantic import Field
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from pydantic import Field, PrivateAttr
 from pydantic import BaseModel
 
 
-class RSAKeypair(BaseModel):
+class SigningKeypair(BaseModel):
+    alg: str = Field(...)
+
     private_key: bytes = Field(...)
     public_key: bytes = Field(...)
 
+    kid: str = Field(...)
+    # Public parameters of the key in JWK format (kty, crv, x, y, n, e).
+    jwk: dict[str, str] = Field(...)
+
+    # PEM parsing is expensive, so the key objects passed to PyJWT
+    # are built once per keypair and reused by every encode/decode.
+    _parsed_private_key: Optional[Any] = PrivateAttr(default=None)
+    _parsed_public_key: Optional[Any] = PrivateAttr(default=None)
+
+    @property
+    def parsed_private_key(self) -> Any:
+        if self._parsed_private_key is None:
+            self._parsed_private_key = load_pem_private_key(
+                self.private_key, password=None
+            )
+        return self._parsed_private_key
+
+    @property
+    def parsed_public_key(self) -> Any:
+        if self._parsed_public_key is None:
+            self._parsed_public_key = load_pem_public_key(self.public_key)
+        return self._parsed_public_key
+
+    def warm_up(self) -> None:
+        """Parses both keys now instead of on the first request."""
+        self._parsed_private_key = self.parsed_private_key
+        self._parsed_public_key = self.parsed_public_key
+
+
+class RSAKeypair(SigningKeypair):
+    alg: str = Field("RS256")
+
     n: int = Field(...)
-    e: int = Field(...)
\ No newline at end of file
+    e: int = Field(...)
@@ -0,0 +1,200 @@
+import fcntl
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+
+from src.dyna_config import DB_URL, KEYSTORE_BACKEND, KEYSTORE_PATH
+
+from .create_rsa_keypair import (
+    SIGNING_ALGORITHMS,
+    CreateSigningKeypair,
+    LoadSigningKeypair,
+)
+from .dto import RSAKeypair, SigningKeypair
+
+logger = logging.getLogger(__name__)
+
+
+class BaseKeyStore(ABC):
+    """
+    Shared storage of the keys used to sign and verify tokens.
+
+    Keys are loaded once per process and cached. The first process that finds
+    no key for one of SIGNING_ALGORITHMS generates it under a lock, so every
+    worker and node ends up signing with the same keys. All active keys are
+    published in JWKS; the newest key of an algorithm is used for signing.
+    """
+
+    # Minimal number of seconds between reloads caused by an unknown kid.
+    reload_interval = 60
+
+    def __init__(self) -> None:
+        self._keys: Optional[list[SigningKeypair]] = None
+        self._loaded_at = 0.0
+
+    @property
+    def keys(self) -> list[SigningKeypair]:
+        """All active keys, newest first."""
+        if self._keys is None:
+            self.reload()
+        return self._keys  # type: ignore
+
+    @property
+    def signing_key(self) -> RSAKeypair:
+        """The current RS256 key, used unless a client asks for another algorithm."""
+        return self.get_signing_key("RS256")  # type: ignore
+
+    def get_signing_key(self, alg: str) -> SigningKeypair:
+        for key in self.keys:
+            if key.alg == alg:
+                return key
+        raise ValueError(f"Unsupported signing algorithm: {alg}")
+
+    def get_key(self, kid: Optional[str]) -> Optional[SigningKeypair]:
+        """
+        Returns an active key by its kid.
+
+        A key unknown to this process may have been added by another node,
+        so the storage is re-read, but not more often than reload_interval.
+        """
+        if kid is None:
+            return None
+        for key in self.keys:
+            if key.kid == kid:
+                return key
+        if time.monotonic() - self._loaded_at < self.reload_interval:
+            return None
+        self.reload()
+        for key in self.keys:
+            if key.kid == kid:
+                return key
+        return None
+
+    def reload(self) -> None:
+        self._keys = self._load_keys()
+        self._loaded_at = time.monotonic()
+        signing_kids = [self.get_signing_key(alg).kid for alg in SIGNING_ALGORITHMS]
+        logger.info(
+            f"Loaded {len(self._keys)} signing key(s), "
+            f"signing kids: {signing_kids}"
+        )
+
+    @abstractmethod
+    def _load_keys(self) -> list[SigningKeypair]:
+        """Returns all active keys, newest first, generating missing ones."""
+
+    @staticmethod
+    def _get_missing_algorithms(keys: list[SigningKeypair]) -> list[str]:
+        algorithms = {key.alg for key in keys}
+        return [alg for alg in SIGNING_ALGORITHMS if alg not in algorithms]
+
+
+class FileKeyStore(BaseKeyStore):
+    """
+    Keeps every key as a PEM file named <kid>.pem in a directory shared by
+    the workers (a mounted volume when running several nodes). Removing
+    a file retires the key.
+    """
+
+    lock_filename = ".keystore.lock"
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    def _load_keys(self) -> list[SigningKeypair]:
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        with open(os.path.join(self.path, self.lock_filename), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                keys = self._read_keys()
+                for alg in self._get_missing_algorithms(keys):
+                    key = CreateSigningKeypair().execute(alg)
+                    self._write_key(key)
+                    logger.info(f"Created new {alg} signing key {key.kid}.")
+                    keys.append(key)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return keys
+
+    def _read_keys(self) -> list[SigningKeypair]:
+        filenames = [
+            os.path.join(self.path, filename)
+            for filename in os.listdir(self.path)
+            if filename.endswith(".pem")
+        ]
+        filenames.sort(key=os.path.getmtime, reverse=True)
+        keys = []
+        for filename in filenames:
+            with open(filename, "rb") as key_file:
+                keys.append(LoadSigningKeypair().execute(key_file.read()))
+        return keys
+
+    def _write_key(self, key: SigningKeypair) -> None:
+        filename = os.path.join(self.path, f"{key.kid}.pem")
+        tmp_filename = f"{filename}.tmp"
+        fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(key.private_key)
+        os.replace(tmp_filename, filename)
+
+
+class DatabaseKeyStore(BaseKeyStore):
+    """
+    Keeps keys in the signing_keys table. Setting active to false retires a key.
+
+    It runs once per process, before the async engine is used, so a short-lived
+    synchronous connection is opened the same way the celery worker does it.
+    """
+
+    # Key of the transaction-level advisory lock taken while loading keys.
+    advisory_lock_id = 7_301_962
+
+    def __init__(self, db_url: str) -> None:
+        super().__init__()
+        self.db_url = db_url.replace("+asyncpg", "")
+
+    def _load_keys(self) -> list[SigningKeypair]:
+        from sqlalchemy import create_engine, insert, select, text
+        from sqlalchemy.pool import NullPool
+
+        from src.data_access.postgresql.tables.signing_key import SigningKey
+
+        engine = create_engine(self.db_url, poolclass=NullPool)
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                    {"lock_id": self.advisory_lock_id},
+                )
+                rows = connection.execute(
+                    select(SigningKey.private_key)
+                    .where(SigningKey.active.is_(True))
+                    .order_by(SigningKey.id.desc())
+                ).all()
+                keys = [
+                    LoadSigningKeypair().execute(row[0].encode()) for row in rows
+                ]
+                for alg in self._get_missing_algorithms(keys):
+                    key = CreateSigningKeypair().execute(alg)
+                    connection.execute(
+                        insert(SigningKey).values(
+                            kid=key.kid,
+                            private_key=key.private_key.decode(),
+                        )
+                    )
+                    logger.info(f"Created new {alg} signing key {key.kid}.")
+                    keys.append(key)
+        finally:
+            engine.dispose()
+        return keys
+
+
+@lru_cache
+def get_keystore() -> BaseKeyStore:
+    if KEYSTORE_BACKEND == "database":
+        return DatabaseKeyStore(db_url=DB_URL)
+    return FileKeyStore(path=KEYSTORE_PATH)
@@ -1,9 +1,9 @@
 import logging
 from typing import Any, Dict, List, Tuple
 
-from pydantic import PostgresDsn, SecretStr
+from pydantic import Field, PostgresDsn, SecretStr
 
-from src.config.rsa_keys import CreateRSAKeypair, RSAKeypair
+from src.config.rsa_keys import RSAKeypair, get_keystore
 from src.config.settings.base import BaseAppSettings
 
 
@@ -27,7 +27,10 @@ class AppSettings(BaseAppSettings):
 
     allowed_hosts: List[str] = ["*"]
 
-    keys: RSAKeypair = CreateRSAKeypair().execute()
+    # Loaded from the shared keystore, so all workers sign with the same key.
+    keys: RSAKeypair = Field(
+        default_factory=lambda: get_keystore().signing_key
+    )
 
     class Config:
         validate_assignment = True
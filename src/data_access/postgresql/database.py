@@ -1,18 +1,107 @@
 import logging
+import time
+import weakref
+from typing import Any, Iterator, Optional
 
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from src.config.settings.app import AppSettings
+from src.dyna_config import (
+    DB_POOL_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for an idle connection in the PostgreSQL pool, "
+    "not counting new connections being opened.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+class InstrumentedAsyncAdaptedQueue(AsyncAdaptedQueue):
+    """AsyncAdaptedQueue that records how long taking a connection waits."""
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long a checkout waits for an
+    idle connection. Opening an overflow connection is not part of the wait.
+    """
+
+    _queue_class = InstrumentedAsyncAdaptedQueue
+
+
+class PoolStatsCollector:
+    """
+    Exports the state of the connection pools of this process at /metrics.
+    The values are read from the pools when metrics are scraped.
+    """
+
+    def __init__(self) -> None:
+        self.pools: weakref.WeakSet[AsyncAdaptedQueuePool] = weakref.WeakSet()
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        pools = list(self.pools)
+        yield GaugeMetricFamily(
+            "db_pool_size",
+            "Configured number of pooled connections.",
+            value=sum(pool.size() for pool in pools),
+        )
+        yield GaugeMetricFamily(
+            "db_pool_checked_out",
+            "Connections currently in use.",
+            value=sum(pool.checkedout() for pool in pools),
+        )
+        yield GaugeMetricFamily(
+            "db_pool_checked_in",
+            "Idle connections in the pool.",
+            value=sum(pool.checkedin() for pool in pools),
+        )
+        yield GaugeMetricFamily(
+            "db_pool_overflow",
+            "Connections opened above the pool size.",
+            value=sum(max(pool.overflow(), 0) for pool in pools),
+        )
+
+
+pool_stats_collector = PoolStatsCollector()
+REGISTRY.register(pool_stats_collector)
+
 
 class Database:
-    def __init__(self, database_url: str, max_connection_count: int):
+    def __init__(
+        self,
+        database_url: str,
+        max_connection_count: int,
+        pool_overflow: int = DB_POOL_OVERFLOW,
+        pool_timeout: float = DB_POOL_TIMEOUT,
+        pool_recycle: int = DB_POOL_RECYCLE,
+        pool_pre_ping: bool = DB_POOL_PRE_PING,
+    ):
         self.__engine = self._create_connection_pool(
-            database_url, max_connection_count
+            database_url,
+            max_connection_count,
+            pool_overflow=pool_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
         )
         self.__session_factory = sessionmaker(
             self.__engine, expire_on_commit=False, class_=AsyncSession
@@ -26,10 +115,21 @@ class Database:
     def engine(self) -> AsyncSession:
         return self.__engine
 
-    def _create_connection_pool(self, db_url: str, max_connection_count: int) -> AsyncEngine:
+    def _create_connection_pool(
+        self, db_url: str, max_connection_count: int, **pool_options: Any
+    ) -> AsyncEngine:
         logger.info("Creating PostgreSQL connection pool.")
 
-        connection_pool = create_async_engine(db_url, poolclass=NullPool)
+        connection_pool = create_async_engine(
+            db_url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=max_connection_count,
+            max_overflow=pool_options["pool_overflow"],
+            pool_timeout=pool_options["pool_timeout"],
+            pool_recycle=pool_options["pool_recycle"],
+            pool_pre_ping=pool_options["pool_pre_ping"],
+        )
+        pool_stats_collector.pools.add(connection_pool.pool)
 
         logger.info("Connection pool created.")
 
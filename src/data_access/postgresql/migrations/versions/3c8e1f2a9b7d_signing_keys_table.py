@@ -0,0 +1,33 @@
+"""signing_keys_table
+
+Revision ID: 3c8e1f2a9b7d
+Revises: a9b3da91b421
+Create Date: 2026-10-18 10:12:31.274918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e1f2a9b7d'
+down_revision = 'a9b3da91b421'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('signing_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('kid', sa.String(length=64), nullable=False),
+    sa.Column('private_key', sa.String(), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kid')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('signing_keys')
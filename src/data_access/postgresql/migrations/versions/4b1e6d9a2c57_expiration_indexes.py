@@ -0,0 +1,54 @@
+"""Index the expiration of every table cleaned by the reaper
+
+Revision ID: 4b1e6d9a2c57
+Revises: 8e41b0c7d2a5
+Create Date: 2026-10-18 18:12:44.503126
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4b1e6d9a2c57"
+down_revision = "8e41b0c7d2a5"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_persistent_grants_expiration", "persistent_grants", ["expiration"]),
+    ("ix_blacklisted_tokens_expiration", "blacklisted_tokens", ["expiration"]),
+    (
+        "ix_devices_expires_at",
+        "devices",
+        [sa.text("(created_at + expires_in * interval '1 second')")],
+    ),
+    ("ix_code_challenges_created_at", "code_challenges", ["created_at"]),
+    (
+        "ix_identity_provider_states_created_at",
+        "identity_provider_states",
+        ["created_at"],
+    ),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so that the token tables stay writable meanwhile.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+            )
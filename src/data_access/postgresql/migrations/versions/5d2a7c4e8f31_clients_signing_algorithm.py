@@ -0,0 +1,31 @@
+"""Add signing_algorithm column to client table
+
+Revision ID: 5d2a7c4e8f31
+Revises: 3c8e1f2a9b7d
+Create Date: 2026-10-18 14:03:48.519207
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d2a7c4e8f31"
+down_revision = "3c8e1f2a9b7d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "clients",
+        sa.Column(
+            "signing_algorithm",
+            sa.String(length=10),
+            nullable=False,
+            server_default="RS256",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("clients", "signing_algorithm")
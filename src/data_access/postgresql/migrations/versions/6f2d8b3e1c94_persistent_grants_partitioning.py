@@ -0,0 +1,40 @@
+"""Partition persistent_grants by expiration day when configured
+
+Revision ID: 6f2d8b3e1c94
+Revises: 4b1e6d9a2c57
+Create Date: 2026-10-18 19:03:27.618240
+
+"""
+import time
+
+from alembic import op
+
+from src.data_access.postgresql.partitioning import (
+    is_partitioned,
+    partition_table,
+    unpartition_table,
+)
+from src.dyna_config import (
+    PERSISTENT_GRANTS_PARTITIONED,
+    PERSISTENT_GRANTS_PARTITIONS_AHEAD,
+)
+
+# revision identifiers, used by Alembic.
+revision = "6f2d8b3e1c94"
+down_revision = "4b1e6d9a2c57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Optional layout, see [persistent_grants] in default.toml.
+    if PERSISTENT_GRANTS_PARTITIONED:
+        partition_table(
+            op.get_bind(), time.time(), PERSISTENT_GRANTS_PARTITIONS_AHEAD
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if is_partitioned(bind):
+        unpartition_table(bind)
@@ -0,0 +1,41 @@
+"""Add indexed grant_data_digest column to persistent_grants
+
+Revision ID: 8e41b0c7d2a5
+Revises: 5d2a7c4e8f31
+Create Date: 2026-10-18 16:27:05.114382
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e41b0c7d2a5"
+down_revision = "5d2a7c4e8f31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "persistent_grants",
+        sa.Column("grant_data_digest", sa.LargeBinary(length=32), nullable=True),
+    )
+    # sha256() is built into PostgreSQL since version 11.
+    op.execute(
+        "UPDATE persistent_grants "
+        "SET grant_data_digest = sha256(convert_to(grant_data, 'UTF8'))"
+    )
+    op.alter_column("persistent_grants", "grant_data_digest", nullable=False)
+    op.create_index(
+        "ix_persistent_grants_grant_data_digest_type",
+        "persistent_grants",
+        ["grant_data_digest", "persistent_grant_type_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_persistent_grants_grant_data_digest_type",
+        table_name="persistent_grants",
+    )
+    op.drop_column("persistent_grants", "grant_data_digest")
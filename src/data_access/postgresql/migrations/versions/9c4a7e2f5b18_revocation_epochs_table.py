@@ -0,0 +1,33 @@
+"""revocation_epochs_table
+
+Revision ID: 9c4a7e2f5b18
+Revises: 6f2d8b3e1c94
+Create Date: 2026-10-18 19:41:52.307715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4a7e2f5b18'
+down_revision = '6f2d8b3e1c94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('revocation_epochs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('revoked_before', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'subject')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('revocation_epochs')
@@ -0,0 +1,215 @@
+"""
+Optional daily range partitioning of persistent_grants by expiration.
+
+Every partition holds the grants expiring within one UTC day, so a day of
+expired grants goes away with a single DROP TABLE instead of row deletes.
+Grants with an expiration outside of the created partitions land in the
+default partition, which is cleaned with a plain DELETE. When the partition
+of their day is created later, they are moved into it.
+
+The functions take a synchronous connection: they are run by the Alembic
+migration and by the celery maintenance task.
+"""
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+TABLE = "persistent_grants"
+DEFAULT_PARTITION = f"{TABLE}_default"
+HISTORY_PARTITION = f"{TABLE}_history"
+DAY = 24 * 60 * 60
+
+_UPPER_BOUND = re.compile(r"TO \('?(-?\d+)'?\)")
+
+
+def get_day_start(unix_time: float) -> int:
+    return int(unix_time) // DAY * DAY
+
+
+def get_partition_name(day_start: int) -> str:
+    day = datetime.fromtimestamp(day_start, timezone.utc)
+    return f"{TABLE}_p{day:%Y%m%d}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    return connection.execute(
+        text(
+            "SELECT EXISTS ("
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+        ),
+        {"table": TABLE},
+    ).scalar()
+
+
+def get_partitions(connection: Connection) -> dict[str, Optional[int]]:
+    """
+    Returns the partitions of persistent_grants with the exclusive upper
+    bound of their expirations, None for the default partition.
+    """
+    rows = connection.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+        ),
+        {"table": TABLE},
+    )
+    partitions = {}
+    for name, bound in rows:
+        upper_bound = _UPPER_BOUND.search(bound)
+        partitions[name] = int(upper_bound.group(1)) if upper_bound else None
+    return partitions
+
+
+def create_partitions(
+    connection: Connection, now: float, days_ahead: int
+) -> list[str]:
+    """Creates the missing partitions from today to days_ahead days ahead."""
+    existing = get_partitions(connection)
+    created = []
+    for day in range(days_ahead + 1):
+        start = get_day_start(now) + day * DAY
+        name = get_partition_name(start)
+        if name in existing:
+            continue
+        if DEFAULT_PARTITION in existing and _default_partition_holds(
+            connection, start
+        ):
+            _create_partition_from_default(connection, name, start)
+        else:
+            _create_partition(connection, name, start)
+        created.append(name)
+    return created
+
+
+def _create_partition(connection: Connection, name: str, start: int) -> None:
+    connection.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ({start}) TO ({start + DAY})"
+        )
+    )
+
+
+def _default_partition_holds(connection: Connection, start: int) -> bool:
+    return connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE expiration >= :start AND expiration < :end)"
+        ),
+        {"start": start, "end": start + DAY},
+    ).scalar()
+
+
+def _create_partition_from_default(
+    connection: Connection, name: str, start: int
+) -> None:
+    """
+    Creates the partition of a day whose grants are in the default partition,
+    which Postgres refuses while the default partition is attached.
+    """
+    connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    _create_partition(connection, name, start)
+    connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE expiration >= :start AND expiration < :end RETURNING *) "
+            f"INSERT INTO {TABLE} SELECT * FROM moved"
+        ),
+        {"start": start, "end": start + DAY},
+    )
+    connection.execute(
+        text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+
+
+def drop_expired_partitions(connection: Connection, now: float) -> list[str]:
+    """Detaches and drops the partitions whose grants have all expired."""
+    dropped = []
+    for name, upper_bound in get_partitions(connection).items():
+        if upper_bound is None or upper_bound > now:
+            continue
+        connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+def delete_expired_default_rows(connection: Connection, now: float) -> int:
+    result = connection.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE expiration <= :now"),
+        {"now": int(now)},
+    )
+    return result.rowcount
+
+
+def _add_constraints(connection: Connection, partitioned: bool) -> None:
+    # Unique constraints of a partitioned table must include the partition key.
+    key_columns = ", expiration" if partitioned else ""
+    statements = [
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id{key_columns})",
+        f"ALTER TABLE {TABLE} ADD UNIQUE (key{key_columns})",
+        "CREATE INDEX ix_persistent_grants_grant_data_digest_type "
+        f"ON {TABLE} (grant_data_digest, persistent_grant_type_id)",
+        f"ALTER TABLE {TABLE} ADD FOREIGN KEY (client_id) "
+        "REFERENCES clients (id) ON DELETE CASCADE",
+        f"ALTER TABLE {TABLE} ADD FOREIGN KEY (user_id) "
+        "REFERENCES users (id) ON DELETE CASCADE",
+        f"ALTER TABLE {TABLE} ADD FOREIGN KEY (persistent_grant_type_id) "
+        "REFERENCES persistent_grant_types (id) ON DELETE CASCADE",
+    ]
+    if not partitioned:
+        statements.append(
+            f"CREATE INDEX ix_persistent_grants_expiration ON {TABLE} (expiration)"
+        )
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _rebuild_table(connection: Connection, partition_by: str) -> None:
+    """
+    Replaces persistent_grants by a new table with the same columns,
+    created with partition_by, and moves the grants into it.
+    Partitions must be created by the caller after this call.
+    """
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old"))
+    connection.execute(
+        text(f"CREATE TABLE {TABLE} (LIKE {TABLE}_old INCLUDING DEFAULTS) {partition_by}")
+    )
+    connection.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+
+
+def _move_grants(connection: Connection) -> None:
+    connection.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_old"))
+    connection.execute(text(f"DROP TABLE {TABLE}_old CASCADE"))
+
+
+def partition_table(connection: Connection, now: float, days_ahead: int) -> None:
+    """
+    Converts persistent_grants to a partitioned table. Grants expiring
+    before today go to a history partition dropped by the next maintenance.
+    """
+    _rebuild_table(connection, "PARTITION BY RANGE (expiration)")
+    connection.execute(
+        text(
+            f"CREATE TABLE {HISTORY_PARTITION} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM (MINVALUE) TO ({get_day_start(now)})"
+        )
+    )
+    connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    create_partitions(connection, now, days_ahead)
+    _move_grants(connection)
+    _add_constraints(connection, partitioned=True)
+
+
+def unpartition_table(connection: Connection) -> None:
+    _rebuild_table(connection, "")
+    _move_grants(connection)
+    _add_constraints(connection, partitioned=False)
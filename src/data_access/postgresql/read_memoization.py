@@ -0,0 +1,196 @@
+"""
+Memoization of the read queries of a request.
+
+The session of every request gets a memo of the results of its SELECT
+statements, so the same statement with the same parameters reaches Postgres
+once per request, whichever repository or service runs it. Sessions living
+longer than a request, e.g. in background tasks, are not memoized: they would
+not see the changes committed by others.
+The memo is dropped whenever the session may see other data: on INSERT,
+UPDATE, DELETE and textual statements, flushes, commits and rollbacks.
+Locking reads, streamed results, loads of relationships and expired
+attributes, and statements executed with memoize=False always reach Postgres.
+
+Reads of reference data, the type tables seeded by the migrations, are kept
+by every worker for reference_data_ttl seconds and shared by all its
+requests. A write to one of these tables through a memoized session drops
+them in this worker; the admin UI, which edits some of them, drops them in
+every worker through the invalidation channel.
+
+Memoized sessions also count the statements they execute, the statements
+of flushes excepted. BaseRepository.query_count reads the counter.
+"""
+from typing import Any, Hashable, Optional
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import FrozenResult, Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, loading
+from sqlalchemy.sql.util import find_tables
+
+from src.business_logic.cache.invalidation import on_invalidation
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.dyna_config import (
+    READ_MEMOIZATION_ENABLED,
+    READ_MEMOIZATION_REFERENCE_DATA_MAX_SIZE,
+    READ_MEMOIZATION_REFERENCE_DATA_TTL,
+)
+
+# Lookup tables seeded by the migrations and rarely edited in the admin UI.
+REFERENCE_TABLES = frozenset(
+    (
+        "access_token_types",
+        "api_secrets_types",
+        "code_challenge_methods",
+        "persistent_grant_types",
+        "protocol_types",
+        "refresh_token_expiration_types",
+        "refresh_token_usage_types",
+        "response_types",
+    )
+)
+
+REFERENCE_DATA = "reference-data"
+
+# session.info keys of the memo and the number of statements sent.
+READ_MEMO = "read_memo"
+QUERY_COUNT = "query_count"
+
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Statements a request sent to PostgreSQL, memoized reads excluded.",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+
+reference_data_cache: TTLCache[FrozenResult] = TTLCache(
+    max_size=READ_MEMOIZATION_REFERENCE_DATA_MAX_SIZE,
+    ttl=READ_MEMOIZATION_REFERENCE_DATA_TTL,
+)
+
+
+def _invalidate_reference_data(key: str) -> None:
+    reference_data_cache.clear()
+
+
+on_invalidation(REFERENCE_DATA, _invalidate_reference_data)
+
+
+def memoize_reads(session: AsyncSession) -> None:
+    """Memoizes the reads of session, once per session."""
+    if not READ_MEMOIZATION_ENABLED or READ_MEMO in session.info:
+        return
+    session.info[READ_MEMO] = {}
+    session.info.setdefault(QUERY_COUNT, 0)
+    sync_session = session.sync_session
+    event.listen(sync_session, "do_orm_execute", _do_orm_execute)
+    for event_name in (
+        "after_flush",
+        "after_commit",
+        "after_rollback",
+        "after_soft_rollback",
+    ):
+        event.listen(sync_session, event_name, _forget_reads)
+
+
+def get_query_count(session: AsyncSession) -> int:
+    """
+    Returns the number of statements session sent to Postgres since its
+    reads are memoized, or 0 if they are not.
+    """
+    return session.info.get(QUERY_COUNT, 0)
+
+
+def observe_query_count(session: AsyncSession) -> None:
+    """Records the statements of a finished request at /metrics."""
+    if READ_MEMO in session.info:
+        QUERIES_PER_REQUEST.observe(get_query_count(session))
+
+
+def _forget_reads(sync_session: Session, *args: Any) -> None:
+    sync_session.info[READ_MEMO].clear()
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> Optional[Result]:
+    info = orm_execute_state.session.info
+    if not orm_execute_state.is_select:
+        info[READ_MEMO].clear()
+        if _get_table_names(orm_execute_state) & REFERENCE_TABLES:
+            reference_data_cache.clear()
+        return _count(orm_execute_state)
+
+    key = _get_memo_key(orm_execute_state)
+    if key is None:
+        return _count(orm_execute_state)
+
+    frozen_result = info[READ_MEMO].get(key)
+    if frozen_result is not None:
+        return frozen_result()
+
+    table_names = _get_table_names(orm_execute_state)
+    if table_names and table_names <= REFERENCE_TABLES:
+        frozen_result = reference_data_cache.get(key)
+        if frozen_result is None:
+            frozen_result = _count(orm_execute_state).freeze()
+            reference_data_cache.set(key, frozen_result)
+        if orm_execute_state.is_orm_statement:
+            # The objects of another session are copied into this one.
+            frozen_result = loading.merge_frozen_result(
+                orm_execute_state.session,
+                orm_execute_state.statement,
+                frozen_result,
+                load=False,
+            )
+    else:
+        frozen_result = _count(orm_execute_state).freeze()
+    info[READ_MEMO][key] = frozen_result
+    return frozen_result()
+
+
+def _count(orm_execute_state: ORMExecuteState) -> Result:
+    orm_execute_state.session.info[QUERY_COUNT] += 1
+    return orm_execute_state.invoke_statement()
+
+
+def _get_memo_key(orm_execute_state: ORMExecuteState) -> Optional[Hashable]:
+    """
+    Returns the statement and its parameters, or None if the result must not
+    be reused.
+    """
+    statement = orm_execute_state.statement
+    execution_options = orm_execute_state.execution_options
+    if (
+        orm_execute_state.is_relationship_load
+        or orm_execute_state.is_column_load
+        or getattr(statement, "_for_update_arg", None) is not None
+        or not execution_options.get("memoize", True)
+        or execution_options.get("stream_results")
+        or execution_options.get("populate_existing")
+        or execution_options.get("yield_per")
+    ):
+        return None
+    cache_key = statement._generate_cache_key()
+    if cache_key is None:
+        return None
+    parameters = orm_execute_state.parameters or {}
+    if cache_key.bindparams:
+        values = tuple(
+            parameters.get(bindparam.key, bindparam.effective_value)
+            for bindparam in cache_key.bindparams
+        )
+    else:
+        values = tuple(parameters[name] for name in sorted(parameters))
+    # repr() as IN lists are not hashable.
+    return cache_key.key, repr(values)
+
+
+def _get_table_names(orm_execute_state: ORMExecuteState) -> frozenset[str]:
+    return frozenset(
+        table.name
+        for table in find_tables(
+            orm_execute_state.statement,
+            check_columns=True,
+            include_crud=True,
+        )
+        if hasattr(table, "name")
+    )
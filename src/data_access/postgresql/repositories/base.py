@@ -2,9 +2,14 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from src.data_access.postgresql.read_memoization import get_query_count
+
+
 class BaseRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
-        
-
 
+    @property
+    def query_count(self) -> int:
+        """Statements sent to Postgres by the session of the request so far."""
+        return get_query_count(self.session)
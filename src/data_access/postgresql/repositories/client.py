@@ -1,9 +1,14 @@
 from typing import List
 from sqlalchemy import exists, select, insert, update, delete, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import noload, selectinload, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from src.business_logic.cache.client_snapshot import (
+    ClientSnapshot,
+    client_snapshot_cache,
+)
+
 from src.data_access.postgresql.errors.client import (
     ClientNotFoundError,
     ClientPostLogoutRedirectUriError,
@@ -175,6 +180,10 @@ class ClientRepository(BaseRepository):
 
     async def list_all_scopes_by_client(self, client_id: str) -> List[str]:
         client = await self.get_client_by_client_id(client_id)
+        return self._get_scope_names(client)
+
+    @staticmethod
+    def _get_scope_names(client: Client) -> List[str]:
         result = []
         for scope in client.scope:
             if scope.scope.name == 'userinfo':
@@ -183,6 +192,57 @@ class ClientRepository(BaseRepository):
                 result.append(f'{scope.resource.name}:{scope.scope.name}:{scope.claim}')
         return result
 
+    async def get_client_snapshot(self, client_id: str) -> Optional[ClientSnapshot]:
+        """
+        Returns the cached configuration of the client, loading it on a miss.
+        Unknown clients are not cached.
+        """
+        snapshot = client_snapshot_cache.get(client_id)
+        if snapshot is not None:
+            return snapshot
+
+        result = await self.session.execute(
+            select(Client)
+            .where(Client.client_id == client_id)
+            .options(
+                noload(Client.secrets),
+                noload(Client.cors_origins),
+                noload(Client.id_restrictions),
+                selectinload(Client.redirect_uris),
+                selectinload(Client.post_logout_redirect_uris),
+                selectinload(Client.response_types),
+                selectinload(Client.scope).options(
+                    selectinload(ClientScope.resource),
+                    selectinload(ClientScope.scope),
+                    selectinload(ClientScope.claim),
+                ),
+            )
+        )
+        client = result.scalar()
+        if client is None:
+            return None
+
+        snapshot = ClientSnapshot(
+            id=client.id,
+            client_id=client.client_id,
+            enabled=client.enabled,
+            signing_algorithm=client.signing_algorithm,
+            authorization_code_lifetime=client.authorization_code_lifetime,
+            device_code_lifetime=client.device_code_lifetime,
+            require_pkce=client.require_pkce,
+            redirect_uris=[uri.redirect_uri for uri in client.redirect_uris],
+            post_logout_redirect_uris=[
+                uri.post_logout_redirect_uri
+                for uri in client.post_logout_redirect_uris
+            ],
+            scopes=self._get_scope_names(client),
+            response_types=[
+                response_type.type for response_type in client.response_types
+            ],
+        )
+        client_snapshot_cache.set(client_id, snapshot)
+        return snapshot
+
     async def exists(self, client_id: str) -> bool:
         result = await self.session.execute(
             select(Client)
@@ -208,6 +268,14 @@ class ClientRepository(BaseRepository):
         )
         return result.scalar()
 
+    async def get_signing_algorithm_by_client(self, client_id: str) -> str:
+        result = await self.session.execute(
+            select(Client.signing_algorithm).where(
+                Client.client_id == client_id
+            )
+        )
+        return result.scalar()
+
     async def create(
         self, 
         params: dict[str:Any],
@@ -1,8 +1,23 @@
 import logging
+import time
 import uuid
 
 from fastapi import status
-from sqlalchemy import delete, exists, insert, select, extract, func, text
+from sqlalchemy import (
+    Integer,
+    LargeBinary,
+    String,
+    cast,
+    delete,
+    exists,
+    insert,
+    select,
+    extract,
+    func,
+    text,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing import Optional
@@ -15,14 +30,27 @@ from src.data_access.postgresql.tables import (
     PersistentGrant,
     PersistentGrantType,
     Client,
+    User,
 )
+from src.data_access.postgresql.tables.persistent_grant import get_grant_data_digest
+from src.dyna_config import PERSISTENT_GRANTS_PARTITIONED
 from sqlalchemy.engine.result import ChunkedIteratorResult
 
 logger = logging.getLogger(__name__)
 
 
 class PersistentGrantRepository(BaseRepository):
-   
+
+    @staticmethod
+    def _live_partitions() -> tuple:
+        """
+        Criteria restricting a lookup to the partitions of unexpired grants
+        when persistent_grants is partitioned by expiration.
+        """
+        if PERSISTENT_GRANTS_PARTITIONED:
+            return (PersistentGrant.expiration > int(time.time()),)
+        return ()
+
     async def create(
         self,
         client_id: str,
@@ -39,6 +67,7 @@ class PersistentGrantRepository(BaseRepository):
             "key": unique_key,
             "client_id": client_id_int,
             "grant_data": grant_data,
+            "grant_data_digest": get_grant_data_digest(grant_data),
             "expiration": expiration_time,
             "user_id": user_id,
             "persistent_grant_type_id": grant_type_id,
@@ -68,7 +97,8 @@ class PersistentGrantRepository(BaseRepository):
             )
             .where(
                 PersistentGrantType.type_of_grant == grant_type,
-                PersistentGrant.grant_data == grant_data,
+                PersistentGrant.grant_data_digest == get_grant_data_digest(grant_data),
+                *self._live_partitions(),
             )
         )
 
@@ -82,7 +112,8 @@ class PersistentGrantRepository(BaseRepository):
             .join(Client, PersistentGrant.client_id == Client.id)
             .where(
                 PersistentGrant.persistent_grant_type_id == grant_type_id,
-                PersistentGrant.grant_data == grant_data,
+                PersistentGrant.grant_data_digest == get_grant_data_digest(grant_data),
+                *self._live_partitions(),
             )
         )
         result = result.first()[0]
@@ -143,7 +174,8 @@ class PersistentGrantRepository(BaseRepository):
     async def get_client_id_by_data(self, grant_data: str) -> int:
         client_id = await self.session.execute(
             select(PersistentGrant.client_id).where(
-                PersistentGrant.grant_data == grant_data
+                PersistentGrant.grant_data_digest == get_grant_data_digest(grant_data),
+                *self._live_partitions(),
             )
         )
         client_id = client_id.first()
@@ -192,9 +224,10 @@ class PersistentGrantRepository(BaseRepository):
         query = (select(PersistentGrant)
                  .join(Client, PersistentGrant.client_id == Client.id)
                  .join(PersistentGrantType, PersistentGrant.persistent_grant_type_id == PersistentGrantType.id)
-                 .where(PersistentGrant.grant_data == authorization_code,
+                 .where(PersistentGrant.grant_data_digest == get_grant_data_digest(authorization_code),
                         Client.client_id == client_id,
-                        PersistentGrantType.type_of_grant == grant_type)
+                        PersistentGrantType.type_of_grant == grant_type,
+                        *self._live_partitions())
                 .exists().select()
                 )
         result = await self.session.execute(query)
@@ -214,6 +247,7 @@ class PersistentGrantRepository(BaseRepository):
                 key=str(uuid.uuid4()),
                 client_id=client_id,
                 grant_data=grant_data,
+                grant_data_digest=get_grant_data_digest(grant_data),
                 expiration=expiration_time,
                 user_id=user_id,
                 persistent_grant_type_id=grant_type_id,
@@ -221,6 +255,120 @@ class PersistentGrantRepository(BaseRepository):
             )
         )
 
+    async def redeem_authorization_code(
+            self,
+            authorization_code: str,
+            client_id: str,
+            refresh_token: str,
+            refresh_expiration_time: int,
+            grant_type: str = "authorization_code",
+    ) -> Optional[Row]:
+        """
+        Consumes an unexpired code issued to client_id and stores the refresh
+        grant replacing it, in a single statement.
+
+        The refresh grant gets the scope of the code with client_id appended.
+        Returns a row with user_id and scope of the consumed code, or None
+        if there is no such code. The deleted row stays locked until commit,
+        so a concurrent redemption of the same code finds nothing.
+        """
+        # Core DELETE: the ORM-enabled one drops the INSERT CTE when compiled.
+        consumed = (
+            delete(PersistentGrant.__table__)
+            .where(
+                PersistentGrant.grant_data_digest == get_grant_data_digest(authorization_code),
+                PersistentGrant.client_id == Client.id,
+                Client.client_id == client_id,
+                PersistentGrant.persistent_grant_type_id == PersistentGrantType.id,
+                PersistentGrantType.type_of_grant == grant_type,
+                PersistentGrant.expiration > func.extract("epoch", func.now()),
+                *self._live_partitions(),
+            )
+            .returning(
+                PersistentGrant.client_id,
+                PersistentGrant.user_id,
+                PersistentGrant.scope,
+            )
+            .cte("consumed")
+        )
+        refresh_type_id = (
+            select(PersistentGrantType.id)
+            .where(PersistentGrantType.type_of_grant == "refresh_token")
+            .limit(1)
+            .scalar_subquery()
+        )
+        created = (
+            insert(PersistentGrant)
+            .from_select(
+                [
+                    "key",
+                    "client_id",
+                    "grant_data",
+                    "grant_data_digest",
+                    "expiration",
+                    "user_id",
+                    "persistent_grant_type_id",
+                    "scope",
+                ],
+                select(
+                    cast(str(uuid.uuid4()), String),
+                    consumed.c.client_id,
+                    cast(refresh_token, String),
+                    cast(get_grant_data_digest(refresh_token), LargeBinary),
+                    cast(refresh_expiration_time, Integer),
+                    consumed.c.user_id,
+                    refresh_type_id,
+                    consumed.c.scope + f" {client_id}",
+                ),
+            )
+            .returning(PersistentGrant.id)
+            .cte("created")
+        )
+        result = await self.session.execute(
+            select(consumed.c.user_id, consumed.c.scope).add_cte(created)
+        )
+        return result.first()
+
+    async def create_refresh_grant(
+            self,
+            client_id: str,
+            refresh_token: str,
+            refresh_expiration_time: int,
+            user_id: int,
+            scope: str,
+    ) -> None:
+        """
+        Stores the refresh grant of a code redeemed from an authorization
+        code store, like redeem_authorization_code does, in a single statement.
+        """
+        await self.session.execute(
+            insert(PersistentGrant).from_select(
+                [
+                    "key",
+                    "client_id",
+                    "grant_data",
+                    "grant_data_digest",
+                    "expiration",
+                    "user_id",
+                    "persistent_grant_type_id",
+                    "scope",
+                ],
+                select(
+                    cast(str(uuid.uuid4()), String),
+                    Client.id,
+                    cast(refresh_token, String),
+                    cast(get_grant_data_digest(refresh_token), LargeBinary),
+                    cast(refresh_expiration_time, Integer),
+                    cast(user_id, Integer),
+                    PersistentGrantType.id,
+                    cast(f"{scope} {client_id}", String),
+                ).where(
+                    Client.client_id == client_id,
+                    PersistentGrantType.type_of_grant == "refresh_token",
+                ),
+            )
+        )
+
     async def delete_grant(self, grant: PersistentGrant) -> None:
         await self.session.delete(grant)
 
@@ -228,10 +376,71 @@ class PersistentGrantRepository(BaseRepository):
         result = await self.session.execute(
             select(PersistentGrant)
             .join(PersistentGrantType, PersistentGrant.persistent_grant_type_id == PersistentGrantType.id)
-            .where(PersistentGrant.grant_data == grant_data, PersistentGrantType.type_of_grant == grant_type)
+            .where(PersistentGrant.grant_data_digest == get_grant_data_digest(grant_data), PersistentGrantType.type_of_grant == grant_type, *self._live_partitions())
         )
         return result.scalar()
- 
+
+    def _grant_summary_query(self) -> Select:
+        return (
+            select(
+                PersistentGrant.grant_data_digest,
+                PersistentGrantType.type_of_grant,
+                Client.client_id,
+                PersistentGrant.user_id,
+                User.username,
+                PersistentGrant.scope,
+                PersistentGrant.expiration,
+            )
+            .join(PersistentGrantType, PersistentGrant.persistent_grant_type_id == PersistentGrantType.id)
+            .join(Client, PersistentGrant.client_id == Client.id)
+            .join(User, PersistentGrant.user_id == User.id, isouter=True)
+            .where(*self._live_partitions())
+            # The same grant data may exist under several types, pick them
+            # in the same order whether looked up alone or in a batch.
+            .order_by(PersistentGrant.persistent_grant_type_id)
+        )
+
+    async def get_grant_summary(
+        self, grant_data: str, grant_type: Optional[str] = None
+    ) -> Optional[Row]:
+        """
+        Looks a grant up by its data alone, or of grant_type only if given,
+        together with what introspection reports about it, in one query.
+
+        Returns:
+            The row (grant_data_digest, type_of_grant, client_id, user_id,
+            username, scope, expiration), or None if there is no such grant.
+        """
+        query = self._grant_summary_query().where(
+            PersistentGrant.grant_data_digest == get_grant_data_digest(grant_data)
+        )
+        if grant_type is not None:
+            query = query.where(PersistentGrantType.type_of_grant == grant_type)
+        result = await self.session.execute(query)
+        return result.first()
+
+    async def get_grant_summaries(
+        self, grants_data: list[str]
+    ) -> dict[tuple[str, str], Row]:
+        """
+        Looks up the grants of many tokens with one IN query.
+
+        Returns:
+            The rows of get_grant_summary by the grant data and the type of
+            grant they were found for, in the order get_grant_summary picks
+            them; grant data without a grant is left out.
+        """
+        by_digest = {get_grant_data_digest(grant_data): grant_data for grant_data in grants_data}
+        result = await self.session.execute(
+            self._grant_summary_query().where(
+                PersistentGrant.grant_data_digest.in_(by_digest)
+            )
+        )
+        return {
+            (by_digest[row.grant_data_digest], row.type_of_grant): row
+            for row in result.all()
+        }
+
     async def delete_expired(self) -> None:
         grants_to_delete = await self.session.execute(
             select(PersistentGrant)
@@ -100,5 +100,38 @@ class ResourcesRepository(BaseRepository):
                     result.append(scope_claim.scope_claim_type.scope_claim_type)
                 return result
 
+    async def get_all_scope_claims(self, resource_name: str) -> dict[str, list[str]]:
+        """
+        Returns the claim types of every scope of the resource by scope name,
+        read in one query.
+        """
+        result = await self.session.execute(
+            select(
+                res.ApiScope.id,
+                res.ApiScope.name,
+                res.ApiScopeClaimType.scope_claim_type,
+            )
+            .join(res.ApiResource, res.ApiScope.api_resources_id == res.ApiResource.id)
+            .outerjoin(res.ApiScopeClaim, res.ApiScopeClaim.api_scopes_id == res.ApiScope.id)
+            .outerjoin(
+                res.ApiScopeClaimType,
+                res.ApiScopeClaim.scope_claim_type_id == res.ApiScopeClaimType.id,
+            )
+            .where(res.ApiResource.name == resource_name)
+            .order_by(res.ApiScope.id, res.ApiScopeClaim.id)
+        )
+        scope_claims: dict[str, list[str]] = {}
+        scope_ids: dict[str, int] = {}
+        for scope_id, scope_name, claim_type in result:
+            # Like get_scope_claims, the first scope wins if names repeat.
+            if scope_ids.setdefault(scope_name, scope_id) != scope_id:
+                continue
+            claim_types = scope_claims.setdefault(scope_name, [])
+            if claim_type is not None:
+                claim_types.append(claim_type)
+        if not scope_claims and not await self.exists_by_name(resource_name):
+            raise err.ResourceNotFoundError(resource_name)
+        return scope_claims
+
     def __repr__(self) -> str:  # pragma: no cover
         return "Resorces Related repository"
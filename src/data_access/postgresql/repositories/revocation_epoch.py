@@ -0,0 +1,45 @@
+from typing import Iterable
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from src.data_access.postgresql.repositories.base import BaseRepository
+from src.data_access.postgresql.tables import RevocationEpoch
+
+
+class RevocationEpochRepository(BaseRepository):
+
+    async def set_epoch(self, kind: str, subject: str, revoked_before: int) -> None:
+        """Moves the epoch of the subject forward, never back."""
+        statement = insert(RevocationEpoch).values(
+            kind=kind, subject=subject, revoked_before=revoked_before
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[RevocationEpoch.kind, RevocationEpoch.subject],
+                set_={
+                    "revoked_before": func.greatest(
+                        RevocationEpoch.revoked_before,
+                        statement.excluded.revoked_before,
+                    ),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def get_epochs(
+        self, subjects: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Returns the epochs of the (kind, subject) pairs that have one."""
+        result = await self.session.execute(
+            select(
+                RevocationEpoch.kind,
+                RevocationEpoch.subject,
+                RevocationEpoch.revoked_before,
+            ).where(
+                tuple_(RevocationEpoch.kind, RevocationEpoch.subject).in_(
+                    list(subjects)
+                )
+            )
+        )
+        return {(kind, subject): epoch for kind, subject, epoch in result}
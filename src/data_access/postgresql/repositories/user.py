@@ -1,8 +1,10 @@
 from typing import Any, Dict, Optional, Tuple, Union
 
 from sqlalchemy import exc, exists, insert, select, update, delete
+from sqlalchemy.engine import Row
 from sqlalchemy.engine.result import ChunkedIteratorResult
 
+from src.business_logic.cache.user_claims import invalidate_user_claims_on_commit
 from src.data_access.postgresql.errors.user import (
     ClaimsNotFoundError,
     UserNotFoundError,
@@ -68,6 +70,7 @@ class UserRepository(BaseRepository):
         if await self.exists(user_id=user_id):
             user_to_delete = await self.get_user_by_id(user_id=user_id)
             await self.session.delete(user_to_delete)
+            invalidate_user_claims_on_commit(self.session, user_id)
         else:
             raise ValueError
 
@@ -122,6 +125,8 @@ class UserRepository(BaseRepository):
 
     async def add_claims(self, claims: list[dict[str, Any]]) -> Dict[str, Any]:
         await self.session.execute(insert(UserClaim).values(claims))
+        for user_id in {claim["user_id"] for claim in claims}:
+            invalidate_user_claims_on_commit(self.session, user_id)
 
     async def request_DB_for_claims(self, sub: int) -> ChunkedIteratorResult:
         result = await self.session.execute(
@@ -137,6 +142,12 @@ class UserRepository(BaseRepository):
         result = result[0].username
         return result
 
+    async def get_usernames_by_ids(self, ids: list[int]) -> dict[int, str]:
+        result = await self.session.execute(
+            select(User.id, User.username).where(User.id.in_(ids))
+        )
+        return {user_id: username for user_id, username in result.all()}
+
     async def get_user_by_username(self, username: str) -> User:
         try:
             user = await self.session.execute(
@@ -224,6 +235,7 @@ class UserRepository(BaseRepository):
         if await self.exists(user_id=user_id):
             updates = update(User).values(**kwargs).where(User.id == user_id)
             await self.session.execute(updates)
+            invalidate_user_claims_on_commit(self.session, user_id)
         else:
             raise ValueError
 
@@ -390,6 +402,18 @@ class UserRepository(BaseRepository):
         else:
             raise ValueError
 
+    async def update_password_hash(self, username: str, password: str) -> None:
+        """Replaces the stored hash of the user's password, e.g. after a cost change."""
+        await self.session.execute(
+            update(UserPassword)
+            .values(value=password)
+            .where(
+                UserPassword.id == select(User.password_hash_id)
+                .where(User.username == username)
+                .scalar_subquery()
+            )
+        )
+
     async def validate_user_by_username(self, username: str) -> bool:
         result = await self.session.execute(
             select(exists().where(User.username == username))
@@ -405,6 +429,26 @@ class UserRepository(BaseRepository):
         )
         return result.scalar()
 
+    async def get_user_credentials(self, username: str) -> Optional[Row]:
+        """
+        Returns the id, username and password_hash of the user in one query,
+        or None if the user does not exist.
+        """
+        result = await self.session.execute(
+            select(
+                User.id,
+                User.username,
+                UserPassword.value.label("password_hash"),
+            )
+            .join(
+                UserPassword,
+                User.password_hash_id == UserPassword.id,
+                isouter=True,
+            )
+            .where(User.username == username)
+        )
+        return result.first()
+
     async def get_user_id_by_username(self, username: str) -> int:
         result = await self.session.execute(
             select(User.id).where(User.username == username)
@@ -42,7 +42,9 @@ from .identity_resource import IdentityClaim, IdentityResource, IdentityProvider
 from .group import Group, Permission
 from .device import Device
 from .blacklisted_token import BlacklistedToken
+from .revocation_epoch import RevocationEpoch
 from .code_challenge import CodeChallenge, CodeChallengeMethod
+from .signing_key import SigningKey
 
 __all__ = [
     Client,
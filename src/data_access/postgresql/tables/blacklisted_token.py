@@ -6,7 +6,7 @@ class BlacklistedToken(BaseModel):
     __tablename__ = "blacklisted_tokens"
     
     token = Column(String(1024), nullable=False)
-    expiration = Column(Integer, nullable=False)
+    expiration = Column(Integer, nullable=False, index=True)
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.token} | {self.expiration}"
@@ -88,6 +88,8 @@ class Client(BaseModel):
     logout_session_required = Column(Boolean, default=False, nullable=False)
     logout_uri = Column(String, default="*enter_here*", nullable=False)
     token_endpoint_auth_method = Column(String, default="client_secret_post", nullable=False)
+    # JWS algorithm of the tokens issued to the client: RS256, ES256 or EdDSA.
+    signing_algorithm = Column(String(10), default="RS256", server_default="RS256", nullable=False)
     prefix_client_claims = Column(
         String,
         default="*enter_here*",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -20,6 +20,8 @@ class CodeChallenge(BaseModel):
         lazy='joined'
     )
 
+    __table_args__ = (Index("ix_code_challenges_created_at", "created_at"),)
+
     def __str__(self) -> str:  # pragma: no cover
         return f"CodeChallenge: {self.code_challenge} ({self.code_challenge_method}) for client {self.client_id}"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -21,5 +21,12 @@ class Device(BaseModel):
     expires_in = Column(Integer, default=600, nullable=False)
     interval = Column(Integer, default=5, nullable=False)
 
+    __table_args__ = (
+        Index(
+            "ix_devices_expires_at",
+            text("(created_at + expires_in * interval '1 second')"),
+        ),
+    )
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Device: {self.device_code}"
@@ -3,6 +3,7 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
@@ -107,5 +108,9 @@ class IdentityProviderState(BaseModel):
 
     state = Column(String, nullable=False, unique=True)
 
+    __table_args__ = (
+        Index("ix_identity_provider_states_created_at", "created_at"),
+    )
+
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.state}"
@@ -1,10 +1,15 @@
+import hashlib
+from typing import Any
+
 from sqlalchemy import (
     Column,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from .client import clients_grant_types
 from .base import Base, BaseModel
 
@@ -16,6 +21,15 @@ LIFESPAN_OF_TOKEN = 999
 TYPES_OF_GRANTS = ["authorization_code", "refresh_token"]
 
 
+def get_grant_data_digest(grant_data: str) -> bytes:
+    """SHA-256 of grant_data, the indexed key grants are looked up by."""
+    return hashlib.sha256(grant_data.encode()).digest()
+
+
+def _grant_data_digest_default(context: Any) -> bytes:
+    return get_grant_data_digest(context.get_current_parameters()["grant_data"])
+
+
 class PersistentGrant(BaseModel):
     __tablename__ = "persistent_grants"
 
@@ -29,7 +43,12 @@ class PersistentGrant(BaseModel):
         lazy = 'immediate'
     )
     grant_data = Column(String, nullable=False)
-    expiration = Column(Integer, nullable=False)
+    grant_data_digest = Column(
+        LargeBinary(32),
+        default=_grant_data_digest_default,
+        nullable=False,
+    )
+    expiration = Column(Integer, nullable=False, index=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -49,6 +68,19 @@ class PersistentGrant(BaseModel):
     )
     scope = Column(String, default = "openid", nullable=True)
 
+    __table_args__ = (
+        Index(
+            "ix_persistent_grants_grant_data_digest_type",
+            "grant_data_digest",
+            "persistent_grant_type_id",
+        ),
+    )
+
+    @validates("grant_data")
+    def _set_grant_data_digest(self, key: str, grant_data: str) -> str:
+        self.grant_data_digest = get_grant_data_digest(grant_data)
+        return grant_data
+
     def __str__(self) -> str:  # pragma: no cover
         return f":{self.expiration}"
 
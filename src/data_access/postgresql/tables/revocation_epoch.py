@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+from .base import BaseModel
+
+
+class RevocationEpoch(BaseModel):
+    """
+    Tokens of a subject issued before revoked_before are revoked.
+    The subject is a user (kind "sub") or a client (kind "client").
+    """
+
+    __tablename__ = "revocation_epochs"
+
+    kind = Column(String(16), nullable=False)
+    subject = Column(String, nullable=False)
+    revoked_before = Column(Integer, nullable=False)
+
+    __table_args__ = (UniqueConstraint("kind", "subject"),)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind}:{self.subject} | {self.revoked_before}"
@@ -0,0 +1,14 @@
+from sqlalchemy import Boolean, Column, String
+
+from .base import BaseModel
+
+
+class SigningKey(BaseModel):
+    __tablename__ = "signing_keys"
+
+    kid = Column(String(64), unique=True, nullable=False)
+    private_key = Column(String, nullable=False)
+    active = Column(Boolean, default=True, nullable=False)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"SigningKey: {self.kid}"
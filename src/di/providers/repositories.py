@@ -14,6 +14,10 @@ from src.data_access.postgresql.repositories import (
 
 )
 from src.data_access.postgresql.repositories.base import BaseRepository
+from src.data_access.postgresql.read_memoization import (
+    memoize_reads,
+    observe_query_count,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -77,7 +81,10 @@ class ProviderSession:
 
     async def __call__(self) -> Generator[AsyncSession, None, None]:
         async with self._session_factory() as session:
+            memoize_reads(session)
             try:
                 yield session
             except:
                 await session.close()
+            finally:
+                observe_query_count(session)
@@ -12,6 +12,8 @@ from src.business_logic.services.authorization.authorization_service import (
 from src.business_logic.services.third_party_oidc_service import (
     AuthThirdPartyOIDCService,
 )
+from src.business_logic.cache.device_codes import get_device_code_store
+from src.business_logic.cache.sso_sessions import get_sso_session_store
 from src.business_logic.services.device_auth import DeviceService
 from src.business_logic.services.endsession import EndSessionService
 from src.business_logic.services.introspection import IntrospectionService
@@ -42,6 +44,7 @@ from src.data_access.postgresql.repositories import (
     UserRepository,
     WellKnownRepository,
     CodeChallengeRepository,
+    RevocationEpochRepository,
 )
 
 
@@ -71,13 +74,16 @@ def provide_endsession_service(
     session: AsyncSession,
     client_repo: ClientRepository,
     persistent_grant_repo: PersistentGrantRepository,
+    revocation_epoch_repo: RevocationEpochRepository,
     jwt_service: JWTService,
 ) -> EndSessionService:
     return EndSessionService(
         session=session,
         client_repo=client_repo,
         persistent_grant_repo=persistent_grant_repo,
+        revocation_epoch_repo=revocation_epoch_repo,
         jwt_service=jwt_service,
+        sso_session_store=get_sso_session_store(),
     )
 
 
@@ -200,7 +206,10 @@ def provide_device_service(
     session: AsyncSession,
 ) -> DeviceService:
     return DeviceService(
-        session=session, client_repo=client_repo, device_repo=device_repo
+        session=session,
+        client_repo=client_repo,
+        device_repo=device_repo,
+        device_store=get_device_code_store(),
     )
 
 
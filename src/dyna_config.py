@@ -17,6 +17,10 @@ settings = Dynaconf(
 
 DB_URL = settings.db.get("url")
 DB_MAX_CONNECTION_COUNT = settings.db.get("max_connection_count")
+DB_POOL_OVERFLOW = settings.db.get("pool_overflow")
+DB_POOL_TIMEOUT = settings.db.get("pool_timeout")
+DB_POOL_RECYCLE = settings.db.get("pool_recycle")
+DB_POOL_PRE_PING = settings.db.get("pool_pre_ping")
 # DB_PORT = settings.db.get("port")
 
 
@@ -30,6 +34,73 @@ REDIS_HOST = settings.redis.get("host")
 REDIS_PORT = settings.redis.get("port")
 REDIS_URL = f"{REDIS_SCHEME}{REDIS_HOST}:{REDIS_PORT}"
 
+KEYSTORE_BACKEND = settings.keystore.get("backend")
+KEYSTORE_PATH = settings.keystore.get("path")
+
+AUTHORIZATION_CODES_BACKEND = settings.authorization_codes.get("backend")
+AUTHORIZATION_CODES_MEMORY_MAX_SIZE = settings.authorization_codes.get(
+    "memory_max_size"
+)
+
+DEVICE_CODES_BACKEND = settings.device_codes.get("backend")
+DEVICE_CODES_INTERVAL = settings.device_codes.get("interval")
+DEVICE_CODES_MEMORY_MAX_SIZE = settings.device_codes.get("memory_max_size")
+
+SSO_SESSION_BACKEND = settings.sso_session.get("backend")
+SSO_SESSION_LIFETIME = settings.sso_session.get("lifetime")
+SSO_SESSION_COOKIE_NAME = settings.sso_session.get("cookie_name")
+SSO_SESSION_COOKIE_SECURE = settings.sso_session.get("cookie_secure")
+SSO_SESSION_MEMORY_MAX_SIZE = settings.sso_session.get("memory_max_size")
+
+READ_MEMOIZATION_ENABLED = settings.read_memoization.get("enabled")
+READ_MEMOIZATION_REFERENCE_DATA_TTL = settings.read_memoization.get(
+    "reference_data_ttl"
+)
+READ_MEMOIZATION_REFERENCE_DATA_MAX_SIZE = settings.read_memoization.get(
+    "reference_data_max_size"
+)
+
+JWT_SIGNING_EXECUTOR = settings.jwt_signing.get("executor")
+JWT_SIGNING_MAX_WORKERS = settings.jwt_signing.get("max_workers")
+JWT_SIGNING_MAX_QUEUE = settings.jwt_signing.get("max_queue")
+
+PASSWORD_BCRYPT_ROUNDS = settings.password.get("bcrypt_rounds")
+PASSWORD_HASHING_THREADS = settings.password.get("hashing_threads")
+
+CLIENT_CACHE_TTL = settings.client_cache.get("ttl")
+CLIENT_CACHE_MAX_SIZE = settings.client_cache.get("max_size")
+
+USER_CLAIMS_CACHE_TTL = settings.user_claims_cache.get("ttl")
+USER_CLAIMS_CACHE_MAX_SIZE = settings.user_claims_cache.get("max_size")
+
+WELL_KNOWN_MAX_AGE = settings.well_known.get("max_age")
+
+INTROSPECTION_BATCH_MAX_SIZE = settings.introspection.get("batch_max_size")
+INTROSPECTION_CACHE_TTL = settings.introspection.get("cache_ttl")
+INTROSPECTION_CACHE_MAX_SIZE = settings.introspection.get("cache_max_size")
+
+REVOCATION_CAPACITY = settings.revocation.get("capacity")
+REVOCATION_ERROR_RATE = settings.revocation.get("error_rate")
+REVOCATION_EPOCH_CACHE_TTL = settings.revocation.get("epoch_cache_ttl")
+REVOCATION_EPOCH_CACHE_MAX_SIZE = settings.revocation.get("epoch_cache_max_size")
+REVOCATION_EPOCH_TTL = settings.revocation.get("epoch_ttl")
+
+REAPER_BATCH_SIZE = settings.reaper.get("batch_size")
+REAPER_PAUSE = settings.reaper.get("pause")
+REAPER_MAX_BATCHES = settings.reaper.get("max_batches")
+REAPER_MIN_INTERVAL = settings.reaper.get("min_interval")
+REAPER_MAX_INTERVAL = settings.reaper.get("max_interval")
+REAPER_CODE_CHALLENGE_LIFETIME = settings.reaper.get("code_challenge_lifetime")
+REAPER_IDENTITY_PROVIDER_STATE_LIFETIME = settings.reaper.get(
+    "identity_provider_state_lifetime"
+)
+REAPER_METRICS_PORT = settings.reaper.get("metrics_port")
+
+PERSISTENT_GRANTS_PARTITIONED = settings.persistent_grants.get("partitioned")
+PERSISTENT_GRANTS_PARTITIONS_AHEAD = settings.persistent_grants.get(
+    "partitions_ahead"
+)
+
 CELERY_CLEANER_CRONE = crontab(
         **json.loads(
             settings.celery.get("db_cleaner_crone")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from logging.config import dictConfig
 from typing import Optional, Any
@@ -5,7 +6,6 @@ from fastapi import FastAPI
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi.staticfiles import StaticFiles
-from redis import asyncio as aioredis
 from starlette.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
@@ -18,7 +18,6 @@ from src.di import Container
 from src.dyna_config import (
     DB_MAX_CONNECTION_COUNT,
     DB_URL,
-    REDIS_URL,
 )
 
 import src.presentation.admin_ui.controllers as ui
@@ -27,6 +26,11 @@ import logging
 from src.log import LOGGING_CONFIG
 from src.data_access.postgresql.repositories import UserRepository
 from src.business_logic.services.admin_auth import AdminAuthService
+from src.business_logic.jwt_manager.signing_executor import get_signing_executor
+from src.business_logic.cache.invalidation import (
+    get_redis,
+    listen_for_invalidations,
+)
 
 
 
@@ -71,13 +75,11 @@ def get_application(test: bool = False) -> NewFastApi:
 
 # TODO: move the creation of RSA keys here.
 def setup_di(app: FastAPI) -> None:
-    db_engine = prov.provide_db(
-        database_url=DB_URL, max_connection_count=DB_MAX_CONNECTION_COUNT
-    )
-
+    # One pool per process shared by the API and the admin UI.
     db = prov.provide_db_only(
         database_url=DB_URL, max_connection_count=DB_MAX_CONNECTION_COUNT
     )
+    db_engine = db.engine
     session = prov.ProviderSession(db.session_factory)
 
     app.dependency_overrides[
@@ -173,6 +175,29 @@ Instrumentator().instrument(app).expose(app)
 @app.on_event("startup")
 async def startup() -> None:
     logger.info("Creating Redis connection with DataBase.")
-    redis = aioredis.from_url(REDIS_URL, encoding="utf8", decode_responses=True)
+    redis = get_redis()
     FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
     logger.info("Created Redis connection with DataBase.")
+    app.state.invalidation_listener = asyncio.create_task(
+        listen_for_invalidations()
+    )
+
+
+@app.on_event("shutdown")
+async def stop_invalidation_listener() -> None:
+    listener = getattr(app.state, "invalidation_listener", None)
+    if listener is not None:
+        listener.cancel()
+
+
+@app.on_event("startup")
+async def start_signing_executor() -> None:
+    # Started before the first request rather than by it.
+    get_signing_executor()
+
+
+@app.on_event("shutdown")
+async def shutdown_signing_executor() -> None:
+    signing_executor = get_signing_executor()
+    if signing_executor is not None:
+        signing_executor.shutdown()
@@ -0,0 +1,24 @@
+from typing import Any, ClassVar
+
+from src.business_logic.cache.invalidation import publish_invalidation
+
+
+class InvalidatesCaches:
+    """
+    ModelView mixin invalidating invalidated_caches on all workers after
+    a record is created, edited or deleted in the admin UI.
+    """
+
+    invalidated_caches: ClassVar[tuple[str, ...]] = ()
+
+    async def after_model_change(
+        self, data: dict[str, Any], model: Any, is_created: bool
+    ) -> None:
+        await self._invalidate_caches()
+
+    async def after_model_delete(self, model: Any) -> None:
+        await self._invalidate_caches()
+
+    async def _invalidate_caches(self) -> None:
+        for topic in self.invalidated_caches:
+            await publish_invalidation(topic)
@@ -7,9 +7,14 @@ from wtforms import Form
 from src.data_access.postgresql.tables.client import *
 
 from src.data_access.postgresql.tables import ClientScope
+from src.business_logic.cache.client_snapshot import CLIENT_SNAPSHOTS
+from src.data_access.postgresql.read_memoization import REFERENCE_DATA
 
-class ClientAdminController(ModelView, model=Client):
+from .cache_invalidation import InvalidatesCaches
+
+class ClientAdminController(InvalidatesCaches, ModelView, model=Client):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (CLIENT_SNAPSHOTS,)
     column_list = [
         Client.client_id,
         Client.client_name,
@@ -92,28 +97,36 @@ class ResponseTypeAdminController(ModelView, model=ResponseType):
     ]
 
 
-class AccessTokenTypeAdminController(ModelView, model=AccessTokenType):
+class AccessTokenTypeAdminController(
+    InvalidatesCaches, ModelView, model=AccessTokenType
+):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [
         AccessTokenType.id,
         AccessTokenType.type,
     ]
 
 
-class ProtocolTypeController(ModelView, model=ProtocolType):
+class ProtocolTypeController(InvalidatesCaches, ModelView, model=ProtocolType):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [ProtocolType.id, ProtocolType.type]
 
 
-class RefreshTokenUsageTypeController(ModelView, model=RefreshTokenUsageType):
+class RefreshTokenUsageTypeController(
+    InvalidatesCaches, ModelView, model=RefreshTokenUsageType
+):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [RefreshTokenUsageType.id, RefreshTokenUsageType.type]
 
 
 class RefreshTokenExpirationTypeController(
-    ModelView, model=RefreshTokenExpirationType
+    InvalidatesCaches, ModelView, model=RefreshTokenExpirationType
 ):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [
         RefreshTokenExpirationType.id,
         RefreshTokenExpirationType.type,
@@ -131,9 +144,10 @@ class ClientClaimController(ModelView, model=ClientClaim):
 
 
 class ClientPostLogoutRedirectUriController(
-    ModelView, model=ClientPostLogoutRedirectUri
+    InvalidatesCaches, ModelView, model=ClientPostLogoutRedirectUri
 ):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (CLIENT_SNAPSHOTS,)
     column_list = [
         ClientPostLogoutRedirectUri.id,
         ClientPostLogoutRedirectUri.post_logout_redirect_uri,
@@ -146,12 +160,14 @@ class ClientCorsOriginController(ModelView, model=ClientCorsOrigin):
     column_list = [ClientCorsOrigin.id, ClientCorsOrigin.origin]
 
 
-class ClientRedirectUriController(ModelView, model=ClientRedirectUri):
+class ClientRedirectUriController(InvalidatesCaches, ModelView, model=ClientRedirectUri):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (CLIENT_SNAPSHOTS,)
     column_list = [ClientRedirectUri.id, ClientRedirectUri.redirect_uri]
 
-class ClientScopeController(ModelView, model=ClientScope):
+class ClientScopeController(InvalidatesCaches, ModelView, model=ClientScope):
     icon = "fa-solid fa-mobile-screen-button"
+    invalidated_caches = (CLIENT_SNAPSHOTS,)
     column_list = [ClientScope.id, ClientScope.resource, ClientScope.scope, ClientScope.claim]
 
 
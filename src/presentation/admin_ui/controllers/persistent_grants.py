@@ -1,6 +1,9 @@
 from sqladmin import ModelView
+from src.data_access.postgresql.read_memoization import REFERENCE_DATA
 from src.data_access.postgresql.tables import PersistentGrant, PersistentGrantType
 
+from .cache_invalidation import InvalidatesCaches
+
 
 class PersistentGrantAdminController(ModelView, model=PersistentGrant):
     icon = "fa-solid fa-key"
@@ -10,6 +13,9 @@ class PersistentGrantAdminController(ModelView, model=PersistentGrant):
                    PersistentGrant.grant_data
                    ]
 
-class PersistentGrantTypeAdminController(ModelView, model=PersistentGrantType):
+class PersistentGrantTypeAdminController(
+    InvalidatesCaches, ModelView, model=PersistentGrantType
+):
     icon = "fa-solid fa-key"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [PersistentGrantType.id, PersistentGrantType.type_of_grant]
\ No newline at end of file
@@ -9,9 +9,16 @@ from src.data_access.postgresql.tables import (
     ApiSecret, 
     ApiSecretType,  
 )
+from src.business_logic.cache.client_snapshot import CLIENT_SNAPSHOTS
+from src.business_logic.cache.route_audiences import ROUTE_AUDIENCES
+from src.business_logic.cache.well_known import WELL_KNOWN
+from src.data_access.postgresql.read_memoization import REFERENCE_DATA
 
-class ApiResourceAdminController(ModelView, model=ApiResource):
+from .cache_invalidation import InvalidatesCaches
+
+class ApiResourceAdminController(InvalidatesCaches, ModelView, model=ApiResource):
     icon = "fa-solid fa-network-wired"
+    invalidated_caches = (CLIENT_SNAPSHOTS, ROUTE_AUDIENCES, WELL_KNOWN)
     column_list = [ApiResource.id, 
                    ApiResource.name, 
                    ApiResource.description,
@@ -24,8 +31,9 @@ class ApiSecretAdminController(ModelView, model=ApiSecret):
                    ApiSecret.description,
                    ApiSecret.secret_type]
     
-class ApiSecretTypeAdminController(ModelView, model=ApiSecretType):
+class ApiSecretTypeAdminController(InvalidatesCaches, ModelView, model=ApiSecretType):
     icon = "fa-solid fa-network-wired"
+    invalidated_caches = (REFERENCE_DATA,)
     column_list = [ApiSecretType.id, 
                    ApiSecretType.secret_type,]
     
@@ -39,8 +47,9 @@ class ApiClaimTypeAdminController(ModelView, model=ApiClaimType):
     column_list = [ApiClaimType.id, 
                    ApiClaimType.claim_type,]
     
-class ApiScopeAdminController(ModelView, model=ApiScope):
+class ApiScopeAdminController(InvalidatesCaches, ModelView, model=ApiScope):
     icon = "fa-solid fa-network-wired"
+    invalidated_caches = (CLIENT_SNAPSHOTS, ROUTE_AUDIENCES, WELL_KNOWN)
     column_list = [ApiScope.id, 
                    ApiScope.api_resources,
                    ApiScope.description,
@@ -48,15 +57,17 @@ class ApiScopeAdminController(ModelView, model=ApiScope):
                    ApiScope.emphasize,
                    ]
     
-class ApiScopeClaimAdminController(ModelView, model=ApiScopeClaim):
+class ApiScopeClaimAdminController(InvalidatesCaches, ModelView, model=ApiScopeClaim):
     icon = "fa-solid fa-network-wired"
+    invalidated_caches = (ROUTE_AUDIENCES, WELL_KNOWN)
     column_list = [ApiScopeClaim.id, 
                    ApiScopeClaim.api_scopes,
                    ApiScopeClaim.scope_claim_type,
                    ]
     
-class ApiScopeClaimTypeAdminController(ModelView, model=ApiScopeClaimType):
+class ApiScopeClaimTypeAdminController(InvalidatesCaches, ModelView, model=ApiScopeClaimType):
     icon = "fa-solid fa-network-wired"
+    invalidated_caches = (CLIENT_SNAPSHOTS, ROUTE_AUDIENCES, WELL_KNOWN)
     column_list = [ApiScopeClaimType.id,
                    ApiScopeClaimType.scope_claim, 
                    ApiScopeClaimType.scope_claim_type,
@@ -1,6 +1,8 @@
 from sqladmin import ModelView
 from sqladmin.forms import get_model_form
 from typing import Type, no_type_check
+from src.business_logic.cache.user_claims import USER_CLAIMS
+from src.business_logic.cache.well_known import WELL_KNOWN
 from src.data_access.postgresql.tables import (
     User,
     UserClaim,
@@ -9,12 +11,15 @@ from src.data_access.postgresql.tables import (
     UserPassword,
 )
 from wtforms import Form
+from .cache_invalidation import InvalidatesCaches
 
 class UserAdminController(
+    InvalidatesCaches,
     ModelView,
     model=User,
 ):
     icon = "fa-solid fa-user"
+    invalidated_caches = (USER_CLAIMS,)
     # column_labels = {User.username: "username"}
     column_list = [User.id, User.username, User.claims]
     create_excluded_columns = [
@@ -66,14 +71,16 @@ class UserAdminController(
         )
 
 
-class UserClaimAdminController(ModelView, model=UserClaim):
+class UserClaimAdminController(InvalidatesCaches, ModelView, model=UserClaim):
     icon = "fa-solid fa-user"
+    invalidated_caches = (USER_CLAIMS,)
 
     column_list = [UserClaim.claim_type, UserClaim.claim_value, UserClaim.user]
 
 
-class TypesUserClaimAdminController(ModelView, model=UserClaimType):
+class TypesUserClaimAdminController(InvalidatesCaches, ModelView, model=UserClaimType):
     icon = "fa-solid fa-user"
+    invalidated_caches = (USER_CLAIMS, WELL_KNOWN)
     column_list = [
         UserClaimType.id,
         UserClaimType.type_of_claim,
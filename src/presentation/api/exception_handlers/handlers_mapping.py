@@ -31,7 +31,9 @@ from src.business_logic.get_tokens.errors import (
     InvalidRedirectUriError, 
     UnsupportedGrantTypeError,
     InvalidClientCredentialsError,
-    InvalidPkceCodeError
+    InvalidPkceCodeError,
+    AuthorizationPendingError,
+    SlowDownError,
 )
 from src.business_logic.common.errors import (
     InvalidClientIdError,
@@ -83,6 +85,7 @@ from .http400_invalid_grant import http400_invalid_grant_handler
 from .http400_unsupported_grant_type import http400_unsupported_grant_type_handler
 from .http400_invalid_scope import http400_invalid_scope_handler
 from .http400_invalid_pkce import http400_invalid_pkce_handler
+from .http400_device_polling import http400_device_polling_handler
 from .user_groups_and_roles_handler import user_not_in_group_error_handler
 
 exception_handler_mapping = {
@@ -116,5 +119,7 @@ exception_handler_mapping = {
     InvalidClientCredentialsError: http400_invalid_client_handler,
     InvalidClientScopeError: http400_invalid_scope_handler,
     InvalidPkceCodeError: http400_invalid_pkce_handler,
+    AuthorizationPendingError: http400_device_polling_handler,
+    SlowDownError: http400_device_polling_handler,
     UserNotInGroupError: user_not_in_group_error_handler,
 }
@@ -0,0 +1,27 @@
+from typing import Union
+from src.business_logic.get_tokens.errors import AuthorizationPendingError, SlowDownError
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_400_BAD_REQUEST
+
+
+ExceptionsToHandle = Union[AuthorizationPendingError, SlowDownError]
+
+
+async def http400_device_polling_handler(
+        _: Request,
+        exc: ExceptionsToHandle
+) -> JSONResponse:
+    """
+    Reference: https://www.rfc-editor.org/rfc/rfc8628#section-3.5
+    """
+    headers = {"Cache-Control": "no-store", "Pragma": "no-cache"}
+    if isinstance(exc, SlowDownError):
+        content = {"error": "slow_down"}
+    else:
+        content = {"error": "authorization_pending"}
+    return JSONResponse(
+        content=content,
+        headers=headers,
+        status_code=HTTP_400_BAD_REQUEST
+    )
@@ -2,7 +2,9 @@ from dataclasses import dataclass
 from typing import Optional, Union
 
 from fastapi import Form
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
+
+from src.dyna_config import INTROSPECTION_BATCH_MAX_SIZE
 
 
 @dataclass
@@ -36,3 +38,20 @@ class ResponseIntrospectionModel(BaseModel):
 
     def __repr__(self) -> str:
         return f"Model {self.__class__.__name__}"  # pragma: no coverage
+
+
+class IntrospectedTokenModel(BaseModel):
+    token: str
+    token_type_hint: Optional[str] = None
+
+
+class RequestBatchIntrospectionModel(BaseModel):
+    tokens: conlist(
+        IntrospectedTokenModel,
+        min_items=1,
+        max_items=INTROSPECTION_BATCH_MAX_SIZE,
+    )  # type: ignore
+
+
+class ResponseBatchIntrospectionModel(BaseModel):
+    results: list[ResponseIntrospectionModel]
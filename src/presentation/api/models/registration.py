@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Literal, Optional, Union
 from dataclasses import dataclass
 from fastapi import Form
 
@@ -14,6 +14,7 @@ class ClientRequestModel():
     response_types: list[str] = Form(default=["code"])
     token_endpoint_auth_method: str = Form(default="client_secret_post")
     scope: str = Form(default="openid profile")
+    signing_algorithm: Literal["RS256", "ES256", "EdDSA"] = Form(default="RS256")
     class Config:
         orm_mode = True
 
@@ -33,5 +34,6 @@ class ClientUpdateRequestModel():
     response_types: Union[None, list[str]] = Form(None)
     token_endpoint_auth_method: Union[None, str] = Form(None)
     scope: Union[None, str] = Form(None)
+    signing_algorithm: Union[None, Literal["RS256", "ES256", "EdDSA"]] = Form(None)
     class Config:
         orm_mode = True
@@ -10,7 +10,15 @@ from starlette.templating import _TemplateResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.business_logic.authorization import AuthServiceFactory
+from src.business_logic.authorization.constants import ResponseType
 from src.business_logic.authorization.dto import AuthRequestModel
+from src.business_logic.cache.sso_sessions import (
+    SsoSession,
+    get_session_cookie,
+    get_sso_session,
+    get_sso_session_store,
+    start_sso_session,
+)
 from src.business_logic.jwt_manager import JWTManager
 from src.business_logic.services.login_form_service import LoginFormService
 from src.business_logic.services.password import PasswordHash
@@ -28,7 +36,12 @@ from src.business_logic.authorization.dto import AuthRequestModel
 from src.business_logic.services.login_form_service import LoginFormService
 from src.business_logic.services.scope import ScopeService
 from src.business_logic.services.jwt_token import JWTService
-from src.dyna_config import DOMAIN_NAME
+from src.dyna_config import (
+    DOMAIN_NAME,
+    SSO_SESSION_COOKIE_NAME,
+    SSO_SESSION_COOKIE_SECURE,
+    SSO_SESSION_LIFETIME,
+)
 from src.presentation.api.models import RequestModel
 from src.di.providers import provide_async_session_stub
 
@@ -36,7 +49,17 @@ if TYPE_CHECKING:
     from src.business_logic.authorization import AuthServiceProtocol
 
 AuthorizePostEndpointResponse = Union[RedirectResponse, JSONResponse]
-AuthorizeGetEndpointResponse = Union[JSONResponse, _TemplateResponse]
+AuthorizeGetEndpointResponse = Union[
+    JSONResponse, RedirectResponse, _TemplateResponse
+]
+
+# Response types issued to a browser with an SSO session without the login form.
+SSO_RESPONSE_TYPES = (
+    ResponseType.CODE.value,
+    ResponseType.TOKEN.value,
+    ResponseType.ID_TOKEN.value,
+    ResponseType.ID_TOKEN_TOKEN.value,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +68,25 @@ templates = Jinja2Templates(directory="src/presentation/api/templates/")
 auth_router = APIRouter(prefix="/authorize", tags=["Authorization"])
 
 
+def get_auth_service_factory(
+    session: AsyncSession, sso_session: Optional[SsoSession] = None
+) -> AuthServiceFactory:
+    return AuthServiceFactory(
+        session=session,
+        client_repo=ClientRepository(session),
+        user_repo=UserRepository(session),
+        persistent_grant_repo=PersistentGrantRepository(session),
+        device_repo=DeviceRepository(session),
+        password_service=PasswordHash(),
+        jwt_service=JWTService(),
+        scope_service=ScopeService(
+            resource_repo=ResourcesRepository(session),
+            session=session
+        ),
+        sso_session=sso_session,
+    )
+
+
 @auth_router.get(
     "/",
     status_code=status.HTTP_200_OK,
@@ -64,6 +106,26 @@ async def get_authorize(
     )
     auth_class.request_model = request_model
     return_form = await auth_class.get_html_form()
+    if return_form and request_model.response_type in SSO_RESPONSE_TYPES:
+        sso_session = await get_sso_session(
+            request.cookies.get(SSO_SESSION_COOKIE_NAME),
+            prompt=request_model.prompt,
+            max_age=request_model.max_age,
+        )
+        if sso_session is not None:
+            # The browser signed in already, issue without the login form.
+            auth_service: AuthServiceProtocol = get_auth_service_factory(
+                session, sso_session
+            ).get_service_impl(request_model.response_type)
+            result = await auth_service.get_redirect_url(
+                AuthRequestModel(
+                    **request_model.dict(),
+                    username=sso_session.username,
+                    password="",
+                )
+            )
+            await session.commit()
+            return RedirectResponse(url=result, status_code=302)
     external_logins: Optional[dict[str, dict[str, Any]]] = {}
     if request_model.response_type == "code":
         external_logins = await auth_class.form_providers_data_for_auth()
@@ -100,27 +162,37 @@ async def post_authorize(
     user_code: Optional[str] = Cookie(None),
     session: AsyncSession = Depends(provide_async_session_stub),
 ) -> AuthorizePostEndpointResponse:
-    auth_service_factory = AuthServiceFactory(
-        session=session,
-        client_repo=ClientRepository(session),
-        user_repo=UserRepository(session),
-        persistent_grant_repo=PersistentGrantRepository(session),
-        device_repo=DeviceRepository(session),
-        password_service=PasswordHash(),
-        jwt_service=JWTService(),
-        scope_service=ScopeService(
-            resource_repo=ResourcesRepository(session),
-            session=session
-        )
-    )
+    auth_service_factory = get_auth_service_factory(session)
     setattr(request_body, "user_code", user_code)
     auth_service: AuthServiceProtocol = auth_service_factory.get_service_impl(
         request_body.response_type
     )
     result = await auth_service.get_redirect_url(request_body)
     await session.commit()
-    
-    return RedirectResponse(url=result, status_code=302)
+
+    response = RedirectResponse(url=result, status_code=302)
+    sso_session_store = get_sso_session_store()
+    if (
+        sso_session_store is not None
+        and request_body.response_type in SSO_RESPONSE_TYPES
+    ):
+        sso_session = await start_sso_session(
+            sso_session_store,
+            user_id=await auth_service_factory.context.get_user_id(
+                request_body.username
+            ),
+            username=request_body.username,
+        )
+        if sso_session is not None:
+            response.set_cookie(
+                key=SSO_SESSION_COOKIE_NAME,
+                value=get_session_cookie(sso_session.session_id),
+                max_age=SSO_SESSION_LIFETIME,
+                secure=SSO_SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="lax",
+            )
+    return response
 
 
 
@@ -7,6 +7,7 @@ from fastapi.templating import Jinja2Templates
 from starlette.templating import _TemplateResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.business_logic.cache.device_codes import get_device_code_store
 from src.business_logic.services.device_auth import DeviceService
 from src.data_access.postgresql.repositories import (
     ClientRepository,
@@ -39,6 +40,7 @@ async def post_device_authorize(
         session=session,
         client_repo=ClientRepository(session),
         device_repo=DeviceRepository(session),
+        device_store=get_device_code_store(),
     )
     auth_service.request_model = request_model
     response_data = await auth_service.get_response()
@@ -77,6 +79,7 @@ async def post_device_user_code(
         session=session,
         client_repo=ClientRepository(session),
         device_repo=DeviceRepository(session),
+        device_store=get_device_code_store(),
     )
     auth_service.request_model = request_model
     firmed_redirect_uri = await auth_service.get_redirect_uri()
@@ -121,6 +124,7 @@ async def delete_device(
         session=session,
         client_repo=ClientRepository(session),
         device_repo=DeviceRepository(session),
+        device_store=get_device_code_store(),
     )
     auth_service.request_model = request_model
     user_code = request_model.scope.split("=")[1]
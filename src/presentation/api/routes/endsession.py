@@ -1,17 +1,23 @@
 import logging
 from typing import Union
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from fastapi.responses import JSONResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.business_logic.cache.sso_sessions import (
+    get_session_id,
+    get_sso_session_store,
+)
 from src.business_logic.services.endsession import EndSessionService
 from src.data_access.postgresql.repositories import (
     ClientRepository,
     PersistentGrantRepository,
+    RevocationEpochRepository,
 )
 from src.presentation.api.models.endsession import RequestEndSessionModel
 from src.di.providers import provide_async_session_stub
+from src.dyna_config import SSO_SESSION_COOKIE_NAME
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,7 @@ endsession_router = APIRouter(prefix="/endsession", tags=["End Session"])
 )
 async def end_session(
     request: Request,
+    response: Response,
     request_model: RequestEndSessionModel = Depends(),
     session: AsyncSession = Depends(provide_async_session_stub)
 ) -> Union[int, RedirectResponse, JSONResponse]:
@@ -30,14 +37,21 @@ async def end_session(
         session=session,
         client_repo=ClientRepository(session),
         persistent_grant_repo=PersistentGrantRepository(session),
+        revocation_epoch_repo=RevocationEpochRepository(session),
+        sso_session_store=get_sso_session_store(),
     )
     service_class.request_model = request_model
+    service_class.sso_session_id = get_session_id(
+        request.cookies.get(SSO_SESSION_COOKIE_NAME)
+    )
     logout_redirect_uri = await service_class.end_session()
+    await session.commit()
     if logout_redirect_uri is None:
+        response.delete_cookie(SSO_SESSION_COOKIE_NAME)
         return status.HTTP_204_NO_CONTENT
 
-    response = RedirectResponse(
+    redirect_response = RedirectResponse(
         logout_redirect_uri, status_code=status.HTTP_302_FOUND
     )
-    await session.commit()
-    return response
\ No newline at end of file
+    redirect_response.delete_cookie(SSO_SESSION_COOKIE_NAME)
+    return redirect_response
\ No newline at end of file
@@ -6,12 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.business_logic.services.introspection import IntrospectionService
 from src.data_access.postgresql.repositories import (
+    BlacklistedTokenRepository,
     ClientRepository,
     PersistentGrantRepository,
+    RevocationEpochRepository,
     UserRepository,
 )
 from src.presentation.api.models.introspection import (
     BodyRequestIntrospectionModel,
+    RequestBatchIntrospectionModel,
+    ResponseBatchIntrospectionModel,
     ResponseIntrospectionModel,
 )
 from src.presentation.middleware.authorization_validation import (
@@ -46,11 +50,44 @@ async def post_introspection(
         user_repo=UserRepository(session),
         persistent_grant_repo=PersistentGrantRepository(session),
         client_repo=ClientRepository(session),
+        blacklisted_repo=BlacklistedTokenRepository(session),
+        revocation_epoch_repo=RevocationEpochRepository(session),
     )
     introspection_class.request = request
 
     token = request.headers.get("authorization") or auth_swagger
     introspection_class.authorization = token
+    introspection_class.verified_token = request.state.verified_token
     introspection_class.request_body = request_body
     logger.debug(f"Introspection for token {request_body.token} started")
     return await introspection_class.analyze_token()
+
+
+@introspection_router.post("/batch", response_model=ResponseBatchIntrospectionModel)
+async def post_batch_introspection(
+    request: Request,
+    request_body: RequestBatchIntrospectionModel,
+    auth_swagger: Optional[str] = Header(
+        default=None, description="Authorization"
+    ),  # crutch for swagger
+    session: AsyncSession = Depends(provide_async_session_stub),
+) -> dict[str, Any]:
+    introspection_class = IntrospectionService(
+        session=session,
+        user_repo=UserRepository(session),
+        persistent_grant_repo=PersistentGrantRepository(session),
+        client_repo=ClientRepository(session),
+        blacklisted_repo=BlacklistedTokenRepository(session),
+        revocation_epoch_repo=RevocationEpochRepository(session),
+    )
+    introspection_class.request = request
+    introspection_class.authorization = (
+        request.headers.get("authorization") or auth_swagger
+    )
+    introspection_class.verified_token = request.state.verified_token
+    logger.debug(
+        f"Introspection of {len(request_body.tokens)} tokens started"
+    )
+    return {
+        "results": await introspection_class.analyze_tokens(request_body.tokens)
+    }
@@ -2,10 +2,17 @@ import logging
 from fastapi import APIRouter, Depends, Header, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession  
 from src.business_logic.services import ClientService, ScopeService
+from src.business_logic.cache.client_snapshot import CLIENT_SNAPSHOTS
+from src.business_logic.cache.invalidation import publish_invalidation
+from src.business_logic.cache.revocation import CLIENT, revoke_issued_tokens
 from src.data_access.postgresql.errors import ClientNotFoundError
 from typing import Any, Callable
 from pydantic import ValidationError
-from src.data_access.postgresql.repositories import ClientRepository, ResourcesRepository
+from src.data_access.postgresql.repositories import (
+    ClientRepository,
+    ResourcesRepository,
+    RevocationEpochRepository,
+)
 from functools import wraps
 from src.presentation.middleware.access_token_validation import access_token_middleware
 from src.presentation.api.models.registration import (
@@ -59,6 +66,7 @@ async def update_client(
     client_service.request_model = request_body
     await client_service.update(client_id=client_id)
     await session.commit()
+    await publish_invalidation(CLIENT_SNAPSHOTS, client_id)
     return {"message": "Client data updated successfully"}
 
 
@@ -119,5 +127,10 @@ async def delete_client(
     await client_service.client_repo.delete_client_by_client_id(
         client_id=client_id
     )
+    # Tokens issued to the client must not outlive it.
+    await revoke_issued_tokens(
+        RevocationEpochRepository(session), CLIENT, client_id
+    )
     await session.commit()
+    await publish_invalidation(CLIENT_SNAPSHOTS, client_id)
     return {"message": "Client deleted successfully"}
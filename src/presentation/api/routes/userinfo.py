@@ -2,12 +2,9 @@ import logging
 from typing import Any, Union
 
 from fastapi import APIRouter, Header, Request, Depends
-from fastapi_cache.coder import JsonCoder
-from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.business_logic.services.userinfo import UserInfoService
-from src.config.settings.cache_time import CacheTimeSettings
 from src.data_access.postgresql.repositories import (
     ClientRepository,
     PersistentGrantRepository,
@@ -29,11 +26,6 @@ userinfo_router = APIRouter(
 
 
 @userinfo_router.get("/", response_model=dict)
-@cache(
-    expire=CacheTimeSettings.USERINFO,
-    coder=JsonCoder,
-    # key_builder=builder_with_parametr,
-)
 async def get_userinfo(
     request: Request,
     auth_swagger: Union[str, None] = Header(
@@ -49,6 +41,7 @@ async def get_userinfo(
     )
     token = request.headers.get("authorization") or auth_swagger
     userinfo_class.authorization = token
+    userinfo_class.verified_token = request.state.verified_token
     logger.debug("Collecting Claims from DataBase.")
     result = await userinfo_class.get_user_info()
     result = {k: v for k, v in result.items() if v is not None}
@@ -56,11 +49,6 @@ async def get_userinfo(
 
 
 @userinfo_router.post("/", response_model=ResponseUserInfoModel)
-# @cache(
-#     expire=CacheTimeSettings.USERINFO,
-#     coder=JsonCoder,
-#    # key_builder=builder_with_parametr,
-# )
 async def post_userinfo(
     request: Request,
     auth_swagger: Union[str, None] = Header(
@@ -76,17 +64,13 @@ async def post_userinfo(
     )
     token = request.headers.get("authorization") or auth_swagger
     userinfo_class.authorization = token
+    userinfo_class.verified_token = request.state.verified_token
     logger.info("Collecting Claims from DataBase.")
     result = await userinfo_class.get_user_info()
     return {k: v for k, v in result.items() if v is not None}
 
 
 @userinfo_router.get("/jwt", response_model=str)
-@cache(
-    expire=CacheTimeSettings.USERINFO_JWT,
-    coder=JsonCoder,
-    # key_builder=builder_with_parametr,
-)
 async def get_userinfo_jwt(
     request: Request,
     auth_swagger: Union[str, None] = Header(
@@ -102,7 +86,6 @@ async def get_userinfo_jwt(
     )
     token = request.headers.get("authorization") or auth_swagger
     userinfo_class.authorization = token
+    userinfo_class.verified_token = request.state.verified_token
     logger.info("Collecting Claims from DataBase.")
-    result = await userinfo_class.get_user_info()
-    result = {k: v for k, v in result.items() if v is not None}
-    return await userinfo_class.jwt.encode_jwt(payload=result)
+    return await userinfo_class.get_user_info_jwt()
@@ -4,21 +4,26 @@ from typing import Any
 from fastapi import (
     APIRouter,
     Request,
+    Response,
     status,
     Depends
 )
-from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.business_logic.cache.well_known import (
+    SerializedDocument,
+    jwks_cache,
+    openid_configuration_cache,
+)
 from src.business_logic.services import ScopeService
 from src.business_logic.services.well_known import WellKnownService
-from src.config.settings.cache_time import CacheTimeSettings
+from src.config.rsa_keys import get_keystore
 from src.data_access.postgresql.repositories import WellKnownRepository, ResourcesRepository
+from src.dyna_config import WELL_KNOWN_MAX_AGE
 from src.presentation.api.models.well_known import (
     ResponseJWKS,
     ResponseOpenIdConfiguration,
 )
 
-from fastapi.responses import JSONResponse
 from src.di.providers import provide_async_session_stub
 
 well_known_router = APIRouter(prefix="/.well-known", tags=["Well Known"])
@@ -26,15 +31,37 @@ well_known_router = APIRouter(prefix="/.well-known", tags=["Well Known"])
 logger = logging.getLogger(__name__)
 
 
+def document_response(
+    request: Request, document: SerializedDocument
+) -> Response:
+    """
+    Serves a pre-serialized document, or 304 Not Modified if the client
+    already has this version of it.
+    """
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": f"public, max-age={WELL_KNOWN_MAX_AGE}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = [etag.strip().removeprefix("W/") for etag in if_none_match.split(",")]
+        if document.etag in etags or "*" in etags:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+    return Response(
+        content=document.content, media_type="application/json", headers=headers
+    )
+
+
 @well_known_router.get(
     "/openid-configuration", response_model=ResponseOpenIdConfiguration
 )
-@cache(expire=CacheTimeSettings.WELL_KNOWN_OPENID_CONFIG)
 async def get_openid_configuration(
   request: Request,
   session: AsyncSession = Depends(provide_async_session_stub),
-) -> JSONResponse:
-    try:
+) -> Response:
+    async def build() -> dict[str, Any]:
         logger.debug("Collecting Data for OpenID Configuration.")
         well_known_info_class = WellKnownService(
             session=session, 
@@ -46,26 +73,26 @@ async def get_openid_configuration(
         )
         well_known_info_class.request = request
         result = await well_known_info_class.get_openid_configuration()
-        result_dict = {k: v for k, v in result.dict().items() if v is not None}
-        return JSONResponse(content=result_dict)
-    except Exception as exception:
-        logger.exception(exception)
+        return {k: v for k, v in result.dict().items() if v is not None}
+
+    document = await openid_configuration_cache.get(build)
+    return document_response(request, document)
 
 
 @well_known_router.get("/jwks", response_model=ResponseJWKS)
 async def get_jwks(
     request: Request,
-) -> dict[str, Any]:
-    try:
+) -> Response:
+    async def build() -> dict[str, Any]:
         session = "no_session"
         well_known_info_class = WellKnownService(
             session=session, wlk_repo=WellKnownRepository(session),
         )
         well_known_info_class.request = request
         return {
-            "keys": [
-                await well_known_info_class.get_jwks(),
-            ]
+            "keys": await well_known_info_class.get_all_jwks(),
         }
-    except Exception:
-        raise  # HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    kids = tuple(key.kid for key in get_keystore().keys)
+    document = await jwks_cache.get(build, version=kids)
+    return document_response(request, document)
@@ -2,8 +2,10 @@ import logging
 from jwt.exceptions import InvalidAudienceError, ExpiredSignatureError, InvalidKeyError, MissingRequiredClaimError
 from fastapi import Request, Depends
 from typing import Any
-from src.business_logic.services.jwt_token import JWTService
+from src.business_logic.cache.revocation import is_token_revoked
+from src.business_logic.services.jwt_token import JWTService, VerifiedToken
 from src.data_access.postgresql.repositories.blacklisted_token import BlacklistedTokenRepository
+from src.data_access.postgresql.repositories.revocation_epoch import RevocationEpochRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.data_access.postgresql.errors.auth_token import (
     IncorrectAuthTokenError
@@ -12,6 +14,8 @@ from src.di.providers import provide_async_session_stub
 
 logger = logging.getLogger(__name__)
 
+jwt_service = JWTService()
+
 
 async def access_token_middleware(
         request: Request,
@@ -23,16 +27,13 @@ async def access_token_middleware(
     else:
         aud = "oidc:admin:write"
 
-    jwt_service = JWTService()
     token = request.headers.get("access-token")
     blacklisted_repo = BlacklistedTokenRepository(session)
     
     if token is None:
         raise IncorrectAuthTokenError("No access token in Request")
-    if await blacklisted_repo.exists(token=token):
-        raise IncorrectAuthTokenError("Access Token revoked")
     try:
-        await jwt_service.decode_token(token, audience=aud)
+        payload = await jwt_service.decode_token(token, audience=aud)
     except (InvalidAudienceError, MissingRequiredClaimError):
         raise IncorrectAuthTokenError("Access Token doesn't have admin permissions")
     except ExpiredSignatureError:
@@ -41,5 +42,12 @@ async def access_token_middleware(
         raise IncorrectAuthTokenError("Access Token can not be decoded with our private key")
     except:
         raise IncorrectAuthTokenError("Access Token can not be decoded")
+    if await is_token_revoked(
+        token, payload, blacklisted_repo, RevocationEpochRepository(session)
+    ):
+        raise IncorrectAuthTokenError("Access Token revoked")
+    request.state.verified_token = VerifiedToken(
+        token=token.replace("Bearer ", ""), claims=payload
+    )
 
     logger.info("Access Token Auth Passed")
@@ -0,0 +1,60 @@
+"""
+Microbenchmark of RS256 encode/decode with PEM bytes and with pre-parsed keys.
+
+Usage: python -m src.scripts.benchmarks.jwt_keys [iterations]
+"""
+import sys
+import time
+from typing import Any, Callable
+
+import jwt
+
+from src.config.rsa_keys.create_rsa_keypair import CreateRSAKeypair
+
+PAYLOAD = {
+    "sub": "8c6b8c5b-1a6a-4f3c-9d9b-2f3a0f5c1e7d",
+    "iss": "http://localhost:8000",
+    "aud": "userinfo",
+    "scope": "openid profile email",
+    "exp": 4102444800,
+}
+
+
+def measure(name: str, iterations: int, func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    rate = iterations / (time.perf_counter() - start)
+    print(f"{name:<24}{rate:>12.0f} ops/s")
+    return rate
+
+
+def main(iterations: int = 500) -> None:
+    keys = CreateRSAKeypair().execute()
+    token = jwt.encode(PAYLOAD, keys.parsed_private_key, algorithm="RS256")
+
+    def decode(key: Any) -> Callable[[], Any]:
+        return lambda: jwt.decode(
+            token, key, algorithms=["RS256"], audience="userinfo"
+        )
+
+    pem_encode = measure(
+        "encode, PEM",
+        iterations,
+        lambda: jwt.encode(PAYLOAD, keys.private_key, algorithm="RS256"),
+    )
+    parsed_encode = measure(
+        "encode, pre-parsed",
+        iterations,
+        lambda: jwt.encode(PAYLOAD, keys.parsed_private_key, algorithm="RS256"),
+    )
+    pem_decode = measure("decode, PEM", iterations, decode(keys.public_key))
+    parsed_decode = measure(
+        "decode, pre-parsed", iterations, decode(keys.parsed_public_key)
+    )
+    print(f"encode speedup: x{parsed_encode / pem_encode:.2f}")
+    print(f"decode speedup: x{parsed_decode / pem_decode:.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -35,6 +35,7 @@ from src.data_access.postgresql.repositories import (
     ThirdPartyOIDCRepository,
     WellKnownRepository,
     BlacklistedTokenRepository,
+    RevocationEpochRepository,
     CodeChallengeRepository,
     ResourcesRepository,
 )
@@ -50,6 +51,14 @@ from src.business_logic.services.third_party_oidc_service import (
     ThirdPartyGitLabService
 )
 from src.data_access.postgresql.tables.base import Base
+from src.business_logic.cache.client_snapshot import client_snapshot_cache
+from src.business_logic.cache.introspection import introspection_cache
+from src.business_logic.cache.route_audiences import route_audiences
+from src.business_logic.cache.user_claims import user_claims_cache
+from src.business_logic.cache.well_known import (
+    jwks_cache,
+    openid_configuration_cache,
+)
 from tests.overrides.override_test_container import CustomPostgresContainer
 from factories.commands import DataBasePopulation
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
@@ -157,6 +166,17 @@ def event_loop(request: Request) -> Any:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    # Tests change the database directly, without invalidation.
+    client_snapshot_cache.clear()
+    route_audiences.clear()
+    user_claims_cache.clear()
+    openid_configuration_cache.clear()
+    jwks_cache.clear()
+    introspection_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def authorization_service(
     connection: AsyncSession,
@@ -179,6 +199,7 @@ async def end_session_service(connection: AsyncSession) -> EndSessionService:
         session=connection,
         client_repo=ClientRepository(session=connection),
         persistent_grant_repo=PersistentGrantRepository(session=connection),
+        revocation_epoch_repo=RevocationEpochRepository(session=connection),
         jwt_service=JWTService(),
     )
     return end_sess_service
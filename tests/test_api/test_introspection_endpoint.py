@@ -46,7 +46,7 @@ class TestIntrospectionEndpoint:
             grant_data=introspection_token,
             user_id=1,
             client_id="test_client",
-            expiration_time=3600,
+            expiration_time=int(time.time()) + 3600,
         )
         headers = {
             "authorization": f"Bearer {access_token}",
@@ -144,7 +144,7 @@ class TestIntrospectionEndpoint:
             grant_data=introspection_token,
             user_id=1,
             client_id="test_client",
-            expiration_time=3600,
+            expiration_time=int(time.time()) + 3600,
         )
         headers = {
             "authorization": f"Bearer {access_token}",
@@ -158,3 +158,46 @@ class TestIntrospectionEndpoint:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response_content == {"detail": "Incorrect Token"}
+
+    @pytest.mark.asyncio
+    async def test_introspection_request_without_token_type_hint(
+        self, connection: AsyncSession, client: AsyncClient
+    ) -> None:
+        jwt = JWTService()
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        refresh_token = await jwt.encode_jwt(
+            payload={"exp": time.time() + 3600, "aud": ["refresh"]}
+        )
+        access_token = await jwt.encode_jwt(
+            payload={
+                "sub": "1",
+                "client_id": "test_client",
+                "aud": ["oidc:introspection:get"],
+            }
+        )
+        await persistent_grant_repo.create(
+            grant_type="refresh_token",
+            grant_data=refresh_token,
+            user_id=1,
+            client_id="test_client",
+            scope="openid email",
+            expiration_time=int(time.time()) + 3600,
+        )
+        headers = {
+            "authorization": f"Bearer {access_token}",
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+        response = await client.request(
+            method="POST",
+            url="/introspection/",
+            data={"token": refresh_token},
+            headers=headers,
+        )
+        response_content = json.loads(response.content.decode("utf-8"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response_content["active"] is True
+        assert response_content["sub"] == "1"
+        assert response_content["client_id"] == "test_client"
+        assert response_content["scope"] == "openid email"
@@ -102,3 +102,16 @@ class TestWellKnown:
                 )
             )
             assert response_content["use"] == "sig"
+
+    async def test_jwks_not_modified(self, client: AsyncClient) -> None:
+        response = await client.request(method="GET", url="/.well-known/jwks")
+        etag = response.headers["etag"]
+        assert "max-age" in response.headers["cache-control"]
+
+        response = await client.request(
+            method="GET", url="/.well-known/jwks", headers={"if-none-match": etag}
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
@@ -0,0 +1,237 @@
+import base64
+import hashlib
+import json
+from dataclasses import asdict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.business_logic.authorization.dto import AuthRequestModel
+from src.business_logic.authorization.service_impls import CodeAuthService
+from src.business_logic.cache.authorization_codes import (
+    CODE_KEY_PREFIX,
+    AuthorizationCode,
+    MemoryAuthorizationCodeStore,
+    RedisAuthorizationCodeStore,
+    get_code_digest,
+)
+from src.business_logic.get_tokens.dto import RequestTokenModel
+from src.business_logic.get_tokens.errors import (
+    InvalidGrantError,
+    InvalidPkceCodeError,
+)
+from src.business_logic.get_tokens.service_impls import (
+    AuthorizationCodeTokenService,
+)
+from src.business_logic.get_tokens.validators.validate_code_challenge import (
+    get_fernet,
+    verify_code_verifier,
+)
+
+VERIFIER = "dBjftJeZ4CVP-mB92K27uhbUJU1p1r_wW1gFWFOEjXk"
+CHALLENGE = "E9Melhoa2OwvFrEMTJguCHaoeK1t8URWbuGJSstw-cM"
+
+
+def get_code(**kwargs) -> AuthorizationCode:
+    return AuthorizationCode(
+        **{
+            "client_id": "test_client",
+            "user_id": 1,
+            "scope": "openid",
+            "redirect_uri": "https://www.google.com/",
+            "code_challenge": CHALLENGE,
+            "code_challenge_method": "S256",
+            **kwargs,
+        }
+    )
+
+
+def get_token_service(code_store: MemoryAuthorizationCodeStore) -> AuthorizationCodeTokenService:
+    return AuthorizationCodeTokenService(
+        session=MagicMock(commit=AsyncMock()),
+        redirect_uri_validator=AsyncMock(),
+        client_validator=AsyncMock(),
+        pkce_code_validator=AsyncMock(),
+        jwt_manager=MagicMock(
+            encode_many=AsyncMock(side_effect=lambda payloads, algorithm: ["token"] * len(payloads))
+        ),
+        persistent_grant_repo=MagicMock(
+            redeem_authorization_code=AsyncMock(return_value=None),
+            create_refresh_grant=AsyncMock(),
+        ),
+        client_repo=MagicMock(get_signing_algorithm_by_client=AsyncMock(return_value="RS256")),
+        code_store=code_store,
+    )
+
+
+def get_request(**kwargs) -> RequestTokenModel:
+    return RequestTokenModel(
+        **{
+            "client_id": "test_client",
+            "grant_type": "authorization_code",
+            "redirect_uri": "https://www.google.com/",
+            "code": "code",
+            "code_verifier": VERIFIER,
+            **kwargs,
+        }
+    )
+
+
+def test_verify_code_verifier() -> None:
+    assert verify_code_verifier("S256", CHALLENGE, VERIFIER)
+    assert not verify_code_verifier("S256", CHALLENGE, "other")
+    assert verify_code_verifier("plain", VERIFIER, VERIFIER)
+    assert not verify_code_verifier("plain", CHALLENGE, VERIFIER)
+    assert not verify_code_verifier("S256", CHALLENGE, None)
+    assert not verify_code_verifier("S512", CHALLENGE, VERIFIER)
+    assert CHALLENGE == base64.urlsafe_b64encode(
+        hashlib.sha256(VERIFIER.encode()).digest()
+    ).decode().rstrip("=")
+
+
+@pytest.mark.asyncio
+class TestAuthorizationCodeStores:
+    async def test_memory_code_is_redeemed_once(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        assert await store.save("code", get_code(), ttl=60)
+
+        assert await store.redeem("code") == get_code()
+        assert await store.redeem("code") is None
+
+    async def test_memory_code_expires(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        await store.save("code", get_code(), ttl=0)
+
+        assert await store.redeem("code") is None
+
+    async def test_redis_code_is_redeemed_with_getdel(self) -> None:
+        redis = MagicMock(
+            set=AsyncMock(),
+            getdel=AsyncMock(return_value=json.dumps(asdict(get_code()))),
+        )
+        store = RedisAuthorizationCodeStore()
+
+        with patch(
+            "src.business_logic.cache.authorization_codes.get_redis",
+            return_value=redis,
+        ):
+            assert await store.save("code", get_code(), ttl=60)
+            assert await store.redeem("code") == get_code()
+
+        key = f"{CODE_KEY_PREFIX}{get_code_digest('code')}"
+        assert redis.set.await_args.args[0] == key
+        assert redis.set.await_args.kwargs == {"ex": 60}
+        redis.getdel.assert_awaited_once_with(key)
+
+    async def test_unavailable_redis_falls_back(self) -> None:
+        redis = MagicMock(
+            set=AsyncMock(side_effect=RedisError),
+            getdel=AsyncMock(side_effect=RedisError),
+        )
+        store = RedisAuthorizationCodeStore()
+
+        with patch(
+            "src.business_logic.cache.authorization_codes.get_redis",
+            return_value=redis,
+        ):
+            assert not await store.save("code", get_code(), ttl=60)
+            assert await store.redeem("code") is None
+
+
+@pytest.mark.asyncio
+class TestRedeemStoredCode:
+    async def test_stored_code_skips_postgres_code(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        await store.save("code", get_code(), ttl=60)
+        service = get_token_service(store)
+
+        response = await service.get_tokens(get_request())
+
+        assert response.access_token == "token"
+        service._pkce_code_validator.assert_not_awaited()
+        service._persistent_grant_repo.redeem_authorization_code.assert_not_awaited()
+        service._persistent_grant_repo.create_refresh_grant.assert_awaited_once()
+        assert await store.redeem("code") is None
+
+    async def test_unknown_code_is_redeemed_from_postgres(self) -> None:
+        service = get_token_service(MemoryAuthorizationCodeStore(max_size=10))
+
+        with pytest.raises(InvalidGrantError):
+            await service.get_tokens(get_request())
+
+        service._pkce_code_validator.assert_awaited_once()
+        service._persistent_grant_repo.redeem_authorization_code.assert_awaited_once()
+
+    async def test_challenge_is_bound_to_code(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        await store.save("code", get_code(), ttl=60)
+        service = get_token_service(store)
+
+        with pytest.raises(InvalidPkceCodeError):
+            await service.get_tokens(get_request(code_verifier="other"))
+
+    async def test_redirect_uri_must_match(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        await store.save("code", get_code(), ttl=60)
+        service = get_token_service(store)
+
+        with pytest.raises(InvalidGrantError):
+            await service.get_tokens(get_request(redirect_uri="https://example.com/"))
+
+
+@pytest.mark.asyncio
+class TestIssueCode:
+    def get_service(self, code_store: RedisAuthorizationCodeStore) -> CodeAuthService:
+        context = MagicMock(
+            get_client=AsyncMock(return_value=MagicMock(id=1, authorization_code_lifetime=60)),
+            get_user_id=AsyncMock(return_value=1),
+        )
+        return CodeAuthService(
+            client_validator=AsyncMock(),
+            redirect_uri_validator=AsyncMock(),
+            scope_validator=AsyncMock(),
+            user_credentials_validator=AsyncMock(),
+            persistent_grant_repo=MagicMock(
+                create_grant=AsyncMock(), get_type_id=AsyncMock(return_value=1)
+            ),
+            context=context,
+            code_store=code_store,
+            code_challenge_repo=MagicMock(create=AsyncMock()),
+        )
+
+    def get_request(self) -> AuthRequestModel:
+        return AuthRequestModel(
+            client_id="test_client",
+            response_type="code",
+            scope="openid",
+            redirect_uri="https://www.google.com/",
+            username="TestClient",
+            password="test_password",
+            code_challenge=CHALLENGE,
+            code_challenge_method="S256",
+        )
+
+    async def test_stored_code_keeps_challenge(self) -> None:
+        store = MemoryAuthorizationCodeStore(max_size=10)
+        service = self.get_service(store)
+
+        await service.get_redirect_url(self.get_request())
+
+        assert (await store.redeem(service._secret_code)) == get_code()
+        service._code_challenge_repo.create.assert_not_awaited()
+
+    async def test_challenge_of_fallback_code_goes_to_postgres(self) -> None:
+        redis = MagicMock(set=AsyncMock(side_effect=RedisError))
+        service = self.get_service(RedisAuthorizationCodeStore())
+
+        with patch(
+            "src.business_logic.cache.authorization_codes.get_redis",
+            return_value=redis,
+        ):
+            await service.get_redirect_url(self.get_request())
+
+        service._persistent_grant_repo.create_grant.assert_awaited_once()
+        kwargs = service._code_challenge_repo.create.await_args.kwargs
+        assert kwargs["code_challenge_method"] == "S256"
+        assert get_fernet().decrypt(kwargs["code_challenge"].encode()).decode() == CHALLENGE
@@ -0,0 +1,132 @@
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.business_logic.cache.client_snapshot import (
+    CLIENT_SNAPSHOTS,
+    ClientSnapshot,
+    client_snapshot_cache,
+)
+from src.business_logic.cache.invalidation import (
+    invalidate_locally,
+    publish_invalidation,
+)
+from src.business_logic.cache.ttl_cache import TTLCache
+from src.business_logic.common.errors import InvalidClientIdError
+from src.business_logic.common.validators import (
+    ClientIdValidator,
+    RedirectUriValidator,
+)
+from src.data_access.postgresql.errors import ClientRedirectUriError
+from src.data_access.postgresql.repositories import ClientRepository
+
+
+def get_snapshot(client_id: str = "test_client") -> ClientSnapshot:
+    return ClientSnapshot(
+        id=1,
+        client_id=client_id,
+        enabled=True,
+        signing_algorithm="RS256",
+        authorization_code_lifetime=300,
+        device_code_lifetime=600,
+        require_pkce=False,
+        redirect_uris=["https://www.google.com/"],
+        post_logout_redirect_uris=[],
+        scopes=["openid"],
+        response_types=["code"],
+    )
+
+
+@pytest.fixture
+def cached_client() -> Iterator[ClientSnapshot]:
+    snapshot = get_snapshot()
+    client_snapshot_cache.set(snapshot.client_id, snapshot)
+    yield snapshot
+    client_snapshot_cache.clear()
+
+
+class TestTTLCache:
+    def test_expired_entry_is_dropped(self) -> None:
+        cache: TTLCache[int] = TTLCache(max_size=2, ttl=0)
+        cache.set("key", 1)
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: TTLCache[int] = TTLCache(max_size=2, ttl=60)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+
+        assert cache.get("first") == 1
+        assert cache.get("second") is None
+        assert cache.get("third") == 3
+
+
+class TestClientSnapshot:
+    def test_snapshot_is_immutable(self) -> None:
+        snapshot = get_snapshot()
+
+        with pytest.raises(AttributeError):
+            snapshot.enabled = False
+        with pytest.raises(AttributeError):
+            snapshot.extra = 1
+        assert not hasattr(snapshot, "__dict__")
+
+    def test_invalidation_of_one_client(self, cached_client: ClientSnapshot) -> None:
+        client_snapshot_cache.set("other_client", get_snapshot("other_client"))
+
+        invalidate_locally(CLIENT_SNAPSHOTS, "test_client")
+
+        assert client_snapshot_cache.get("test_client") is None
+        assert client_snapshot_cache.get("other_client") is not None
+
+    @pytest.mark.asyncio
+    async def test_published_invalidation_applies_without_redis(
+        self, cached_client: ClientSnapshot
+    ) -> None:
+        redis = MagicMock(publish=AsyncMock(side_effect=ConnectionError))
+        with patch(
+            "src.business_logic.cache.invalidation.get_redis", return_value=redis
+        ):
+            await publish_invalidation(CLIENT_SNAPSHOTS)
+
+        redis.publish.assert_awaited_once()
+        assert len(client_snapshot_cache) == 0
+
+
+@pytest.mark.asyncio
+class TestValidatorsReadSnapshot:
+    async def test_cached_client_needs_no_query(
+        self, cached_client: ClientSnapshot
+    ) -> None:
+        session = AsyncMock()
+        client_repo = ClientRepository(session)
+
+        await ClientIdValidator(client_repo)("test_client")
+        await RedirectUriValidator(client_repo)(
+            "https://www.google.com/", "test_client"
+        )
+
+        session.execute.assert_not_awaited()
+
+    async def test_unknown_client_is_rejected(
+        self, cached_client: ClientSnapshot
+    ) -> None:
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(
+            scalar=MagicMock(return_value=None)
+        )
+        client_repo = ClientRepository(session)
+
+        with pytest.raises(InvalidClientIdError):
+            await ClientIdValidator(client_repo)("unknown_client")
+        with pytest.raises(ClientRedirectUriError):
+            await RedirectUriValidator(client_repo)(
+                "https://www.google.com/", "unknown_client"
+            )
+        assert client_snapshot_cache.get("unknown_client") is None
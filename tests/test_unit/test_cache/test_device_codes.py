@@ -0,0 +1,204 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.business_logic.cache.device_codes import (
+    INTERVAL_KEY_PREFIX,
+    POLL_KEY_PREFIX,
+    SLOW_DOWN_STEP,
+    MemoryDeviceCodeStore,
+    PendingDevice,
+    RedisDeviceCodeStore,
+    get_device_code_digest,
+)
+from src.business_logic.get_tokens.dto import RequestTokenModel
+from src.business_logic.get_tokens.errors import (
+    AuthorizationPendingError,
+    InvalidGrantError,
+    SlowDownError,
+)
+from src.business_logic.get_tokens.service_impls import DeviceCodeTokenService
+
+GRANT_TYPE = "urn:ietf:params:oauth:grant-type:device_code"
+
+
+def get_device(**kwargs) -> PendingDevice:
+    return PendingDevice(
+        **{
+            "client_id": "test_client",
+            "device_code": "device_code",
+            "user_code": "USERCODE",
+            "expires_at": int(time.time()) + 600,
+            **kwargs,
+        }
+    )
+
+
+def get_token_service(device_store: MemoryDeviceCodeStore) -> DeviceCodeTokenService:
+    return DeviceCodeTokenService(
+        session=MagicMock(commit=AsyncMock()),
+        device_code_validator=AsyncMock(),
+        grant_exp_validator=AsyncMock(),
+        client_validator=AsyncMock(),
+        redirect_uri_validator=AsyncMock(),
+        jwt_manager=MagicMock(
+            encode_many=AsyncMock(side_effect=lambda payloads, algorithm: ["token"] * len(payloads))
+        ),
+        persistent_grant_repo=MagicMock(
+            get_grant=AsyncMock(
+                return_value=MagicMock(user_id=1, client_id=1, scope="openid", expiration=0)
+            ),
+            delete_grant=AsyncMock(),
+            create_grant=AsyncMock(),
+        ),
+        client_repo=MagicMock(get_signing_algorithm_by_client=AsyncMock(return_value="RS256")),
+        device_store=device_store,
+    )
+
+
+def get_request(**kwargs) -> RequestTokenModel:
+    return RequestTokenModel(
+        **{
+            "client_id": "test_client",
+            "grant_type": GRANT_TYPE,
+            "device_code": "device_code",
+            **kwargs,
+        }
+    )
+
+
+@pytest.mark.asyncio
+class TestDeviceCodeStores:
+    async def test_approval_retires_user_code(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device())
+        assert await store.get_by_user_code("USERCODE") == get_device()
+
+        await store.approve(get_device())
+
+        assert await store.get_by_user_code("USERCODE") is None
+        assert (await store.get("device_code")).approved
+
+    async def test_expired_device_is_forgotten(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device(expires_at=int(time.time()) - 1))
+
+        assert await store.get("device_code") is None
+        assert await store.get_by_user_code("USERCODE") is None
+
+    async def test_polls_within_interval_are_refused(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+
+        assert await store.poll(get_device(interval=60))
+        assert not await store.poll(get_device(interval=60))
+        assert await store.poll(get_device(device_code="other_device_code", interval=60))
+
+    async def test_slow_down_grows_interval(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        device = get_device(interval=5)
+
+        assert await store.poll(device)
+        assert not await store.poll(device)
+        assert not await store.poll(device)
+
+        assert store._slow_downs.get("device_code") == 2 * SLOW_DOWN_STEP
+        expires_at, _ = store._polls._entries["device_code"]
+        assert expires_at - time.monotonic() > 5 + SLOW_DOWN_STEP
+
+    async def test_redis_poll_is_set_if_absent(self) -> None:
+        pipeline = MagicMock(execute=AsyncMock())
+        pipeline.__aenter__ = AsyncMock(return_value=pipeline)
+        pipeline.__aexit__ = AsyncMock(return_value=None)
+        redis = MagicMock(
+            get=AsyncMock(side_effect=[None, None]),
+            set=AsyncMock(side_effect=[True, None]),
+            pipeline=MagicMock(return_value=pipeline),
+        )
+        device = get_device(interval=5)
+        digest = get_device_code_digest("device_code")
+
+        with patch(
+            "src.business_logic.cache.device_codes.get_redis", return_value=redis
+        ):
+            store = RedisDeviceCodeStore()
+            assert await store.poll(device)
+            assert not await store.poll(device)
+
+        redis.set.assert_awaited_with(
+            f"{POLL_KEY_PREFIX}{digest}", 1, px=4000, nx=True
+        )
+        pipeline.incrby.assert_called_once_with(
+            f"{INTERVAL_KEY_PREFIX}{digest}", SLOW_DOWN_STEP
+        )
+        pipeline.expireat.assert_called_once_with(
+            f"{INTERVAL_KEY_PREFIX}{digest}", device.expires_at
+        )
+        pipeline.set.assert_called_once_with(
+            f"{POLL_KEY_PREFIX}{digest}", 1, px=9000
+        )
+
+    async def test_redis_poll_waits_for_grown_interval(self) -> None:
+        redis = MagicMock(
+            get=AsyncMock(return_value=b"10"), set=AsyncMock(return_value=True)
+        )
+
+        with patch(
+            "src.business_logic.cache.device_codes.get_redis", return_value=redis
+        ):
+            assert await RedisDeviceCodeStore().poll(get_device(interval=5))
+
+        assert redis.set.await_args.kwargs["px"] == 14000
+
+
+@pytest.mark.asyncio
+class TestPollDevice:
+    async def test_pending_device_does_not_reach_postgres(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device())
+        service = get_token_service(store)
+
+        with pytest.raises(AuthorizationPendingError):
+            await service.get_tokens(get_request())
+
+        service._device_code_validator.assert_not_awaited()
+        service._persistent_grant_repo.get_grant.assert_not_awaited()
+
+    async def test_fast_poll_gets_slow_down(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device())
+        service = get_token_service(store)
+
+        with pytest.raises(AuthorizationPendingError):
+            await service.get_tokens(get_request())
+        with pytest.raises(SlowDownError):
+            await service.get_tokens(get_request())
+
+    async def test_device_of_another_client_is_refused(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device(client_id="other_client"))
+
+        with pytest.raises(InvalidGrantError):
+            await get_token_service(store).get_tokens(get_request())
+
+    async def test_approved_device_is_redeemed_once(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device())
+        await store.approve(get_device())
+        service = get_token_service(store)
+
+        response = await service.get_tokens(get_request())
+
+        assert response.access_token == "token"
+        service._persistent_grant_repo.create_grant.assert_awaited_once()
+        assert await store.get("device_code") is None
+
+    async def test_uncommitted_approval_is_pending(self) -> None:
+        store = MemoryDeviceCodeStore(max_size=10)
+        await store.save(get_device())
+        await store.approve(get_device())
+        service = get_token_service(store)
+        service._device_code_validator.side_effect = InvalidGrantError
+
+        with pytest.raises(AuthorizationPendingError):
+            await service.get_tokens(get_request())
@@ -0,0 +1,81 @@
+import time
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.business_logic.cache.introspection import (
+    INTROSPECTION_CACHE_REQUESTS,
+    INTROSPECTION_RESULTS,
+    evict_introspection_result,
+    get_introspection_result,
+    get_token_digest,
+    introspection_cache,
+    set_introspection_result,
+)
+from src.business_logic.cache.invalidation import invalidate_locally
+from src.business_logic.cache.revocation import REVOCATION_EPOCHS
+
+
+@pytest.fixture(autouse=True)
+def clear_introspection_cache() -> Iterator[None]:
+    yield
+    introspection_cache.clear()
+
+
+def get_requests(result: str) -> float:
+    return INTROSPECTION_CACHE_REQUESTS.labels(result=result)._value.get()
+
+
+def test_hits_and_misses_are_counted() -> None:
+    hits, misses = get_requests("hit"), get_requests("miss")
+
+    assert get_introspection_result("token", "access_token") is None
+    set_introspection_result("token", "access_token", {"active": True, "exp": time.time() + 60})
+    assert get_introspection_result("token", "access_token")["active"] is True
+
+    assert get_requests("hit") == hits + 1
+    assert get_requests("miss") == misses + 1
+
+
+def test_result_is_kept_by_hint() -> None:
+    set_introspection_result("token", "access_token", {"active": True, "scope": "a"})
+    set_introspection_result("token", "access", {"active": True, "scope": "b"})
+
+    assert get_introspection_result("token", "access_token")["scope"] == "a"
+    assert get_introspection_result("token", "access")["scope"] == "b"
+    assert get_introspection_result("token", "authorization_code") is None
+
+
+def test_result_does_not_outlive_token() -> None:
+    set_introspection_result("expired", "access_token", {"active": True, "exp": time.time() - 1})
+    set_introspection_result("expiring", "access_token", {"active": True, "exp": time.time() + 5})
+
+    assert get_token_digest("expired") not in introspection_cache
+    expires_at, _ = introspection_cache._entries[get_token_digest("expiring")]
+    assert expires_at - time.monotonic() <= 5
+
+
+def test_logout_drops_all_results() -> None:
+    set_introspection_result("token", "access_token", {"active": True})
+
+    invalidate_locally(REVOCATION_EPOCHS, "sub:1")
+
+    assert len(introspection_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_evicted_on_all_workers() -> None:
+    set_introspection_result("token", "access_token", {"active": True})
+    set_introspection_result("other", "access_token", {"active": True})
+    redis = MagicMock(publish=AsyncMock())
+
+    with patch(
+        "src.business_logic.cache.invalidation.get_redis", return_value=redis
+    ):
+        await evict_introspection_result("Bearer token")
+
+    assert get_token_digest("token") not in introspection_cache
+    assert get_token_digest("other") in introspection_cache
+    redis.publish.assert_awaited_once()
+    assert INTROSPECTION_RESULTS in redis.publish.await_args.args[1]
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from typing import AsyncIterator, Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.business_logic.cache.revocation import (
+    CLIENT,
+    EPOCH_KEY_PREFIX,
+    REVOKED_KEY_PREFIX,
+    SUBJECT,
+    BloomFilter,
+    RevocationStore,
+    is_token_revoked,
+    revocation_epoch_cache,
+    revocation_store,
+    revoke_issued_tokens,
+)
+
+TRACKING_SINCE = 1_000
+
+
+def get_redis_mock(revoked: list[str]) -> MagicMock:
+    async def scan_iter(match: str) -> AsyncIterator[str]:
+        for jti in revoked:
+            yield f"{REVOKED_KEY_PREFIX}{jti}"
+
+    pipeline = MagicMock(execute=AsyncMock())
+    return MagicMock(
+        pipeline=MagicMock(
+            return_value=MagicMock(
+                __aenter__=AsyncMock(return_value=pipeline),
+                __aexit__=AsyncMock(return_value=False),
+            )
+        ),
+        set=AsyncMock(),
+        get=AsyncMock(return_value=str(TRACKING_SINCE)),
+        exists=AsyncMock(side_effect=lambda key: key[len(REVOKED_KEY_PREFIX):] in revoked),
+        publish=AsyncMock(),
+        scan_iter=scan_iter,
+    )
+
+
+@pytest.fixture
+def redis() -> Iterator[MagicMock]:
+    redis = get_redis_mock(revoked=["revoked_jti"])
+    with patch(
+        "src.business_logic.cache.revocation.get_redis", return_value=redis
+    ), patch(
+        "src.business_logic.cache.invalidation.get_redis", return_value=redis
+    ):
+        yield redis
+    revocation_store.clear()
+
+
+class TestBloomFilter:
+    def test_added_items_are_found(self) -> None:
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{number}" for number in range(1000)]
+        for item in items:
+            bloom_filter.add(item)
+
+        assert all(item in bloom_filter for item in items)
+
+    def test_false_positives_stay_near_error_rate(self) -> None:
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for number in range(1000):
+            bloom_filter.add(f"jti-{number}")
+
+        false_positives = sum(
+            f"other-{number}" in bloom_filter for number in range(10000)
+        )
+
+        assert false_positives < 300
+
+
+@pytest.mark.asyncio
+class TestRevocationStore:
+    async def test_unknown_until_loaded(self) -> None:
+        store = RevocationStore(capacity=100, error_rate=0.01)
+
+        assert await store.is_revoked("jti", TRACKING_SINCE) is None
+
+    async def test_not_revoked_token_needs_no_redis(self, redis: MagicMock) -> None:
+        store = RevocationStore(capacity=100, error_rate=0.01)
+        await store.rebuild()
+
+        assert await store.is_revoked("other_jti", TRACKING_SINCE) is False
+        redis.exists.assert_not_awaited()
+
+    async def test_revoked_token_is_confirmed_by_redis(
+        self, redis: MagicMock
+    ) -> None:
+        store = RevocationStore(capacity=100, error_rate=0.01)
+        await store.rebuild()
+
+        assert await store.is_revoked("revoked_jti", TRACKING_SINCE) is True
+
+    async def test_token_issued_before_tracking_is_unknown(
+        self, redis: MagicMock
+    ) -> None:
+        store = RevocationStore(capacity=100, error_rate=0.01)
+        await store.rebuild()
+
+        assert await store.is_revoked("other_jti", TRACKING_SINCE - 1) is None
+
+    async def test_revocation_applies_to_this_worker(self, redis: MagicMock) -> None:
+        await revocation_store.rebuild()
+        expiration = int(time.time()) + 60
+
+        await revocation_store.revoke("new_jti", expiration)
+
+        redis.set.assert_awaited_with(
+            f"{REVOKED_KEY_PREFIX}new_jti", expiration, ex=60
+        )
+        redis.publish.assert_awaited_once()
+        redis.exists.side_effect = None
+        redis.exists.return_value = True
+        assert await revocation_store.is_revoked("new_jti", TRACKING_SINCE) is True
+
+    async def test_database_decides_when_store_is_unsure(self) -> None:
+        blacklisted_repo = MagicMock(exists=AsyncMock(return_value=True))
+
+        revoked = await is_token_revoked(
+            "token", {"jti": "jti", "iat": TRACKING_SINCE}, blacklisted_repo, MagicMock()
+        )
+
+        assert revoked is True
+        blacklisted_repo.exists.assert_awaited_once_with(token="token")
+
+
+@pytest.mark.asyncio
+class TestRevocationEpochs:
+    @pytest.fixture(autouse=True)
+    def clear_epochs(self) -> Iterator[None]:
+        yield
+        revocation_epoch_cache.clear()
+
+    async def test_token_issued_before_logout_is_revoked(self) -> None:
+        redis = get_redis_mock(revoked=[])
+        redis.mget = AsyncMock(return_value=[str(TRACKING_SINCE), None])
+        blacklisted_repo = MagicMock(exists=AsyncMock(return_value=False))
+        epoch_repo = MagicMock(get_epochs=AsyncMock(return_value={}))
+        payload = {"sub": "1", "client_id": "test_client"}
+
+        with patch(
+            "src.business_logic.cache.revocation.get_redis", return_value=redis
+        ):
+            before = await is_token_revoked(
+                "token", {**payload, "iat": TRACKING_SINCE - 1}, blacklisted_repo, epoch_repo
+            )
+            after = await is_token_revoked(
+                "token", {**payload, "iat": TRACKING_SINCE}, blacklisted_repo, epoch_repo
+            )
+
+        assert before is True
+        assert after is False
+        # Redis knew the user, the client was looked up and cached once.
+        epoch_repo.get_epochs.assert_awaited_once_with([(CLIENT, "test_client")])
+        redis.mget.assert_awaited_once()
+
+    async def test_epoch_is_announced_after_commit(self) -> None:
+        redis = get_redis_mock(revoked=[])
+        epoch_repo = MagicMock(set_epoch=AsyncMock(), session=AsyncSession())
+        revocation_epoch_cache.set("sub:1", 0)
+
+        with patch(
+            "src.business_logic.cache.revocation.get_redis", return_value=redis
+        ), patch(
+            "src.business_logic.cache.invalidation.get_redis", return_value=redis
+        ):
+            await revoke_issued_tokens(epoch_repo, SUBJECT, "1")
+            assert revocation_epoch_cache.get("sub:1") == 0
+            redis.set.assert_not_awaited()
+            redis.publish.assert_not_awaited()
+
+            await epoch_repo.session.commit()
+            await epoch_repo.session.close()
+            await asyncio.sleep(0)
+
+        epoch = epoch_repo.set_epoch.await_args.args[2]
+        redis.set.assert_awaited_once_with(
+            f"{EPOCH_KEY_PREFIX}sub:1", epoch, ex=600
+        )
+        assert revocation_epoch_cache.get("sub:1") is None
+
+    async def test_revocation_survives_redis_failure(self) -> None:
+        redis = get_redis_mock(revoked=[])
+        redis.set = AsyncMock(side_effect=ConnectionError())
+        redis.publish = AsyncMock(side_effect=ConnectionError())
+        epoch_repo = MagicMock(set_epoch=AsyncMock(), session=AsyncSession())
+        revocation_epoch_cache.set("sub:1", 0)
+
+        with patch(
+            "src.business_logic.cache.revocation.get_redis", return_value=redis
+        ), patch(
+            "src.business_logic.cache.invalidation.get_redis", return_value=redis
+        ):
+            await revoke_issued_tokens(epoch_repo, SUBJECT, "1")
+            await epoch_repo.session.commit()
+            await epoch_repo.session.close()
+            await asyncio.sleep(0)
+
+        # The table stays the source of truth for the other workers.
+        epoch_repo.set_epoch.assert_awaited_once()
+        assert revocation_epoch_cache.get("sub:1") is None
+
+    async def test_rolled_back_revocation_is_not_announced(self) -> None:
+        redis = get_redis_mock(revoked=[])
+        epoch_repo = MagicMock(set_epoch=AsyncMock(), session=AsyncSession())
+
+        with patch(
+            "src.business_logic.cache.revocation.get_redis", return_value=redis
+        ), patch(
+            "src.business_logic.cache.invalidation.get_redis", return_value=redis
+        ):
+            await revoke_issued_tokens(epoch_repo, SUBJECT, "1")
+            await epoch_repo.session.close()
+            await asyncio.sleep(0)
+
+        redis.set.assert_not_awaited()
+        redis.publish.assert_not_awaited()
+
+    async def test_token_issued_after_logout_second_is_valid(self) -> None:
+        redis = get_redis_mock(revoked=[])
+        epoch_repo = MagicMock(set_epoch=AsyncMock(), session=AsyncSession())
+
+        with patch(
+            "src.business_logic.cache.revocation.get_redis", return_value=redis
+        ), patch(
+            "src.business_logic.cache.invalidation.get_redis", return_value=redis
+        ), patch(
+            "src.business_logic.cache.revocation.time.time", return_value=2_000.5
+        ):
+            await revoke_issued_tokens(epoch_repo, SUBJECT, "1")
+
+        assert epoch_repo.set_epoch.await_args.args[2] == 2_000
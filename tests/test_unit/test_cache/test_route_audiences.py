@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.business_logic.cache.invalidation import invalidate_locally
+from src.business_logic.cache.route_audiences import (
+    ROUTE_AUDIENCES,
+    RouteAudiences,
+    build_route_audiences,
+    route_audiences,
+)
+
+SCOPE_CLAIMS = {
+    "userinfo": ["openid", "profile"],
+    "introspection": ["read"],
+    "revoke": [],
+}
+
+
+def get_resource_repo() -> MagicMock:
+    return MagicMock(get_all_scope_claims=AsyncMock(return_value=SCOPE_CLAIMS))
+
+
+def test_build_route_audiences() -> None:
+    assert build_route_audiences(SCOPE_CLAIMS) == {
+        "userinfo": ["openid", "profile"],
+        "introspection": ["oidc:introspection:read"],
+        "revoke": [],
+    }
+
+
+@pytest.mark.asyncio
+class TestRouteAudiences:
+    async def test_resources_are_read_once(self) -> None:
+        audiences = RouteAudiences()
+        resource_repo = get_resource_repo()
+
+        assert await audiences.get(resource_repo, "introspection") == [
+            "oidc:introspection:read"
+        ]
+        assert await audiences.get(resource_repo, "unknown") is None
+        resource_repo.get_all_scope_claims.assert_awaited_once_with("oidc")
+
+    async def test_invalidation_reloads_resources(self) -> None:
+        resource_repo = get_resource_repo()
+        await route_audiences.get(resource_repo, "userinfo")
+
+        invalidate_locally(ROUTE_AUDIENCES)
+        await route_audiences.get(resource_repo, "userinfo")
+
+        assert resource_repo.get_all_scope_claims.await_count == 2
+        route_audiences.clear()
+
+    async def test_load_overtaken_by_invalidation_is_not_kept(self) -> None:
+        audiences = RouteAudiences()
+        resource_repo = get_resource_repo()
+
+        async def get_all_scope_claims(resource_name: str) -> dict:
+            audiences.clear()
+            return SCOPE_CLAIMS
+
+        resource_repo.get_all_scope_claims.side_effect = get_all_scope_claims
+        await audiences.get(resource_repo, "userinfo")
+        await audiences.get(resource_repo, "userinfo")
+
+        assert resource_repo.get_all_scope_claims.await_count == 2
@@ -0,0 +1,149 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.business_logic.authorization.dto import AuthRequestModel
+from src.business_logic.authorization.factories.factory_methods import (
+    _create_code_auth_service,
+)
+from src.business_logic.authorization.service_impls import IdTokenAuthService
+from src.business_logic.authorization.validators import SsoSessionValidator
+from src.business_logic.cache.sso_sessions import (
+    MemorySsoSessionStore,
+    SsoSession,
+    get_session_cookie,
+    get_session_id,
+    get_sso_session,
+    start_sso_session,
+)
+from src.business_logic.services.endsession import EndSessionService
+from src.data_access.postgresql.errors import UserNotFoundError
+
+
+def get_session(**kwargs) -> SsoSession:
+    now = int(time.time())
+    return SsoSession(
+        **{
+            "session_id": "session_id",
+            "user_id": 1,
+            "username": "TestClient",
+            "auth_time": now,
+            "expires_at": now + 600,
+            **kwargs,
+        }
+    )
+
+
+def test_cookie_is_signed() -> None:
+    cookie = get_session_cookie("session_id")
+
+    assert get_session_id(cookie) == "session_id"
+    assert get_session_id(cookie.replace("session_id", "session_id2")) is None
+    assert get_session_id("session_id") is None
+    assert get_session_id(None) is None
+
+
+@pytest.mark.asyncio
+class TestSsoSessions:
+    async def test_logout_ends_all_sessions_of_user(self) -> None:
+        store = MemorySsoSessionStore(max_size=10)
+        first = await start_sso_session(store, user_id=1, username="TestClient")
+        second = await start_sso_session(store, user_id=1, username="TestClient")
+        other = await start_sso_session(store, user_id=2, username="Other")
+
+        await store.end_user_sessions(1)
+
+        assert await store.get(first.session_id) is None
+        assert await store.get(second.session_id) is None
+        assert await store.get(other.session_id) == other
+
+    async def test_prompt_login_and_max_age_ask_to_sign_in(self) -> None:
+        store = MemorySsoSessionStore(max_size=10)
+        await store.save(get_session(auth_time=int(time.time()) - 100))
+        cookie = get_session_cookie("session_id")
+
+        with patch(
+            "src.business_logic.cache.sso_sessions.get_sso_session_store",
+            return_value=store,
+        ):
+            assert await get_sso_session(cookie) is not None
+            assert await get_sso_session(cookie, max_age=1000) is not None
+            assert await get_sso_session(cookie, max_age=10) is None
+            assert await get_sso_session(cookie, prompt="consent login") is None
+            assert await get_sso_session("forged.cookie") is None
+
+    async def test_session_replaces_password_check(self) -> None:
+        password_service = MagicMock(is_password_valid_async=AsyncMock())
+        service = _create_code_auth_service(
+            client_repo=MagicMock(),
+            user_repo=MagicMock(),
+            persistent_grant_repo=MagicMock(),
+            password_service=password_service,
+            scope_service=MagicMock(),
+            sso_session=get_session(),
+        )
+        validator = service._user_credentials_validator
+        assert isinstance(validator, SsoSessionValidator)
+
+        await validator("TestClient", None)
+        with pytest.raises(UserNotFoundError):
+            await validator("Other", None)
+        password_service.is_password_valid_async.assert_not_awaited()
+
+    async def test_id_token_tells_when_user_signed_in(self) -> None:
+        sso_session = get_session(auth_time=int(time.time()) - 300)
+        jwt_manager = MagicMock(encode=MagicMock(return_value="id_token"))
+        service = IdTokenAuthService(
+            client_validator=AsyncMock(),
+            redirect_uri_validator=AsyncMock(),
+            scope_validator=AsyncMock(),
+            user_credentials_validator=SsoSessionValidator(sso_session),
+            context=MagicMock(
+                get_user_id=AsyncMock(return_value=1),
+                get_client=AsyncMock(
+                    return_value=MagicMock(signing_algorithm="ES256")
+                ),
+            ),
+            jwt_manager=jwt_manager,
+            auth_time=sso_session.auth_time,
+        )
+
+        await service.get_redirect_url(
+            AuthRequestModel(
+                client_id="test_client",
+                response_type="id_token",
+                scope="openid",
+                redirect_uri="https://www.google.com/",
+                username="TestClient",
+                password="",
+            )
+        )
+
+        payload = jwt_manager.encode.call_args.kwargs["payload"]
+        assert payload.auth_time == sso_session.auth_time
+        assert jwt_manager.encode.call_args.kwargs["algorithm"] == "ES256"
+
+    async def test_end_session_ends_sso_sessions(self) -> None:
+        store = MemorySsoSessionStore(max_size=10)
+        await store.save(get_session())
+        await store.save(get_session(session_id="other_user", user_id=2))
+        service = EndSessionService(
+            session=MagicMock(),
+            client_repo=MagicMock(),
+            persistent_grant_repo=MagicMock(
+                delete_persistent_grant_by_client_and_user_id=AsyncMock()
+            ),
+            revocation_epoch_repo=MagicMock(),
+            sso_session_store=store,
+        )
+        service.sso_session_id = "other_user"
+
+        with patch(
+            "src.business_logic.services.endsession.revoke_issued_tokens",
+            AsyncMock(),
+        ):
+            await service._logout(client_id="test_client", user_id=1)
+
+        assert await store.get("session_id") is None
+        assert await store.get("other_user") is None
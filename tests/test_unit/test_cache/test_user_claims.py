@@ -0,0 +1,107 @@
+import asyncio
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.business_logic.cache.invalidation import invalidate_locally
+from src.business_logic.cache.user_claims import (
+    USER_CLAIMS,
+    get_user_claims,
+    invalidate_user_claims_on_commit,
+    normalize_scopes,
+    set_user_claims,
+    user_claims_cache,
+)
+from src.business_logic.services.jwt_token import VerifiedToken
+from src.business_logic.services.userinfo import UserInfoService
+
+CLAIMS = {"name": "Daniil", "email": "daniil@example.com"}
+
+
+@pytest.fixture(autouse=True)
+def clear_user_claims() -> Iterator[None]:
+    yield
+    user_claims_cache.clear()
+
+
+def get_user_info_service(scope: str) -> UserInfoService:
+    service = UserInfoService(
+        session=MagicMock(),
+        user_repo=MagicMock(get_claims=AsyncMock(return_value=dict(CLAIMS))),
+        client_repo=MagicMock(),
+        persistent_grant_repo=MagicMock(),
+    )
+    service.verified_token = VerifiedToken(
+        token="token", claims={"sub": "1", "scope": scope}
+    )
+    return service
+
+
+def test_normalize_scopes() -> None:
+    assert normalize_scopes("openid  email openid") == frozenset(
+        ("openid", "email")
+    )
+    assert normalize_scopes(["email", "openid"]) == normalize_scopes(
+        "openid email"
+    )
+    assert normalize_scopes(None) == frozenset()
+
+
+def test_invalidation_drops_all_scope_sets_of_subject() -> None:
+    set_user_claims("1", frozenset(("openid",)), {"sub": "1"})
+    set_user_claims("1", frozenset(("email",)), {"email": "a@b.c"})
+    set_user_claims("2", frozenset(("openid",)), {"sub": "2"})
+
+    invalidate_locally(USER_CLAIMS, "1")
+
+    assert get_user_claims("1", frozenset(("openid",))) is None
+    assert get_user_claims("1", frozenset(("email",))) is None
+    assert get_user_claims("2", frozenset(("openid",))) == {"sub": "2"}
+
+
+@pytest.mark.asyncio
+class TestUserInfoClaimsCache:
+    async def test_claims_are_read_once_per_scope_set(self) -> None:
+        service = get_user_info_service("openid email")
+        first = await service.get_user_info()
+
+        service.verified_token = VerifiedToken(
+            token="other", claims={"sub": "1", "scope": "email openid"}
+        )
+        second = await service.get_user_info()
+
+        assert first == second
+        assert first["email"] == CLAIMS["email"]
+        assert "name" not in first
+        service.user_repo.get_claims.assert_awaited_once_with(id=1)
+
+    async def test_scope_sets_are_cached_separately(self) -> None:
+        service = get_user_info_service("openid")
+        await service.get_user_info()
+
+        service.verified_token = VerifiedToken(
+            token="other", claims={"sub": "1", "scope": "openid profile"}
+        )
+        result = await service.get_user_info()
+
+        assert result["name"] == CLAIMS["name"]
+        assert service.user_repo.get_claims.await_count == 2
+
+    async def test_commit_invalidates_changed_users(self) -> None:
+        set_user_claims("1", frozenset(), {"sub": "1"})
+        publish = AsyncMock()
+        session = AsyncSession()
+
+        with patch(
+            "src.business_logic.cache.user_claims.publish_invalidation", publish
+        ):
+            invalidate_user_claims_on_commit(session, 1)
+            assert get_user_claims("1", frozenset()) is not None
+            await session.commit()
+            await session.close()
+            await asyncio.sleep(0)
+
+        assert get_user_claims("1", frozenset()) is None
+        publish.assert_awaited_once_with(USER_CLAIMS, "1")
@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.business_logic.cache.invalidation import invalidate_locally
+from src.business_logic.cache.well_known import (
+    WELL_KNOWN,
+    DocumentCache,
+    openid_configuration_cache,
+    serialize_document,
+)
+
+
+def test_equal_documents_share_etag() -> None:
+    first = serialize_document({"issuer": "http://localhost", "keys": [1, 2]})
+    second = serialize_document({"issuer": "http://localhost", "keys": [1, 2]})
+    other = serialize_document({"issuer": "http://localhost", "keys": [2, 1]})
+
+    assert first == second
+    assert first.etag != other.etag
+    assert first.content == b'{"issuer":"http://localhost","keys":[1,2]}'
+
+
+@pytest.mark.asyncio
+class TestDocumentCache:
+    async def test_document_is_built_once_per_version(self) -> None:
+        cache = DocumentCache()
+        build = AsyncMock(return_value={"keys": ["kid-1"]})
+
+        first = await cache.get(build, version=("kid-1",))
+        second = await cache.get(build, version=("kid-1",))
+        await cache.get(build, version=("kid-2", "kid-1"))
+
+        assert first is second
+        assert build.await_count == 2
+
+    async def test_invalidation_rebuilds_document(self) -> None:
+        build = AsyncMock(return_value={"issuer": "http://localhost"})
+        await openid_configuration_cache.get(build)
+
+        invalidate_locally(WELL_KNOWN)
+        await openid_configuration_cache.get(build)
+
+        assert build.await_count == 2
+        openid_configuration_cache.clear()
+
+    async def test_build_overtaken_by_invalidation_is_not_kept(self) -> None:
+        cache = DocumentCache()
+
+        async def build() -> dict:
+            cache.clear()
+            return {"issuer": "http://localhost"}
+
+        build_mock = AsyncMock(side_effect=build)
+        await cache.get(build_mock)
+        await cache.get(build_mock)
+
+        assert build_mock.await_count == 2
@@ -1,10 +1,45 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
 import pytest
+from sqlalchemy import delete, insert, select, text
 from src.data_access.postgresql.repositories import (
     PersistentGrantRepository,
     BlacklistedTokenRepository,
+    DeviceRepository,
+    ThirdPartyOIDCRepository,
+)
+from src.data_access.postgresql.tables import (
+    BlacklistedToken,
+    Client,
+    PersistentGrant,
+    PersistentGrantType,
+)
+from src.data_access.postgresql.tables.identity_resource import (
+    IdentityProviderState,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.celery_logic.token_tasks import clear_database
+from src.celery_logic.celery_main import Session
+from src.celery_logic.reaper import (
+    EXPIRING_TABLES,
+    get_next_cleaning_time,
+    reap_expired_rows,
+    reap_table,
+)
+from src.celery_logic.token_tasks import (
+    clear_database,
+    maintain_grant_partitions,
+)
+from src.data_access.postgresql.partitioning import (
+    DAY,
+    create_partitions,
+    drop_expired_partitions,
+    get_day_start,
+    get_partition_name,
+    get_partitions,
+    partition_table,
+)
 
 
 @pytest.mark.usefixtures("engine", "pre_test_setup")
@@ -43,3 +78,177 @@ class TestTokenTasks:
         responce = clear_database()
         assert responce == "Total deleted: 0"
         
+
+    async def test_clear_all_expiring_tables(self, connection: AsyncSession) -> None:
+        device_repo = DeviceRepository(connection)
+        await device_repo.create(
+            client_id="test_client",
+            device_code="expired_device_code",
+            user_code="EXPIRED1",
+            verification_uri="https://www.google.com/",
+            verification_uri_complete="https://www.google.com/",
+            expires_in=0,
+        )
+        await connection.execute(
+            insert(IdentityProviderState).values(
+                state="expired_state",
+                created_at=datetime.utcnow() - timedelta(days=1),
+            )
+        )
+        await connection.commit()
+
+        responce = clear_database()
+
+        assert responce == "Total deleted: 2"
+        assert not await device_repo.validate_device_code(
+            device_code="expired_device_code"
+        )
+        assert not await ThirdPartyOIDCRepository(connection).validate_state(
+            state="expired_state"
+        )
+
+    async def test_rows_are_deleted_in_batches(self, connection: AsyncSession) -> None:
+        blacklisted_repo = BlacklistedTokenRepository(connection)
+        for token in ("batch_1", "batch_2", "batch_3"):
+            await blacklisted_repo.create(token=token, expiration=0)
+        await connection.commit()
+        blacklisted_tokens = next(
+            expiring for expiring in EXPIRING_TABLES
+            if expiring.table.name == "blacklisted_tokens"
+        )
+        session = Session()
+
+        first_run = reap_table(
+            session, blacklisted_tokens, time.time(),
+            batch_size=2, max_batches=1, pause=0,
+        )
+        second_run = reap_table(
+            session, blacklisted_tokens, time.time(),
+            batch_size=2, max_batches=1, pause=0,
+        )
+        session.close()
+
+        assert first_run == (2, False)
+        assert second_run == (1, True)
+
+    async def test_next_cleaning_time(self, connection: AsyncSession) -> None:
+        blacklisted_repo = BlacklistedTokenRepository(connection)
+        await blacklisted_repo.create(
+            token="expires_soon", expiration=int(time.time()) + 30
+        )
+        await connection.commit()
+        session = Session()
+
+        next_cleaning_time = get_next_cleaning_time(session)
+        reap_expired_rows(session)
+        session.close()
+        await connection.execute(
+            delete(BlacklistedToken).where(BlacklistedToken.token == "expires_soon")
+        )
+        await connection.commit()
+
+        assert 0 < next_cleaning_time <= 30
+
+    async def test_partitions_are_not_maintained_by_default(
+        self, connection: AsyncSession
+    ) -> None:
+        assert maintain_grant_partitions() == "persistent_grants is not partitioned"
+
+    async def test_grants_of_default_partition_move_to_new_partition(
+        self, connection: AsyncSession
+    ) -> None:
+        session = Session()
+        try:
+            sync_connection = session.connection()
+            now = time.time()
+            partition_table(sync_connection, now, days_ahead=1)
+            expires_in_3_days = get_day_start(now) + 3 * DAY + 60
+            sync_connection.execute(
+                insert(PersistentGrant).values(
+                    key="in_default_partition",
+                    client_id=select(Client.id)
+                    .where(Client.client_id == "test_client")
+                    .scalar_subquery(),
+                    grant_data="in_default_partition",
+                    expiration=expires_in_3_days,
+                    user_id=2,
+                    persistent_grant_type_id=select(PersistentGrantType.id)
+                    .where(PersistentGrantType.type_of_grant == "refresh_token")
+                    .scalar_subquery(),
+                )
+            )
+
+            # Maintenance once the default partition holds the grant.
+            created = create_partitions(sync_connection, now, days_ahead=3)
+            partition = get_partition_name(get_day_start(expires_in_3_days))
+            moved = sync_connection.execute(
+                text(f"SELECT count(*) FROM {partition}")
+            ).scalar()
+            left = sync_connection.execute(
+                text("SELECT count(*) FROM persistent_grants_default")
+            ).scalar()
+        finally:
+            # DDL is transactional, the table is left unpartitioned.
+            session.rollback()
+            session.close()
+
+        assert partition in created
+        assert moved == 1
+        assert left == 0
+
+
+def get_partitioned_connection(bounds: dict[str, str]) -> MagicMock:
+    connection = MagicMock()
+    connection.execute.return_value = list(bounds.items())
+    return connection
+
+
+class TestPartitioning:
+    # 2023-11-14 22:13:20 UTC
+    now = 1700000000
+    today = 1699920000
+
+    def test_partition_name_is_the_utc_day(self) -> None:
+        assert get_partition_name(self.today) == "persistent_grants_p20231114"
+
+    def test_upper_bounds_are_parsed(self) -> None:
+        connection = get_partitioned_connection(
+            {
+                "persistent_grants_history": "FOR VALUES FROM (MINVALUE) TO (1699920000)",
+                "persistent_grants_p20231114": "FOR VALUES FROM (1699920000) TO (1700006400)",
+                "persistent_grants_default": "DEFAULT",
+            }
+        )
+
+        assert get_partitions(connection) == {
+            "persistent_grants_history": 1699920000,
+            "persistent_grants_p20231114": 1700006400,
+            "persistent_grants_default": None,
+        }
+
+    def test_only_missing_partitions_are_created(self) -> None:
+        connection = get_partitioned_connection(
+            {
+                "persistent_grants_p20231114": f"FOR VALUES FROM ({self.today}) TO ({self.today + DAY})",
+            }
+        )
+
+        created = create_partitions(connection, self.now, days_ahead=2)
+
+        assert created == [
+            "persistent_grants_p20231115",
+            "persistent_grants_p20231116",
+        ]
+
+    def test_only_expired_partitions_are_dropped(self) -> None:
+        connection = get_partitioned_connection(
+            {
+                "persistent_grants_history": f"FOR VALUES FROM (MINVALUE) TO ({self.today})",
+                "persistent_grants_p20231114": f"FOR VALUES FROM ({self.today}) TO ({self.today + DAY})",
+                "persistent_grants_default": "DEFAULT",
+            }
+        )
+
+        assert drop_expired_partitions(connection, self.now) == [
+            "persistent_grants_history"
+        ]
@@ -0,0 +1,96 @@
+import os
+
+import jwt
+import pytest
+
+from src.business_logic.jwt_manager import JWTManager
+from src.business_logic.jwt_manager.dto import RefreshTokenPayload
+from src.business_logic.services.jwt_token import JWTService
+from src.config.rsa_keys import (
+    SIGNING_ALGORITHMS,
+    CreateRSAKeypair,
+    FileKeyStore,
+)
+
+
+class TestFileKeyStore:
+    def test_key_is_shared_between_processes(self, tmp_path: str) -> None:
+        first_worker = FileKeyStore(path=str(tmp_path))
+        second_worker = FileKeyStore(path=str(tmp_path))
+
+        assert first_worker.signing_key.kid == second_worker.signing_key.kid
+        assert first_worker.signing_key.private_key == (
+            second_worker.signing_key.private_key
+        )
+        assert os.listdir(tmp_path).count(
+            f"{first_worker.signing_key.kid}.pem"
+        ) == 1
+
+    def test_keys_are_loaded_once(self, tmp_path: str) -> None:
+        keystore = FileKeyStore(path=str(tmp_path))
+        kid = keystore.signing_key.kid
+        for filename in os.listdir(tmp_path):
+            os.remove(os.path.join(tmp_path, filename))
+
+        assert keystore.signing_key.kid == kid
+
+    def test_get_unknown_key_reloads_storage(self, tmp_path: str) -> None:
+        keystore = FileKeyStore(path=str(tmp_path))
+        keystore.reload_interval = 0
+        old_key = keystore.signing_key
+        new_key = CreateRSAKeypair().execute()
+        FileKeyStore(path=str(tmp_path))._write_key(new_key)
+
+        assert keystore.get_key(new_key.kid) == new_key
+        assert keystore.get_key(old_key.kid) == old_key
+        assert keystore.get_key("unknown") is None
+
+
+class TestJWTServiceKid:
+    @pytest.mark.asyncio
+    async def test_token_signed_by_another_active_key(
+        self, tmp_path: str
+    ) -> None:
+        keystore = FileKeyStore(path=str(tmp_path))
+        keystore.reload_interval = 0
+        other_node = JWTService(keys=keystore.signing_key, keystore=keystore)
+        new_key = CreateRSAKeypair().execute()
+        FileKeyStore(path=str(tmp_path))._write_key(new_key)
+        this_node = JWTService(keys=new_key, keystore=keystore)
+
+        token = await other_node.encode_jwt(payload={"sub": "1"})
+
+        assert jwt.get_unverified_header(token)["kid"] == other_node.keys.kid
+        assert (await this_node.decode_token(token))["sub"] == "1"
+
+
+class TestSigningAlgorithms:
+    def test_one_key_per_algorithm(self, tmp_path: str) -> None:
+        keystore = FileKeyStore(path=str(tmp_path))
+
+        assert sorted(key.alg for key in keystore.keys) == sorted(
+            SIGNING_ALGORITHMS
+        )
+        assert keystore.signing_key.alg == "RS256"
+        assert keystore.get_signing_key("ES256").jwk["crv"] == "P-256"
+        assert keystore.get_signing_key("EdDSA").jwk["kty"] == "OKP"
+        with pytest.raises(ValueError):
+            keystore.get_signing_key("HS256")
+
+    @pytest.mark.parametrize("alg", ["ES256", "EdDSA"])
+    def test_jwt_manager_signs_with_client_algorithm(
+        self, tmp_path: str, alg: str
+    ) -> None:
+        keystore = FileKeyStore(path=str(tmp_path))
+        jwt_manager = JWTManager(
+            keys=keystore.signing_key, keystore=keystore, signing_executor=None
+        )
+
+        token = jwt_manager.encode(
+            payload=RefreshTokenPayload(jti="1"), algorithm=alg
+        )
+
+        header = jwt.get_unverified_header(token)
+        assert header["alg"] == alg
+        assert header["kid"] == keystore.get_signing_key(alg).kid
+        assert jwt_manager.decode(token)["jti"] == "1"
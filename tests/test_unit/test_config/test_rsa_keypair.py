@@ -0,0 +1,68 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric.rsa import (
+    RSAPrivateKey,
+    RSAPublicKey,
+)
+
+from src.business_logic.services.jwt_token import JWTService
+from src.config.rsa_keys import (
+    CreateRSAKeypair,
+    CreateSigningKeypair,
+    LoadRSAKeypair,
+    LoadSigningKeypair,
+)
+
+
+class TestRSAKeypair:
+    def test_parsed_keys_are_reused(self) -> None:
+        keys = CreateRSAKeypair().execute()
+
+        assert isinstance(keys.parsed_private_key, RSAPrivateKey)
+        assert isinstance(keys.parsed_public_key, RSAPublicKey)
+        assert keys.parsed_private_key is keys.parsed_private_key
+        assert keys.parsed_public_key is keys.parsed_public_key
+
+    def test_parsed_keys_match_pem(self) -> None:
+        keys = CreateRSAKeypair().execute()
+        loaded = LoadRSAKeypair().execute(keys.private_key)
+
+        token = jwt.encode(
+            {"sub": "1"}, keys.parsed_private_key, algorithm="RS256"
+        )
+
+        assert jwt.decode(token, keys.public_key, algorithms=["RS256"])
+        assert jwt.decode(
+            token, loaded.parsed_public_key, algorithms=["RS256"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_jwt_service_uses_parsed_keys(self) -> None:
+        keys = CreateRSAKeypair().execute()
+        jwt_service = JWTService(keys=keys)
+
+        token = await jwt_service.encode_jwt(payload={"sub": "1"})
+
+        assert jwt_service.get_verification_key(token) is keys
+        assert (await jwt_service.decode_token(token))["sub"] == "1"
+
+
+class TestSigningKeypair:
+    @pytest.mark.parametrize("alg", ["RS256", "ES256", "EdDSA"])
+    def test_create_and_load(self, alg: str) -> None:
+        keys = CreateSigningKeypair().execute(alg)
+        loaded = LoadSigningKeypair().execute(keys.private_key)
+
+        token = jwt.encode(
+            {"sub": "1"}, keys.parsed_private_key, algorithm=alg
+        )
+
+        assert loaded.alg == alg
+        assert loaded.kid == keys.kid
+        assert loaded.jwk == keys.jwk
+        assert jwt.decode(token, loaded.parsed_public_key, algorithms=[alg])
+        assert jwt.decode(
+            token,
+            jwt.PyJWK({**keys.jwk, "alg": alg}).key,
+            algorithms=[alg],
+        )
@@ -9,8 +9,8 @@ from src.data_access.postgresql.repositories import BlacklistedTokenRepository
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from typing import Any
 
-async def new_decode_token(*args: Any, **kwargs: Any) -> bool:
-        return True
+async def new_decode_token(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        return {}
     
 async def new_call_next(*args: Any, **kwargs: Any) -> str:
     return "Successful"
@@ -5,6 +5,7 @@ import pytest
 from fastapi import status
 from starlette.types import ASGIApp
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from jwt.exceptions import InvalidTokenError
 from src.business_logic.services.jwt_token import JWTService
 from src.presentation.api import router
 from typing import Any, Callable, MutableMapping
@@ -13,8 +14,10 @@ from src.presentation.middleware.authorization_validation import authorization_m
 from src.data_access.postgresql.repositories import BlacklistedTokenRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 
-async def new_decode_token(*args:Any, **kwargs:Any) -> bool:
-    return "Bearer AuthToken" in args or "Bearer AuthToken" in kwargs.values()
+async def new_decode_token(*args:Any, **kwargs:Any) -> dict[str, Any]:
+    if "Bearer AuthToken" in args or "Bearer AuthToken" in kwargs.values():
+        return {}
+    raise InvalidTokenError
 
 async def new_call_next(*args:Any, **kwargs:Any) -> str:
     return "Successful"
@@ -62,6 +65,7 @@ class TestAuthorizationMiddleware:
                 request.url.path = request_with_auth["path"]
                 request.headers["authorization"] = test_token
                 await authorization_middleware(request=request, session=connection)
+                assert request.state.verified_token.claims == {}
 
     
     async def test_successful_auth_with_swagger(self, connection: AsyncSession) -> None:
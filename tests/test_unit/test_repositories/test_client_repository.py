@@ -59,6 +59,24 @@ class TestClientRepository:
         assert result == boolean
 
 
+    async def test_get_client_snapshot(self, connection: AsyncSession) -> None:
+        client_repo = ClientRepository(connection)
+        snapshot = await client_repo.get_client_snapshot(client_id="test_client")
+
+        assert snapshot.client_id == "test_client"
+        assert snapshot.redirect_uris == frozenset(
+            await client_repo.list_all_redirect_uris_by_client(client_id="test_client")
+        )
+        assert snapshot.scopes == frozenset(
+            await client_repo.list_all_scopes_by_client(client_id="test_client")
+        )
+        assert await client_repo.get_client_snapshot(
+            client_id="test_client"
+        ) is snapshot
+        assert await client_repo.get_client_snapshot(
+            client_id="test_client_not_exist"
+        ) is None
+
     async def test_validate_client_by_int_id(self, connection: AsyncSession) -> None:
         client_repo = ClientRepository(connection)
         result = await client_repo.validate_client_by_int_id(
@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 from sqlalchemy import select
 
@@ -5,13 +7,16 @@ from src.data_access.postgresql.repositories.persistent_grant import (
     PersistentGrantRepository,
     PersistentGrant,
 )
+from src.data_access.postgresql.tables.persistent_grant import (
+    get_grant_data_digest,
+)
 from src.data_access.postgresql.errors.persistent_grant import (
     PersistentGrantNotFoundError,
 )
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import no_type_check
-from time import sleep
+from time import sleep, time
 
 @pytest.mark.asyncio
 class TestPersistentGrantRepository:
@@ -81,6 +86,82 @@ class TestPersistentGrantRepository:
 
     #     assert grant is True
 
+    async def test_get_grant_summary(self, connection: AsyncSession) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        await persistent_grant_repo.create(
+            client_id="test_client",
+            grant_data="summary_refresh_token",
+            user_id=2,
+            scope="openid profile",
+            grant_type="refresh_token",
+        )
+
+        grant = await persistent_grant_repo.get_grant_summary(
+            grant_data="summary_refresh_token"
+        )
+        wrong_type = await persistent_grant_repo.get_grant_summary(
+            grant_data="summary_refresh_token", grant_type="authorization_code"
+        )
+        await persistent_grant_repo.delete(
+            grant_data="summary_refresh_token", grant_type="refresh_token"
+        )
+
+        assert grant.type_of_grant == "refresh_token"
+        assert grant.client_id == "test_client"
+        assert grant.user_id == 2
+        assert grant.username is not None
+        assert grant.scope == "openid profile"
+        assert wrong_type is None
+
+    async def test_get_grant_summaries(self, connection: AsyncSession) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        for grant_data in ("summaries_first", "summaries_second"):
+            await persistent_grant_repo.create(
+                client_id="test_client",
+                grant_data=grant_data,
+                user_id=2,
+                grant_type="refresh_token",
+            )
+
+        grants = await persistent_grant_repo.get_grant_summaries(
+            ["summaries_second", "summaries_missing", "summaries_first"]
+        )
+        for grant_data in ("summaries_first", "summaries_second"):
+            await persistent_grant_repo.delete(
+                grant_data=grant_data, grant_type="refresh_token"
+            )
+
+        assert set(grants) == {
+            ("summaries_first", "refresh_token"),
+            ("summaries_second", "refresh_token"),
+        }
+        assert grants["summaries_first", "refresh_token"].user_id == 2
+
+    async def test_get_grant_summaries_of_each_type(
+        self, connection: AsyncSession
+    ) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        for grant_type in ("authorization_code", "refresh_token"):
+            await persistent_grant_repo.create(
+                client_id="test_client",
+                grant_data="summaries_shared",
+                user_id=2,
+                grant_type=grant_type,
+            )
+
+        grants = await persistent_grant_repo.get_grant_summaries(
+            ["summaries_shared"]
+        )
+        for grant_type in ("authorization_code", "refresh_token"):
+            await persistent_grant_repo.delete(
+                grant_data="summaries_shared", grant_type=grant_type
+            )
+
+        assert set(grants) == {
+            ("summaries_shared", "authorization_code"),
+            ("summaries_shared", "refresh_token"),
+        }
+
     async def test_check_if_grant_not_exists(self, connection: AsyncSession) -> None:
         self.persistent_grant_repo = PersistentGrantRepository(connection)
         result = await self.persistent_grant_repo.exists(
@@ -228,3 +309,127 @@ class TestPersistentGrantRepository:
             await persistent_grant_repo.get_client_id_by_data(
                 grant_data="test_get_client_id_by_wrong_data"
             )
+
+
+@pytest.mark.asyncio
+class TestPersistentGrantDigest:
+    async def test_grant_is_stored_with_digest(
+        self, connection: AsyncSession
+    ) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        await persistent_grant_repo.create(
+            client_id="test_client",
+            grant_data="digest_lookup_code",
+            user_id=2,
+            grant_type="authorization_code",
+        )
+
+        grant = await persistent_grant_repo.get_grant(
+            grant_data="digest_lookup_code", grant_type="authorization_code"
+        )
+        await persistent_grant_repo.delete_grant(grant)
+
+        assert grant.grant_data_digest == hashlib.sha256(
+            b"digest_lookup_code"
+        ).digest()
+        assert not await persistent_grant_repo.exists(
+            grant_data="digest_lookup_code", grant_type="authorization_code"
+        )
+
+    def test_digest_follows_orm_grant_data(self) -> None:
+        grant = PersistentGrant(grant_data="first")
+        grant.grant_data = "second"
+
+        assert grant.grant_data_digest == get_grant_data_digest("second")
+
+
+@pytest.mark.asyncio
+class TestRedeemAuthorizationCode:
+    async def create_code(
+        self, connection: AsyncSession, code: str, expiration_time: int
+    ) -> None:
+        await PersistentGrantRepository(connection).create(
+            client_id="test_client",
+            grant_data=code,
+            user_id=2,
+            scope="openid profile",
+            grant_type="authorization_code",
+            expiration_time=expiration_time,
+        )
+
+    async def test_code_is_replaced_by_refresh_grant(
+        self, connection: AsyncSession
+    ) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        await self.create_code(connection, "redeemed_code", int(time()) + 600)
+
+        grant = await persistent_grant_repo.redeem_authorization_code(
+            authorization_code="redeemed_code",
+            client_id="test_client",
+            refresh_token="redeemed_refresh_token",
+            refresh_expiration_time=int(time()) + 84700,
+        )
+        refresh_grant = await persistent_grant_repo.get_grant(
+            grant_data="redeemed_refresh_token", grant_type="refresh_token"
+        )
+        await persistent_grant_repo.delete_grant(refresh_grant)
+
+        assert grant.user_id == 2
+        assert grant.scope == "openid profile"
+        assert refresh_grant.user_id == 2
+        assert refresh_grant.scope == "openid profile test_client"
+        assert not await persistent_grant_repo.exists(
+            grant_data="redeemed_code", grant_type="authorization_code"
+        )
+
+    async def test_code_is_redeemed_once(
+        self, connection: AsyncSession
+    ) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        await self.create_code(connection, "reused_code", int(time()) + 600)
+        redemptions = [
+            await persistent_grant_repo.redeem_authorization_code(
+                authorization_code="reused_code",
+                client_id="test_client",
+                refresh_token=f"reused_refresh_token_{attempt}",
+                refresh_expiration_time=int(time()) + 84700,
+            )
+            for attempt in range(2)
+        ]
+        refresh_grant = await persistent_grant_repo.get_grant(
+            grant_data="reused_refresh_token_0", grant_type="refresh_token"
+        )
+        await persistent_grant_repo.delete_grant(refresh_grant)
+
+        assert redemptions[0] is not None
+        assert redemptions[1] is None
+        assert not await persistent_grant_repo.exists(
+            grant_data="reused_refresh_token_1", grant_type="refresh_token"
+        )
+
+    async def test_expired_code_or_other_client_is_rejected(
+        self, connection: AsyncSession
+    ) -> None:
+        persistent_grant_repo = PersistentGrantRepository(connection)
+        await self.create_code(connection, "expired_code", int(time()) - 1)
+        await self.create_code(connection, "foreign_code", int(time()) + 600)
+
+        expired = await persistent_grant_repo.redeem_authorization_code(
+            authorization_code="expired_code",
+            client_id="test_client",
+            refresh_token="expired_refresh_token",
+            refresh_expiration_time=int(time()) + 84700,
+        )
+        foreign = await persistent_grant_repo.redeem_authorization_code(
+            authorization_code="foreign_code",
+            client_id="double_test",
+            refresh_token="foreign_refresh_token",
+            refresh_expiration_time=int(time()) + 84700,
+        )
+        for code in ("expired_code", "foreign_code"):
+            await persistent_grant_repo.delete(
+                grant_type="authorization_code", grant_data=code
+            )
+
+        assert expired is None
+        assert foreign is None
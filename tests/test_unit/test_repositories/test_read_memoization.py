@@ -0,0 +1,129 @@
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, Integer, String, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from src.business_logic.cache.invalidation import invalidate_locally
+from src.data_access.postgresql.read_memoization import (
+    REFERENCE_DATA,
+    memoize_reads,
+    reference_data_cache,
+)
+from src.data_access.postgresql.repositories import PersistentGrantRepository
+from src.data_access.postgresql.repositories.base import BaseRepository
+from src.data_access.postgresql.tables import PersistentGrantType
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+
+
+class ItemRepository(BaseRepository):
+    async def get_name(self, item_id: int) -> str:
+        result = await self.session.execute(
+            select(Item.name).where(Item.id == item_id)
+        )
+        return result.scalar()
+
+
+@pytest_asyncio.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(PersistentGrantType.__table__.create)
+        await connection.execute(insert(Item).values(id=1, name="first"))
+        await connection.execute(
+            insert(PersistentGrantType).values(
+                id=1, type_of_grant="authorization_code"
+            )
+        )
+    reference_data_cache.clear()
+    yield engine
+    await engine.dispose()
+
+
+def get_session(engine: AsyncEngine) -> AsyncSession:
+    session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)()
+    memoize_reads(session)
+    return session
+
+
+@pytest.mark.asyncio
+class TestReadMemoization:
+    async def test_identical_reads_are_sent_once(self, engine) -> None:
+        async with get_session(engine) as session:
+            repo = ItemRepository(session)
+
+            assert await repo.get_name(1) == "first"
+            assert await repo.get_name(1) == "first"
+            assert await repo.get_name(2) is None
+
+            assert repo.query_count == 2
+
+    async def test_write_forgets_reads(self, engine) -> None:
+        async with get_session(engine) as session:
+            repo = ItemRepository(session)
+            assert await repo.get_name(1) == "first"
+
+            await session.execute(
+                update(Item).where(Item.id == 1).values(name="second")
+            )
+            assert await repo.get_name(1) == "second"
+
+            session.add(Item(id=1000, name="flushed"))
+            await session.commit()
+            assert await repo.get_name(1000) == "flushed"
+
+            assert repo.query_count == 4
+
+    async def test_locking_reads_are_always_sent(self, engine) -> None:
+        async with get_session(engine) as session:
+            repo = ItemRepository(session)
+            statement = select(Item.name).where(Item.id == 1).with_for_update()
+
+            await session.execute(statement)
+            await session.execute(statement)
+
+            assert repo.query_count == 2
+
+    async def test_reference_data_is_shared_by_sessions(self, engine) -> None:
+        async with get_session(engine) as session:
+            repo = PersistentGrantRepository(session)
+            assert await repo.get_type_id("authorization_code") == 1
+            assert repo.query_count == 1
+
+        async with get_session(engine) as session:
+            repo = PersistentGrantRepository(session)
+            assert await repo.get_type_id("authorization_code") == 1
+            assert repo.query_count == 0
+            grant_type = (await session.execute(select(PersistentGrantType))).scalar()
+            assert grant_type in session
+
+    async def test_admin_edits_drop_reference_data(self, engine) -> None:
+        async with get_session(engine) as session:
+            await PersistentGrantRepository(session).get_type_id(
+                "authorization_code"
+            )
+        assert len(reference_data_cache) == 1
+
+        invalidate_locally(REFERENCE_DATA)
+
+        assert len(reference_data_cache) == 0
+
+    async def test_other_sessions_are_not_memoized(self, engine) -> None:
+        async with sessionmaker(engine, class_=AsyncSession)() as session:
+            repo = ItemRepository(session)
+            await repo.get_name(1)
+            await repo.get_name(1)
+
+            assert repo.query_count == 0
+            assert "read_memo" not in session.info
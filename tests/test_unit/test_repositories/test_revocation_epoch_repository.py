@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.data_access.postgresql.repositories import RevocationEpochRepository
+from src.data_access.postgresql.tables import RevocationEpoch
+
+
+@pytest.mark.usefixtures("engine", "pre_test_setup")
+@pytest.mark.asyncio
+class TestRevocationEpochRepository:
+    async def test_epoch_only_moves_forward(
+        self, connection: AsyncSession
+    ) -> None:
+        repo = RevocationEpochRepository(connection)
+        await repo.set_epoch("sub", "1", 2000)
+        await repo.set_epoch("sub", "1", 1000)
+        await repo.set_epoch("client", "test_client", 1500)
+
+        epochs = await repo.get_epochs(
+            [("sub", "1"), ("client", "test_client"), ("sub", "2")]
+        )
+        await connection.execute(delete(RevocationEpoch))
+        await connection.commit()
+
+        assert epochs == {("sub", "1"): 2000, ("client", "test_client"): 1500}
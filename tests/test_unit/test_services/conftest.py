@@ -88,7 +88,9 @@ def async_session_mock():
 
 @pytest.fixture
 def password_hash_mock():
-    return Mock()
+    password_hash = AsyncMock()
+    password_hash.get_upgraded_hash.return_value = None
+    return password_hash
 
 
 @pytest_asyncio.fixture
@@ -0,0 +1,99 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.business_logic.authorization.context import AuthorizationContext
+from src.business_logic.authorization.dto import AuthRequestModel
+from src.business_logic.authorization.factories.factory_methods import (
+    _create_code_auth_service,
+)
+from src.business_logic.cache.client_snapshot import ClientSnapshot
+from src.data_access.postgresql.errors import (
+    ClientNotFoundError,
+    UserNotFoundError,
+)
+
+
+def get_client_repo() -> MagicMock:
+    return MagicMock(
+        get_client_snapshot=AsyncMock(
+            return_value=ClientSnapshot(
+                id=1,
+                client_id="test_client",
+                enabled=True,
+                signing_algorithm="RS256",
+                authorization_code_lifetime=600,
+                device_code_lifetime=600,
+                require_pkce=False,
+                redirect_uris=["https://www.google.com/"],
+                post_logout_redirect_uris=[],
+                scopes=["openid"],
+                response_types=["code"],
+            )
+        )
+    )
+
+
+def get_user_repo() -> MagicMock:
+    return MagicMock(
+        get_user_credentials=AsyncMock(
+            return_value=MagicMock(
+                id=1, username="TestClient", password_hash="hash"
+            )
+        ),
+        update_password_hash=AsyncMock(),
+    )
+
+
+@pytest.mark.asyncio
+class TestAuthorizationContext:
+    async def test_client_and_user_are_loaded_once(self) -> None:
+        client_repo = get_client_repo()
+        user_repo = get_user_repo()
+        persistent_grant_repo = MagicMock(
+            get_type_id=AsyncMock(return_value=1), create_grant=AsyncMock()
+        )
+        service = _create_code_auth_service(
+            client_repo=client_repo,
+            user_repo=user_repo,
+            persistent_grant_repo=persistent_grant_repo,
+            password_service=MagicMock(
+                is_password_valid_async=AsyncMock(return_value=True),
+                get_upgraded_hash=AsyncMock(return_value=None),
+            ),
+            scope_service=MagicMock(
+                get_full_names=AsyncMock(return_value=["openid"])
+            ),
+        )
+
+        await service.get_redirect_url(
+            AuthRequestModel(
+                client_id="test_client",
+                response_type="code",
+                scope="openid",
+                redirect_uri="https://www.google.com/",
+                username="TestClient",
+                password="password",
+            )
+        )
+
+        client_repo.get_client_snapshot.assert_awaited_once_with(
+            client_id="test_client"
+        )
+        user_repo.get_user_credentials.assert_awaited_once_with("TestClient")
+        assert persistent_grant_repo.create_grant.await_args.kwargs["client_id"] == 1
+        assert persistent_grant_repo.create_grant.await_args.kwargs["user_id"] == 1
+
+    async def test_unknown_client_and_user_are_remembered(self) -> None:
+        client_repo = MagicMock(get_client_snapshot=AsyncMock(return_value=None))
+        user_repo = MagicMock(get_user_credentials=AsyncMock(return_value=None))
+        context = AuthorizationContext(client_repo=client_repo, user_repo=user_repo)
+
+        for _ in range(2):
+            with pytest.raises(ClientNotFoundError):
+                await context.get_client("unknown")
+            with pytest.raises(UserNotFoundError):
+                await context.get_user_id("unknown")
+
+        client_repo.get_client_snapshot.assert_awaited_once()
+        user_repo.get_user_credentials.assert_awaited_once()
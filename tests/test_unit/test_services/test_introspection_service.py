@@ -0,0 +1,218 @@
+import time
+from typing import Iterator
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.business_logic.cache.introspection import introspection_cache
+from src.business_logic.services.introspection import IntrospectionService
+from src.business_logic.services.jwt_token import JWTService
+from src.presentation.api.models.introspection import IntrospectedTokenModel
+
+
+@pytest.fixture(autouse=True)
+def clear_introspection_cache() -> Iterator[None]:
+    yield
+    introspection_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def is_token_revoked() -> Iterator[AsyncMock]:
+    with patch(
+        "src.business_logic.services.introspection.is_token_revoked",
+        AsyncMock(return_value=False),
+    ) as is_token_revoked:
+        yield is_token_revoked
+
+
+def get_grant(**kwargs: object) -> SimpleNamespace:
+    grant = {
+        "type_of_grant": "refresh_token",
+        "client_id": "test_client",
+        "user_id": 1,
+        "username": "TestUser",
+        "scope": "openid",
+        "expiration": int(time.time()) + 600,
+    }
+    return SimpleNamespace(**(grant | kwargs))
+
+
+@pytest.mark.asyncio
+class TestBatchIntrospection:
+    async def test_responses_follow_input_order(self) -> None:
+        jwt = JWTService()
+        exp = time.time() + 600
+        access_token = await jwt.encode_jwt(payload={"sub": "2", "exp": exp})
+        refresh_token = await jwt.encode_jwt(payload={"exp": exp})
+        unknown_token = await jwt.encode_jwt(payload={"sub": "3", "exp": exp})
+        persistent_grant_repo = MagicMock(
+            get_grant_summaries=AsyncMock(
+                return_value={(refresh_token, "refresh_token"): get_grant()}
+            )
+        )
+        user_repo = MagicMock(
+            get_usernames_by_ids=AsyncMock(return_value={2: "Other"})
+        )
+        service = IntrospectionService(
+            session=MagicMock(),
+            user_repo=user_repo,
+            client_repo=MagicMock(),
+            persistent_grant_repo=persistent_grant_repo,
+            jwt=jwt,
+        )
+        service.request = MagicMock(url="http://testserver/introspection/batch")
+
+        responses = await service.analyze_tokens(
+            [
+                IntrospectedTokenModel(token=refresh_token),
+                IntrospectedTokenModel(token="not a jwt"),
+                IntrospectedTokenModel(
+                    token=access_token, token_type_hint="access_token"
+                ),
+                IntrospectedTokenModel(token=unknown_token),
+                IntrospectedTokenModel(
+                    token=refresh_token, token_type_hint="device_code"
+                ),
+            ]
+        )
+
+        assert [response["active"] for response in responses] == [
+            True,
+            False,
+            True,
+            False,
+            False,
+        ]
+        assert responses[0]["username"] == "TestUser"
+        assert responses[0]["sub"] == "1"
+        assert responses[0]["client_id"] == "test_client"
+        assert responses[0]["iss"] == "http://testserver"
+        assert responses[2]["username"] == "Other"
+        persistent_grant_repo.get_grant_summaries.assert_awaited_once_with(
+            [refresh_token, unknown_token, refresh_token]
+        )
+        user_repo.get_usernames_by_ids.assert_awaited_once_with([2])
+
+    async def test_token_of_expired_grant_is_inactive(self) -> None:
+        jwt = JWTService()
+        refresh_token = await jwt.encode_jwt(payload={"jti": "1"})
+        expired_token = await jwt.encode_jwt(payload={"jti": "2"})
+        expiration = int(time.time()) + 600
+        persistent_grant_repo = MagicMock(
+            get_grant_summaries=AsyncMock(
+                return_value={
+                    (refresh_token, "refresh_token"): get_grant(
+                        expiration=expiration
+                    ),
+                    (expired_token, "refresh_token"): get_grant(
+                        expiration=int(time.time()) - 1
+                    ),
+                }
+            )
+        )
+        service = IntrospectionService(
+            session=MagicMock(),
+            user_repo=MagicMock(),
+            client_repo=MagicMock(),
+            persistent_grant_repo=persistent_grant_repo,
+            jwt=jwt,
+        )
+        service.request = MagicMock(url="http://testserver/introspection/batch")
+
+        responses = await service.analyze_tokens(
+            [
+                IntrospectedTokenModel(token=refresh_token),
+                IntrospectedTokenModel(token=expired_token),
+            ]
+        )
+
+        assert responses[0]["active"] is True
+        assert responses[0]["exp"] == expiration
+        assert responses[1] == {"active": False}
+
+    async def test_hint_selects_grant_of_its_type(self) -> None:
+        jwt = JWTService()
+        token = await jwt.encode_jwt(payload={"jti": "1"})
+        persistent_grant_repo = MagicMock(
+            get_grant_summaries=AsyncMock(
+                return_value={
+                    (token, "authorization_code"): get_grant(
+                        type_of_grant="authorization_code", scope="openid"
+                    ),
+                    (token, "refresh_token"): get_grant(scope="profile"),
+                }
+            )
+        )
+        service = IntrospectionService(
+            session=MagicMock(),
+            user_repo=MagicMock(),
+            client_repo=MagicMock(),
+            persistent_grant_repo=persistent_grant_repo,
+            jwt=jwt,
+        )
+        service.request = MagicMock(url="http://testserver/introspection/batch")
+
+        responses = await service.analyze_tokens(
+            [
+                IntrospectedTokenModel(token=token, token_type_hint="refresh_token"),
+                IntrospectedTokenModel(token=token),
+            ]
+        )
+
+        assert responses[0]["scope"] == "profile"
+        assert responses[1]["scope"] == "openid"
+
+    async def test_cached_access_token_is_not_verified_again(self) -> None:
+        jwt = JWTService()
+        access_token = await jwt.encode_jwt(
+            payload={"sub": "2", "exp": time.time() + 600}
+        )
+        user_repo = MagicMock(
+            get_usernames_by_ids=AsyncMock(return_value={2: "Other"})
+        )
+        service = IntrospectionService(
+            session=MagicMock(),
+            user_repo=user_repo,
+            client_repo=MagicMock(),
+            persistent_grant_repo=MagicMock(),
+            jwt=jwt,
+        )
+        service.request = MagicMock(url="http://testserver/introspection/batch")
+        tokens = [
+            IntrospectedTokenModel(token=access_token, token_type_hint="access_token")
+        ]
+
+        first = await service.analyze_tokens(tokens)
+        with patch.object(service, "decode_token") as decode_token:
+            second = await service.analyze_tokens(tokens)
+
+        decode_token.assert_not_called()
+        assert first == second
+
+    async def test_revoked_token_is_inactive_and_not_cached(
+        self, is_token_revoked: AsyncMock
+    ) -> None:
+        jwt = JWTService()
+        access_token = await jwt.encode_jwt(
+            payload={"sub": "2", "exp": time.time() + 600}
+        )
+        user_repo = MagicMock(get_usernames_by_ids=AsyncMock(return_value={}))
+        service = IntrospectionService(
+            session=MagicMock(),
+            user_repo=user_repo,
+            client_repo=MagicMock(),
+            persistent_grant_repo=MagicMock(),
+            jwt=jwt,
+        )
+        service.request = MagicMock(url="http://testserver/introspection/batch")
+        is_token_revoked.return_value = True
+
+        responses = await service.analyze_tokens(
+            [IntrospectedTokenModel(token=access_token, token_type_hint="access_token")]
+        )
+
+        assert responses == [{"active": False}]
+        assert len(introspection_cache) == 0
+        user_repo.get_usernames_by_ids.assert_not_awaited()
+        assert is_token_revoked.await_args.args[0] == access_token
@@ -0,0 +1,73 @@
+import pytest
+
+from src.business_logic.jwt_manager import JWTManager
+from src.business_logic.jwt_manager.dto import (
+    AccessTokenPayload,
+    RefreshTokenPayload,
+)
+from src.business_logic.jwt_manager.signing_executor import (
+    SIGNED_IN_PLACE,
+    SIGNING_QUEUE_DEPTH,
+    SigningExecutor,
+)
+from src.config.rsa_keys import CreateRSAKeypair
+
+
+PAYLOADS = [
+    AccessTokenPayload(
+        sub=1, iss="issuer", client_id="client", iat=1, exp=4102444800,
+        aud=["client"], jti="1", acr=0,
+    ),
+    RefreshTokenPayload(jti="2"),
+]
+
+
+@pytest.mark.asyncio
+class TestJWTManagerEncodeMany:
+
+    async def test_encode_many_without_executor(self) -> None:
+        manager = JWTManager(keys=CreateRSAKeypair().execute(), signing_executor=None)
+
+        access_token, refresh_token = await manager.encode_many(
+            payloads=PAYLOADS, algorithm="RS256"
+        )
+
+        assert manager.decode(access_token, audience="client")["jti"] == "1"
+        assert manager.decode(refresh_token)["jti"] == "2"
+
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    async def test_encode_many_in_executor(self, kind: str) -> None:
+        keys = CreateRSAKeypair().execute()
+        executor = SigningExecutor(keys=keys, kind=kind, max_workers=2, max_queue=1)
+        manager = JWTManager(keys=keys, signing_executor=executor)
+        try:
+            tokens = await manager.encode_many(
+                payloads=PAYLOADS * 3, algorithm="RS256"
+            )
+        finally:
+            executor.shutdown()
+
+        assert [
+            (await manager.decode_token_no_aud_iss_check(token))["jti"]
+            for token in tokens
+        ] == ["1", "2"] * 3
+        assert SIGNING_QUEUE_DEPTH._value.get() == 0
+
+    async def test_full_executor_signs_in_place(self) -> None:
+        keys = CreateRSAKeypair().execute()
+        executor = SigningExecutor(keys=keys, kind="thread", max_workers=1, max_queue=0)
+        manager = JWTManager(keys=keys, signing_executor=executor)
+        signed_in_place = SIGNED_IN_PLACE._value.get()
+        try:
+            tokens = await manager.encode_many(
+                payloads=PAYLOADS * 2, algorithm="RS256"
+            )
+        finally:
+            executor.shutdown()
+
+        assert len(tokens) == 4
+        assert SIGNED_IN_PLACE._value.get() - signed_in_place == 3
+
+    async def test_unknown_executor(self) -> None:
+        with pytest.raises(ValueError):
+            SigningExecutor(keys=CreateRSAKeypair().execute(), kind="unknown")
@@ -1,4 +1,6 @@
+import bcrypt
 import pytest
+from pydantic import SecretStr
 
 from src.business_logic.services.password import PasswordHash
 from src.data_access.postgresql.errors import (
@@ -29,3 +31,45 @@ class TestPasswordHash:
     ) -> None:
         with pytest.raises(WrongPasswordError):
             PasswordHash.validate_password(test_input, expected)
+
+
+@pytest.mark.asyncio
+class TestPasswordHashAsync:
+    @pytest.mark.parametrize("test_input, expected", TEST_VALIDATE_PASSWORD[:1])
+    async def test_validate_password_async(
+        self, test_input: str, expected: str
+    ) -> None:
+        assert await PasswordHash.validate_password_async(test_input, expected)
+        assert await PasswordHash.is_password_valid_async(test_input, expected)
+
+    @pytest.mark.parametrize("test_input, expected", TEST_VALIDATE_PASSWORD[3:4])
+    async def test_validate_password_async_error(
+        self, test_input: str, expected: str
+    ) -> None:
+        with pytest.raises(WrongPasswordError):
+            await PasswordHash.validate_password_async(test_input, expected)
+        assert not await PasswordHash.is_password_valid_async(
+            test_input, expected
+        )
+
+    async def test_hash_password_async_uses_configured_cost(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(PasswordHash, "rounds", 4)
+        password = await PasswordHash.hash_password_async("some_password")
+
+        assert password.startswith("$2b$04$")
+        assert not PasswordHash.needs_rehash(password)
+
+    async def test_get_upgraded_hash(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(PasswordHash, "rounds", 4)
+        password = SecretStr("some_password")
+        current_hash = PasswordHash.hash_password("some_password")
+        old_hash = bcrypt.hashpw(b"some_password", bcrypt.gensalt(rounds=5)).decode()
+
+        assert await PasswordHash.get_upgraded_hash(password, current_hash) is None
+        new_hash = await PasswordHash.get_upgraded_hash(password, old_hash)
+        assert new_hash.startswith("$2b$04$")
+        assert PasswordHash.is_password_valid(password, new_hash)
@@ -2,6 +2,7 @@ import mock
 import pytest
 from sqlalchemy import delete
 
+from src.business_logic.services.jwt_token import VerifiedToken
 from src.business_logic.services.userinfo import UserInfoService
 from src.presentation.api.models.userinfo import ResponseUserInfoModel
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
@@ -46,3 +47,19 @@ class TestUserInfoService:
         assert expected["nickname"] == result["nickname"]
 
         assert expected_jwt[:10] == result_jwt[:10]
+
+    async def test_verified_token_is_not_decoded_again(
+        self, user_info_service: UserInfoService, connection: AsyncEngine
+    ) -> None:
+        service = user_info_service
+        service.verified_token = VerifiedToken(
+            token="verified", claims={"scope": "openid", "sub": "1"}
+        )
+
+        with mock.patch.object(
+            service.jwt, "decode_token_no_aud_iss_check"
+        ) as decode:
+            result = await service.get_user_info()
+
+        decode.assert_not_called()
+        assert result["sub"] == "1"